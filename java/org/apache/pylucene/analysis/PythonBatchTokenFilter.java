@@ -0,0 +1,196 @@
+/* ====================================================================
+ *   Licensed under the Apache License, Version 2.0 (the "License");
+ *   you may not use this file except in compliance with the License.
+ *   You may obtain a copy of the License at
+ *
+ *       http://www.apache.org/licenses/LICENSE-2.0
+ *
+ *   Unless required by applicable law or agreed to in writing, software
+ *   distributed under the License is distributed on an "AS IS" BASIS,
+ *   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ *   See the License for the specific language governing permissions and
+ *   limitations under the License.
+ * ====================================================================
+ */
+
+package org.apache.pylucene.analysis;
+
+import java.io.IOException;
+import java.util.Arrays;
+
+import org.apache.lucene.analysis.TokenFilter;
+import org.apache.lucene.analysis.TokenStream;
+import org.apache.lucene.analysis.tokenattributes.CharTermAttribute;
+import org.apache.lucene.analysis.tokenattributes.OffsetAttribute;
+import org.apache.lucene.analysis.tokenattributes.PositionIncrementAttribute;
+
+/**
+ * A token filter transforming the terms of its input a batch of tokens at
+ * a time in Python instead of calling into Python once per token.
+ *
+ * Up to <code>batchSize</code> tokens are read ahead from the input and
+ * their terms, position increments and offsets are passed to
+ * <code>filterBatch(terms, positionIncrements, startOffsets, endOffsets,
+ * count)</code>, which returns the <code>count</code> transformed terms.
+ * The tokens are then replayed one at a time, with all their other
+ * attributes as they were, and the term returned for them. A null term
+ * removes the token, its position increment being added to the next one's.
+ * Only the first <code>count</code> entries of the arrays are valid.
+ */
+
+public class PythonBatchTokenFilter extends TokenFilter {
+
+    public static final int DEFAULT_BATCH_SIZE = 128;
+
+    private long pythonObject;
+
+    private final CharTermAttribute termAtt =
+        addAttribute(CharTermAttribute.class);
+    private final PositionIncrementAttribute posIncAtt =
+        addAttribute(PositionIncrementAttribute.class);
+    private final OffsetAttribute offsetAtt =
+        addAttribute(OffsetAttribute.class);
+
+    protected final String[] terms;
+    protected final int[] positionIncrements;
+    protected final int[] startOffsets;
+    protected final int[] endOffsets;
+
+    private final State[] states;
+    private String[] filtered;
+    private int count, next;
+    private int skippedPositions;
+    private boolean exhausted;
+
+    public PythonBatchTokenFilter(TokenStream tokenStream)
+    {
+        this(tokenStream, DEFAULT_BATCH_SIZE);
+    }
+
+    public PythonBatchTokenFilter(TokenStream tokenStream, int batchSize)
+    {
+        super(tokenStream);
+
+        if (batchSize <= 0)
+            throw new IllegalArgumentException("batchSize must be > 0");
+
+        terms = new String[batchSize];
+        positionIncrements = new int[batchSize];
+        startOffsets = new int[batchSize];
+        endOffsets = new int[batchSize];
+        states = new State[batchSize];
+    }
+
+    public void pythonExtension(long pythonObject)
+    {
+        this.pythonObject = pythonObject;
+    }
+    public long pythonExtension()
+    {
+        return this.pythonObject;
+    }
+
+    public void finalize()
+        throws Throwable
+    {
+        pythonDecRef();
+    }
+
+    public native void pythonDecRef();
+
+    public int getBatchSize()
+    {
+        return states.length;
+    }
+
+    private boolean fill()
+        throws IOException
+    {
+        count = next = 0;
+        if (exhausted)
+            return false;
+
+        while (count < states.length) {
+            if (!input.incrementToken())
+            {
+                exhausted = true;
+                break;
+            }
+
+            terms[count] = termAtt.toString();
+            positionIncrements[count] = posIncAtt.getPositionIncrement();
+            startOffsets[count] = offsetAtt.startOffset();
+            endOffsets[count] = offsetAtt.endOffset();
+            states[count] = captureState();
+            count += 1;
+        }
+
+        if (count == 0)
+            return false;
+
+        filtered = filterBatch(terms, positionIncrements,
+                               startOffsets, endOffsets, count);
+        if (filtered == null || filtered.length != count)
+            throw new IllegalStateException(
+                "filterBatch() must return " + count + " terms");
+
+        return true;
+    }
+
+    @Override
+    public final boolean incrementToken()
+        throws IOException
+    {
+        while (next < count || fill()) {
+            int i = next++;
+            String term = filtered[i];
+
+            if (term == null)
+            {
+                skippedPositions += positionIncrements[i];
+                continue;
+            }
+
+            restoreState(states[i]);
+            termAtt.setEmpty().append(term);
+            if (skippedPositions != 0)
+            {
+                posIncAtt.setPositionIncrement(
+                    positionIncrements[i] + skippedPositions);
+                skippedPositions = 0;
+            }
+
+            return true;
+        }
+
+        return false;
+    }
+
+    @Override
+    public void reset()
+        throws IOException
+    {
+        super.reset();
+
+        Arrays.fill(states, null);
+        filtered = null;
+        count = next = 0;
+        skippedPositions = 0;
+        exhausted = false;
+    }
+
+    @Override
+    public void end()
+        throws IOException
+    {
+        super.end();
+        posIncAtt.setPositionIncrement(
+            posIncAtt.getPositionIncrement() + skippedPositions);
+    }
+
+    public native String[] filterBatch(String[] terms,
+                                       int[] positionIncrements,
+                                       int[] startOffsets, int[] endOffsets,
+                                       int count)
+        throws IOException;
+}
@@ -0,0 +1,112 @@
+/* ====================================================================
+ *   Licensed under the Apache License, Version 2.0 (the "License");
+ *   you may not use this file except in compliance with the License.
+ *   You may obtain a copy of the License at
+ *
+ *       http://www.apache.org/licenses/LICENSE-2.0
+ *
+ *   Unless required by applicable law or agreed to in writing, software
+ *   distributed under the License is distributed on an "AS IS" BASIS,
+ *   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ *   See the License for the specific language governing permissions and
+ *   limitations under the License.
+ * ====================================================================
+ */
+
+package org.apache.pylucene.analysis;
+
+import java.io.IOException;
+import java.io.Reader;
+
+import org.apache.lucene.analysis.charfilter.BaseCharFilter;
+
+/**
+ * A char filter transforming the whole text of its input at once in
+ * Python instead of having Python read it chunk by chunk.
+ *
+ * The input is read entirely, when the filter is first read from, and
+ * passed to <code>filter(text)</code> which returns the transformed text.
+ * For offsets to still refer to the original text, <code>filter()</code>
+ * calls {@link #addOffsetCorrections} with the offsets in the transformed
+ * text from which the cumulative difference with offsets in the original
+ * text changes, as {@link BaseCharFilter#addOffCorrectMap} expects.
+ */
+
+public class PythonCharFilter extends BaseCharFilter {
+
+    private long pythonObject;
+
+    private String text;
+    private int pos;
+
+    public PythonCharFilter(Reader in)
+    {
+        super(in);
+    }
+
+    public void pythonExtension(long pythonObject)
+    {
+        this.pythonObject = pythonObject;
+    }
+    public long pythonExtension()
+    {
+        return this.pythonObject;
+    }
+
+    public void finalize()
+        throws Throwable
+    {
+        pythonDecRef();
+    }
+
+    public native void pythonDecRef();
+
+    public void addOffsetCorrections(int[] offsets, int[] cumulativeDiffs)
+    {
+        if (offsets.length != cumulativeDiffs.length)
+            throw new IllegalArgumentException(
+                "offsets and cumulativeDiffs differ in length");
+
+        for (int i = 0; i < offsets.length; i++)
+            addOffCorrectMap(offsets[i], cumulativeDiffs[i]);
+    }
+
+    private void load()
+        throws IOException
+    {
+        StringBuilder builder = new StringBuilder();
+        char[] buffer = new char[8192];
+
+        for (int n = input.read(buffer); n != -1; n = input.read(buffer))
+            builder.append(buffer, 0, n);
+
+        text = filter(builder.toString());
+        if (text == null)
+            text = "";
+        pos = 0;
+    }
+
+    @Override
+    public int read(char[] cbuf, int off, int len)
+        throws IOException
+    {
+        if (text == null)
+            load();
+
+        if (len == 0)
+            return 0;
+
+        if (pos == text.length())
+            return -1;
+
+        int n = Math.min(len, text.length() - pos);
+
+        text.getChars(pos, pos + n, cbuf, off);
+        pos += n;
+
+        return n;
+    }
+
+    public native String filter(String text)
+        throws IOException;
+}
@@ -0,0 +1,279 @@
+/* ====================================================================
+ *   Licensed under the Apache License, Version 2.0 (the "License");
+ *   you may not use this file except in compliance with the License.
+ *   You may obtain a copy of the License at
+ *
+ *       http://www.apache.org/licenses/LICENSE-2.0
+ *
+ *   Unless required by applicable law or agreed to in writing, software
+ *   distributed under the License is distributed on an "AS IS" BASIS,
+ *   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ *   See the License for the specific language governing permissions and
+ *   limitations under the License.
+ * ====================================================================
+ */
+
+package org.apache.pylucene.index;
+
+import java.io.IOException;
+import java.util.Arrays;
+
+import org.apache.lucene.index.DocValues;
+import org.apache.lucene.index.LeafReaderContext;
+import org.apache.lucene.index.NumericDocValues;
+import org.apache.lucene.index.SortedDocValues;
+import org.apache.lucene.index.SortedSetDocValues;
+import org.apache.lucene.search.DocIdSetIterator;
+
+/**
+ * Exports the doc values of a segment into primitive arrays in one call
+ * instead of advancing a doc values iterator from Python for every doc.
+ *
+ * Values are exported for every doc of the segment, or for a given array
+ * of segment relative doc ids, in any order. The arrays support the buffer
+ * protocol so they can be wrapped by NumPy with <code>numpy.asarray()
+ * </code> without copying.
+ *
+ * Numeric values are exported as is, float and double doc values are
+ * their raw bits; sorted values as their ord, which {@link
+ * SortedDocValues#lookupOrd} maps back to a term. The ords of sorted set
+ * values are exported into a single array, the ords of the i-th doc
+ * being <code>ords[offsets[i]:offsets[i + 1]]</code>.
+ */
+
+public class DocValuesExporter {
+
+    public static class Values {
+
+        /** the value, or ord, of each doc, 0 if missing */
+        public final long[] values;
+        /** whether each doc has no value */
+        public final boolean[] missing;
+
+        Values(int count)
+        {
+            values = new long[count];
+            missing = new boolean[count];
+        }
+    }
+
+    public static class MultiValues {
+
+        /** the ords of all docs, one doc after the other */
+        public final long[] ords;
+        /** where the ords of each doc start in ords, and end */
+        public final int[] offsets;
+
+        MultiValues(long[] ords, int[] offsets)
+        {
+            this.ords = ords;
+            this.offsets = offsets;
+        }
+    }
+
+    private DocValuesExporter()
+    {
+    }
+
+    /* sorts doc ids, keeping track of their position */
+    private static long[] order(int[] docs)
+    {
+        long[] order = new long[docs.length];
+
+        for (int i = 0; i < docs.length; i++)
+            order[i] = ((long) docs[i] << 32) | i;
+        Arrays.sort(order);
+
+        return order;
+    }
+
+    public static Values numeric(LeafReaderContext context, String field)
+        throws IOException
+    {
+        NumericDocValues dv = DocValues.getNumeric(context.reader(), field);
+        Values result = new Values(context.reader().maxDoc());
+
+        Arrays.fill(result.missing, true);
+        for (int doc = dv.nextDoc(); doc != DocIdSetIterator.NO_MORE_DOCS;
+             doc = dv.nextDoc()) {
+            result.values[doc] = dv.longValue();
+            result.missing[doc] = false;
+        }
+
+        return result;
+    }
+
+    public static Values numeric(LeafReaderContext context, String field,
+                                 int[] docs)
+        throws IOException
+    {
+        NumericDocValues dv = DocValues.getNumeric(context.reader(), field);
+        Values result = new Values(docs.length);
+
+        int prevDoc = -1, prev = -1;
+
+        for (long entry : order(docs)) {
+            int doc = (int) (entry >>> 32);
+            int i = (int) entry;
+
+            // iterators only move forward, repeated docs share their value
+            if (doc == prevDoc)
+            {
+                result.values[i] = result.values[prev];
+                result.missing[i] = result.missing[prev];
+            }
+            else if (dv.advanceExact(doc))
+                result.values[i] = dv.longValue();
+            else
+                result.missing[i] = true;
+
+            prevDoc = doc;
+            prev = i;
+        }
+
+        return result;
+    }
+
+    public static Values sorted(LeafReaderContext context, String field)
+        throws IOException
+    {
+        SortedDocValues dv = DocValues.getSorted(context.reader(), field);
+        Values result = new Values(context.reader().maxDoc());
+
+        Arrays.fill(result.missing, true);
+        for (int doc = dv.nextDoc(); doc != DocIdSetIterator.NO_MORE_DOCS;
+             doc = dv.nextDoc()) {
+            result.values[doc] = dv.ordValue();
+            result.missing[doc] = false;
+        }
+
+        return result;
+    }
+
+    public static Values sorted(LeafReaderContext context, String field,
+                                int[] docs)
+        throws IOException
+    {
+        SortedDocValues dv = DocValues.getSorted(context.reader(), field);
+        Values result = new Values(docs.length);
+
+        int prevDoc = -1, prev = -1;
+
+        for (long entry : order(docs)) {
+            int doc = (int) (entry >>> 32);
+            int i = (int) entry;
+
+            // iterators only move forward, repeated docs share their value
+            if (doc == prevDoc)
+            {
+                result.values[i] = result.values[prev];
+                result.missing[i] = result.missing[prev];
+            }
+            else if (dv.advanceExact(doc))
+                result.values[i] = dv.ordValue();
+            else
+                result.missing[i] = true;
+
+            prevDoc = doc;
+            prev = i;
+        }
+
+        return result;
+    }
+
+    /* returns ords, grown if count fills it */
+    private static long[] grow(long[] ords, int count)
+    {
+        if (count == ords.length)
+            return Arrays.copyOf(ords, Math.max(16, count * 2));
+
+        return ords;
+    }
+
+    public static MultiValues sortedSet(LeafReaderContext context,
+                                        String field)
+        throws IOException
+    {
+        SortedSetDocValues dv =
+            DocValues.getSortedSet(context.reader(), field);
+        int maxDoc = context.reader().maxDoc();
+        int[] offsets = new int[maxDoc + 1];
+        long[] ords = new long[16];
+        int total = 0, next = 0;
+
+        // docs without values, skipped by the iterator, have no ords
+        for (int doc = dv.nextDoc(); doc != DocIdSetIterator.NO_MORE_DOCS;
+             doc = dv.nextDoc()) {
+            while (next <= doc)
+                offsets[next++] = total;
+
+            for (long ord = dv.nextOrd();
+                 ord != SortedSetDocValues.NO_MORE_ORDS;
+                 ord = dv.nextOrd()) {
+                ords = grow(ords, total);
+                ords[total++] = ord;
+            }
+        }
+        while (next <= maxDoc)
+            offsets[next++] = total;
+
+        return new MultiValues(Arrays.copyOf(ords, total), offsets);
+    }
+
+    public static MultiValues sortedSet(LeafReaderContext context,
+                                        String field, int[] docs)
+        throws IOException
+    {
+        SortedSetDocValues dv =
+            DocValues.getSortedSet(context.reader(), field);
+        int[] starts = new int[docs.length];
+        int[] counts = new int[docs.length];
+        long[] buffer = new long[16];
+        int total = 0;
+
+        int prevDoc = -1, prev = -1;
+
+        // collect the ords in doc id order, noting where each doc's start
+        for (long entry : order(docs)) {
+            int doc = (int) (entry >>> 32);
+            int i = (int) entry;
+
+            // iterators only move forward, repeated docs share their ords
+            if (doc == prevDoc)
+            {
+                starts[i] = starts[prev];
+                counts[i] = counts[prev];
+            }
+            else
+            {
+                starts[i] = total;
+                if (dv.advanceExact(doc))
+                {
+                    for (long ord = dv.nextOrd();
+                         ord != SortedSetDocValues.NO_MORE_ORDS;
+                         ord = dv.nextOrd()) {
+                        buffer = grow(buffer, total);
+                        buffer[total++] = ord;
+                    }
+                }
+                counts[i] = total - starts[i];
+            }
+
+            prevDoc = doc;
+            prev = i;
+        }
+
+        // then lay them out in the order of docs
+        int[] offsets = new int[docs.length + 1];
+
+        for (int i = 0; i < docs.length; i++)
+            offsets[i + 1] = offsets[i] + counts[i];
+
+        long[] ords = new long[offsets[docs.length]];
+
+        for (int i = 0; i < docs.length; i++)
+            System.arraycopy(buffer, starts[i], ords, offsets[i], counts[i]);
+
+        return new MultiValues(ords, offsets);
+    }
+}
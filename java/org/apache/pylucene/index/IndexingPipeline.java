@@ -0,0 +1,227 @@
+/* ====================================================================
+ *   Licensed under the Apache License, Version 2.0 (the "License");
+ *   you may not use this file except in compliance with the License.
+ *   You may obtain a copy of the License at
+ *
+ *       http://www.apache.org/licenses/LICENSE-2.0
+ *
+ *   Unless required by applicable law or agreed to in writing, software
+ *   distributed under the License is distributed on an "AS IS" BASIS,
+ *   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ *   See the License for the specific language governing permissions and
+ *   limitations under the License.
+ * ====================================================================
+ */
+
+package org.apache.pylucene.index;
+
+import java.io.Closeable;
+import java.io.IOException;
+import java.util.ArrayList;
+import java.util.List;
+import java.util.concurrent.ArrayBlockingQueue;
+import java.util.concurrent.BlockingQueue;
+import java.util.concurrent.atomic.AtomicLong;
+
+import org.apache.lucene.document.Document;
+import org.apache.lucene.document.Field;
+import org.apache.lucene.document.FieldType;
+import org.apache.lucene.index.IndexWriter;
+import org.apache.lucene.util.ThreadInterruptedException;
+
+/**
+ * Indexes documents with Java threads from batches of field values
+ * queued from Python, so that creating documents and fields, and
+ * analysis, run in parallel and without the GIL.
+ *
+ * The documents are described by a schema of field names and field types.
+ * A batch is an array of values, one row per document, one column per
+ * field: <code>values[i * fields.length + f]</code> is the value of
+ * <code>fields[f]</code> for the i-th document, null to omit the field.
+ * {@link #add} queues a batch, waiting while the queue is full. Worker
+ * threads take batches off the queue, make them into documents and add
+ * them with {@link IndexWriter#addDocuments}.
+ *
+ * Field types must be usable with {@link Field#Field(String, String,
+ * FieldType)}, indexed or stored. If the writer's analyzer is implemented
+ * in Python, the worker threads call into Python to run it.
+ *
+ * {@link #close} waits for all queued batches to be indexed, it does not
+ * close the writer. The first exception thrown by a worker is rethrown by
+ * the next call to {@link #add} or by {@link #close}, batches queued after
+ * it are dropped.
+ */
+
+public class IndexingPipeline implements Closeable {
+
+    private static final String[] END = new String[0];
+
+    private final IndexWriter writer;
+    private final String[] fields;
+    private final FieldType[] types;
+    private final BlockingQueue<String[]> queue;
+    private final Worker[] workers;
+    private final AtomicLong count = new AtomicLong();
+
+    private volatile Throwable failure;
+    private boolean closed;
+
+    public IndexingPipeline(IndexWriter writer, String[] fields,
+                            FieldType[] types, int threads, int queueSize)
+    {
+        if (fields.length == 0 || fields.length != types.length)
+            throw new IllegalArgumentException(
+                "fields and types must have the same, non zero, length");
+        if (threads <= 0)
+            throw new IllegalArgumentException("threads must be > 0");
+        if (queueSize <= 0)
+            throw new IllegalArgumentException("queueSize must be > 0");
+
+        this.writer = writer;
+        this.fields = fields.clone();
+        this.types = new FieldType[types.length];
+
+        // shared by worker threads, frozen copies can't change under them
+        for (int i = 0; i < types.length; i++) {
+            this.types[i] = new FieldType(types[i]);
+            this.types[i].freeze();
+        }
+
+        queue = new ArrayBlockingQueue<String[]>(queueSize);
+        workers = new Worker[threads];
+
+        for (int i = 0; i < threads; i++) {
+            workers[i] = new Worker("IndexingPipeline-" + i);
+            workers[i].start();
+        }
+    }
+
+    public String[] getFields()
+    {
+        return fields.clone();
+    }
+
+    /** the number of documents indexed so far */
+    public long getCount()
+    {
+        return count.get();
+    }
+
+    private void checkFailure()
+        throws IOException
+    {
+        Throwable t = failure;
+
+        if (t instanceof IOException)
+            throw (IOException) t;
+        if (t instanceof RuntimeException)
+            throw (RuntimeException) t;
+        if (t instanceof Error)
+            throw (Error) t;
+        if (t != null)
+            throw new IOException(t);
+    }
+
+    public void add(String[] values)
+        throws IOException
+    {
+        if (closed)
+            throw new IllegalStateException("pipeline is closed");
+        if (values.length % fields.length != 0)
+            throw new IllegalArgumentException(
+                "values.length must be a multiple of " + fields.length);
+
+        checkFailure();
+
+        if (values.length > 0)
+        {
+            try {
+                queue.put(values);
+            } catch (InterruptedException e) {
+                throw new ThreadInterruptedException(e);
+            }
+        }
+    }
+
+    @Override
+    public void close()
+        throws IOException
+    {
+        if (!closed)
+        {
+            closed = true;
+            try {
+                for (Worker worker : workers)
+                    queue.put(END);
+                for (Worker worker : workers)
+                    worker.join();
+            } catch (InterruptedException e) {
+                throw new ThreadInterruptedException(e);
+            }
+        }
+
+        checkFailure();
+    }
+
+    private class Worker extends Thread {
+
+        Worker(String name)
+        {
+            super(name);
+            setDaemon(true);
+        }
+
+        private List<Document> documents(String[] values)
+        {
+            List<Document> docs =
+                new ArrayList<Document>(values.length / fields.length);
+
+            for (int i = 0; i < values.length; i += fields.length) {
+                Document doc = new Document();
+
+                for (int f = 0; f < fields.length; f++) {
+                    String value = values[i + f];
+
+                    if (value != null)
+                        doc.add(new Field(fields[f], value, types[f]));
+                }
+                docs.add(doc);
+            }
+
+            return docs;
+        }
+
+        @Override
+        public void run()
+        {
+            while (true) {
+                String[] values;
+
+                try {
+                    values = queue.take();
+                } catch (InterruptedException e) {
+                    return;
+                }
+
+                if (values == END)
+                    return;
+
+                // keep draining the queue so that add() doesn't block
+                if (failure != null)
+                    continue;
+
+                try {
+                    List<Document> docs = documents(values);
+
+                    writer.addDocuments(docs);
+                    count.addAndGet(docs.size());
+                } catch (Throwable t) {
+                    synchronized (IndexingPipeline.this) {
+                        if (failure == null)
+                            failure = t;
+                    }
+                }
+            }
+        }
+    }
+}
@@ -0,0 +1,142 @@
+/* ====================================================================
+ *   Licensed under the Apache License, Version 2.0 (the "License");
+ *   you may not use this file except in compliance with the License.
+ *   You may obtain a copy of the License at
+ *
+ *       http://www.apache.org/licenses/LICENSE-2.0
+ *
+ *   Unless required by applicable law or agreed to in writing, software
+ *   distributed under the License is distributed on an "AS IS" BASIS,
+ *   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ *   See the License for the specific language governing permissions and
+ *   limitations under the License.
+ * ====================================================================
+ */
+
+package org.apache.pylucene.search;
+
+import java.io.IOException;
+
+import org.apache.lucene.index.LeafReaderContext;
+import org.apache.lucene.search.IndexSearcher;
+import org.apache.lucene.search.Query;
+import org.apache.lucene.search.SimpleCollector;
+import org.apache.lucene.search.Scorer;
+
+/**
+ * A collector that buffers hits and hands them to Python a batch at a
+ * time instead of calling into Python once per hit.
+ *
+ * Doc ids, relative to the current leaf, and their scores are collected
+ * into reused arrays and passed to <code>collectBatch(docs, scores,
+ * count)</code> whenever the buffer fills up, before moving on to the
+ * next leaf reader and when {@link #flush} is called. Only the first
+ * <code>count</code> entries of the arrays are valid. Scores are only
+ * computed when <code>needsScores()</code> returns true.
+ *
+ * Lucene has no end-of-search notification for collectors so either use
+ * {@link #search} or call {@link #flush} once searching is done.
+ */
+
+public class PythonBatchCollector extends SimpleCollector {
+
+    public static final int DEFAULT_BATCH_SIZE = 1024;
+
+    private long pythonObject;
+
+    protected final int[] docs;
+    protected final float[] scores;
+    protected int count;
+    protected boolean scoring;
+    protected Scorer scorer;
+
+    public PythonBatchCollector()
+    {
+        this(DEFAULT_BATCH_SIZE);
+    }
+
+    public PythonBatchCollector(int batchSize)
+    {
+        if (batchSize <= 0)
+            throw new IllegalArgumentException("batchSize must be > 0");
+
+        docs = new int[batchSize];
+        scores = new float[batchSize];
+    }
+
+    public void pythonExtension(long pythonObject)
+    {
+        this.pythonObject = pythonObject;
+    }
+    public long pythonExtension()
+    {
+        return this.pythonObject;
+    }
+
+    public void finalize()
+        throws Throwable
+    {
+        pythonDecRef();
+    }
+
+    public int getBatchSize()
+    {
+        return docs.length;
+    }
+
+    public void setScorer(Scorer scorer)
+        throws IOException
+    {
+        this.scorer = scorer;
+    }
+
+    public void collect(int doc)
+        throws IOException
+    {
+        docs[count] = doc;
+        if (scoring)
+            scores[count] = scorer.score();
+
+        if (++count == docs.length)
+            flush();
+    }
+
+    @Override
+    protected void doSetNextReader(LeafReaderContext context)
+        throws IOException
+    {
+        flush();
+        scoring = needsScores();
+        setNextReader(context);
+    }
+
+    public void flush()
+        throws IOException
+    {
+        if (count > 0)
+        {
+            int n = count;
+
+            count = 0;
+            collectBatch(docs, scores, n);
+        }
+    }
+
+    public void search(IndexSearcher searcher, Query query)
+        throws IOException
+    {
+        searcher.search(query, this);
+        flush();
+    }
+
+    public native void pythonDecRef();
+
+    public native void collectBatch(int[] docs, float[] scores, int count)
+        throws IOException;
+
+    public native void setNextReader(LeafReaderContext context)
+        throws IOException;
+
+    @Override
+    public native boolean needsScores();
+}
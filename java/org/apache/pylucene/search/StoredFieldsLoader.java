@@ -0,0 +1,169 @@
+/* ====================================================================
+ *   Licensed under the Apache License, Version 2.0 (the "License");
+ *   you may not use this file except in compliance with the License.
+ *   You may obtain a copy of the License at
+ *
+ *       http://www.apache.org/licenses/LICENSE-2.0
+ *
+ *   Unless required by applicable law or agreed to in writing, software
+ *   distributed under the License is distributed on an "AS IS" BASIS,
+ *   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ *   See the License for the specific language governing permissions and
+ *   limitations under the License.
+ * ====================================================================
+ */
+
+package org.apache.pylucene.search;
+
+import java.io.IOException;
+import java.nio.charset.StandardCharsets;
+import java.util.Arrays;
+import java.util.HashMap;
+
+import org.apache.lucene.index.FieldInfo;
+import org.apache.lucene.index.IndexReader;
+import org.apache.lucene.index.StoredFieldVisitor;
+import org.apache.lucene.search.ScoreDoc;
+
+/**
+ * Loads the stored values of a set of fields for many documents in one
+ * call instead of calling <code>searcher.doc(id).get(name)</code> from
+ * Python for every hit and field.
+ *
+ * Documents are visited in doc id order and only the requested fields are
+ * decoded. The values are returned in a single array, row by row in the
+ * order of the doc ids given: <code>values[i * fields.length + f]</code>
+ * is the value of <code>fields[f]</code> for <code>docs[i]</code>, or null.
+ * From Python, a list of dicts is then built with
+ * <code>dict(zip(fields, values[i * n:(i + 1) * n]))</code> and the column
+ * of a field is <code>values.tolist()[f::n]</code> since JArray slices
+ * take no step.
+ *
+ * Numeric values are returned as strings, binary values are not loaded.
+ * For multi-valued fields only the first value is returned. A field may
+ * only be requested once.
+ */
+
+public class StoredFieldsLoader {
+
+    private final IndexReader reader;
+    private final String[] fields;
+    private final HashMap<String, Integer> columns;
+
+    public StoredFieldsLoader(IndexReader reader, String[] fields)
+    {
+        this.reader = reader;
+        this.fields = fields.clone();
+        this.columns = new HashMap<String, Integer>();
+
+        for (int i = 0; i < fields.length; i++) {
+            if (columns.put(fields[i], i) != null)
+                throw new IllegalArgumentException(
+                    "duplicate field: " + fields[i]);
+        }
+    }
+
+    public String[] getFields()
+    {
+        return fields.clone();
+    }
+
+    public String[] load(ScoreDoc[] scoreDocs)
+        throws IOException
+    {
+        int[] docs = new int[scoreDocs.length];
+
+        for (int i = 0; i < docs.length; i++)
+            docs[i] = scoreDocs[i].doc;
+
+        return load(docs);
+    }
+
+    public String[] load(int[] docs)
+        throws IOException
+    {
+        String[] values = new String[docs.length * fields.length];
+        long[] order = new long[docs.length];
+        Visitor visitor = new Visitor(values);
+
+        // sort by doc id, keeping track of where each one goes
+        for (int i = 0; i < docs.length; i++)
+            order[i] = ((long) docs[i] << 32) | i;
+        Arrays.sort(order);
+
+        for (long entry : order) {
+            visitor.reset((int) entry * fields.length);
+            reader.document((int) (entry >>> 32), visitor);
+        }
+
+        return values;
+    }
+
+    private class Visitor extends StoredFieldVisitor {
+
+        private final String[] values;
+        private int offset;
+        private int remaining;
+
+        Visitor(String[] values)
+        {
+            this.values = values;
+        }
+
+        void reset(int offset)
+        {
+            this.offset = offset;
+            this.remaining = fields.length;
+        }
+
+        @Override
+        public Status needsField(FieldInfo fieldInfo)
+        {
+            if (remaining == 0)
+                return Status.STOP;
+
+            Integer column = columns.get(fieldInfo.name);
+
+            if (column == null || values[offset + column] != null)
+                return Status.NO;
+
+            return Status.YES;
+        }
+
+        private void set(FieldInfo fieldInfo, String value)
+        {
+            values[offset + columns.get(fieldInfo.name)] = value;
+            remaining -= 1;
+        }
+
+        @Override
+        public void stringField(FieldInfo fieldInfo, byte[] value)
+        {
+            set(fieldInfo, new String(value, StandardCharsets.UTF_8));
+        }
+
+        @Override
+        public void intField(FieldInfo fieldInfo, int value)
+        {
+            set(fieldInfo, Integer.toString(value));
+        }
+
+        @Override
+        public void longField(FieldInfo fieldInfo, long value)
+        {
+            set(fieldInfo, Long.toString(value));
+        }
+
+        @Override
+        public void floatField(FieldInfo fieldInfo, float value)
+        {
+            set(fieldInfo, Float.toString(value));
+        }
+
+        @Override
+        public void doubleField(FieldInfo fieldInfo, double value)
+        {
+            set(fieldInfo, Double.toString(value));
+        }
+    }
+}
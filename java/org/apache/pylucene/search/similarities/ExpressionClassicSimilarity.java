@@ -0,0 +1,237 @@
+/* ====================================================================
+ *   Licensed under the Apache License, Version 2.0 (the "License");
+ *   you may not use this file except in compliance with the License.
+ *   You may obtain a copy of the License at
+ *
+ *       http://www.apache.org/licenses/LICENSE-2.0
+ *
+ *   Unless required by applicable law or agreed to in writing, software
+ *   distributed under the License is distributed on an "AS IS" BASIS,
+ *   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ *   See the License for the specific language governing permissions and
+ *   limitations under the License.
+ * ====================================================================
+ */
+
+package org.apache.pylucene.search.similarities;
+
+import java.text.ParseException;
+import java.util.Arrays;
+
+import org.apache.lucene.expressions.Expression;
+import org.apache.lucene.expressions.js.JavascriptCompiler;
+import org.apache.lucene.search.CollectionStatistics;
+import org.apache.lucene.search.DoubleValues;
+import org.apache.lucene.search.Explanation;
+import org.apache.lucene.search.TermStatistics;
+import org.apache.lucene.search.similarities.ClassicSimilarity;
+import org.apache.lucene.util.SmallFloat;
+
+/**
+ * A {@link ClassicSimilarity} whose factors are given as formulas, compiled
+ * once into Java bytecode by the expressions module, instead of being
+ * computed by Python callbacks like {@link PythonClassicSimilarity} does.
+ *
+ * Formulas use the javascript syntax of {@link JavascriptCompiler} and the
+ * following variables:
+ * <ul>
+ *   <li><code>tf</code>: <code>freq</code></li>
+ *   <li><code>idf</code>: <code>docFreq</code>, <code>docCount</code></li>
+ *   <li><code>lengthNorm</code>: <code>numTerms</code></li>
+ *   <li><code>sloppyFreq</code>: <code>distance</code></li>
+ * </ul>
+ * A null formula keeps the default of ClassicSimilarity.
+ *
+ * The values of <code>tf</code> for integer frequencies and of
+ * <code>sloppyFreq</code> for distances below {@link #TABLE_SIZE} are
+ * computed once, into tables, as are the values of <code>lengthNorm</code>
+ * for the lengths norms are encoded with.
+ */
+
+public class ExpressionClassicSimilarity extends ClassicSimilarity {
+
+    public static final int TABLE_SIZE = 256;
+
+    private final Formula tf, idf, lengthNorm, sloppyFreq;
+    private final float[] tfTable, sloppyFreqTable, lengthNormTable;
+
+    public ExpressionClassicSimilarity(String tf, String idf,
+                                       String lengthNorm, String sloppyFreq)
+        throws ParseException
+    {
+        this.tf = Formula.compile(tf, "freq");
+        this.idf = Formula.compile(idf, "docFreq", "docCount");
+        this.lengthNorm = Formula.compile(lengthNorm, "numTerms");
+        this.sloppyFreq = Formula.compile(sloppyFreq, "distance");
+
+        tfTable = new float[TABLE_SIZE];
+        sloppyFreqTable = new float[TABLE_SIZE];
+        lengthNormTable = new float[256];
+
+        for (int i = 0; i < TABLE_SIZE; i++) {
+            tfTable[i] = computeTf(i);
+            sloppyFreqTable[i] = computeSloppyFreq(i);
+        }
+        for (int i = 0; i < 256; i++)
+            lengthNormTable[i] = computeLengthNorm(
+                SmallFloat.byte4ToInt((byte) i));
+    }
+
+    private float computeTf(float freq)
+    {
+        if (tf == null)
+            return super.tf(freq);
+
+        return (float) tf.evaluate(freq);
+    }
+
+    private float computeSloppyFreq(int distance)
+    {
+        if (sloppyFreq == null)
+            return super.sloppyFreq(distance);
+
+        return (float) sloppyFreq.evaluate(distance);
+    }
+
+    private float computeLengthNorm(int numTerms)
+    {
+        if (lengthNorm == null)
+            return super.lengthNorm(numTerms);
+
+        return (float) lengthNorm.evaluate(numTerms);
+    }
+
+    @Override
+    public float tf(float freq)
+    {
+        int i = (int) freq;
+
+        if (i == freq && i >= 0 && i < TABLE_SIZE)
+            return tfTable[i];
+
+        return computeTf(freq);
+    }
+
+    @Override
+    public float sloppyFreq(int distance)
+    {
+        if (distance >= 0 && distance < TABLE_SIZE)
+            return sloppyFreqTable[distance];
+
+        return computeSloppyFreq(distance);
+    }
+
+    @Override
+    public float lengthNorm(int numTerms)
+    {
+        byte code = SmallFloat.intToByte4(numTerms);
+
+        if (SmallFloat.byte4ToInt(code) == numTerms)
+            return lengthNormTable[code & 0xff];
+
+        return computeLengthNorm(numTerms);
+    }
+
+    @Override
+    public float idf(long docFreq, long docCount)
+    {
+        if (idf == null)
+            return super.idf(docFreq, docCount);
+
+        return (float) idf.evaluate(docFreq, docCount);
+    }
+
+    @Override
+    public Explanation idfExplain(CollectionStatistics collectionStats,
+                                  TermStatistics termStats)
+    {
+        if (idf == null)
+            return super.idfExplain(collectionStats, termStats);
+
+        final long df = termStats.docFreq();
+        final long docCount = collectionStats.docCount() == -1
+            ? collectionStats.maxDoc() : collectionStats.docCount();
+
+        return Explanation.match(
+            idf(df, docCount), "idf, computed as " + idf.source + " from:",
+            Explanation.match(df, "docFreq"),
+            Explanation.match(docCount, "docCount"));
+    }
+
+    @Override
+    public String toString()
+    {
+        return "ExpressionClassicSimilarity(tf=" + tf + ", idf=" + idf +
+            ", lengthNorm=" + lengthNorm + ", sloppyFreq=" + sloppyFreq + ")";
+    }
+
+    private static class Formula {
+
+        final String source;
+        final Expression expression;
+        final int[] slots;
+
+        private Formula(String source, String[] names)
+            throws ParseException
+        {
+            this.source = source;
+            this.expression = JavascriptCompiler.compile(source);
+            this.slots = new int[expression.variables.length];
+
+            for (int i = 0; i < slots.length; i++) {
+                slots[i] = Arrays.asList(names).indexOf(
+                    expression.variables[i]);
+                if (slots[i] < 0)
+                    throw new IllegalArgumentException(
+                        "unknown variable '" + expression.variables[i] +
+                        "' in '" + source + "', expected one of " +
+                        Arrays.toString(names));
+            }
+        }
+
+        static Formula compile(String source, String... names)
+            throws ParseException
+        {
+            return source == null ? null : new Formula(source, names);
+        }
+
+        /* allocates its variables, similarities are shared by threads */
+        double evaluate(double... inputs)
+        {
+            DoubleValues[] values = new DoubleValues[slots.length];
+
+            for (int i = 0; i < slots.length; i++)
+                values[i] = new Constant(inputs[slots[i]]);
+
+            return expression.evaluate(values);
+        }
+
+        @Override
+        public String toString()
+        {
+            return source;
+        }
+    }
+
+    private static class Constant extends DoubleValues {
+
+        private final double value;
+
+        Constant(double value)
+        {
+            this.value = value;
+        }
+
+        @Override
+        public double doubleValue()
+        {
+            return value;
+        }
+
+        @Override
+        public boolean advanceExact(int doc)
+        {
+            return true;
+        }
+    }
+}
@@ -0,0 +1,285 @@
+/* ====================================================================
+ *   Licensed under the Apache License, Version 2.0 (the "License");
+ *   you may not use this file except in compliance with the License.
+ *   You may obtain a copy of the License at
+ *
+ *       http://www.apache.org/licenses/LICENSE-2.0
+ *
+ *   Unless required by applicable law or agreed to in writing, software
+ *   distributed under the License is distributed on an "AS IS" BASIS,
+ *   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ *   See the License for the specific language governing permissions and
+ *   limitations under the License.
+ * ====================================================================
+ */
+
+package org.apache.pylucene.search.similarities;
+
+import java.io.IOException;
+
+import org.apache.lucene.index.FieldInvertState;
+import org.apache.lucene.index.LeafReaderContext;
+import org.apache.lucene.index.NumericDocValues;
+import org.apache.lucene.index.PostingsEnum;
+import org.apache.lucene.index.Term;
+import org.apache.lucene.search.CollectionStatistics;
+import org.apache.lucene.search.DocIdSetIterator;
+import org.apache.lucene.search.TermStatistics;
+import org.apache.lucene.search.similarities.Similarity;
+import org.apache.lucene.util.BytesRef;
+import org.apache.lucene.util.SmallFloat;
+
+/**
+ * A similarity scoring documents a block at a time in Python instead of
+ * calling into Python once per matching document.
+ *
+ * Lucene asks a scorer for the score of one document at a time so, for
+ * single term queries, the postings of the term in the current leaf are
+ * read ahead of the query, a block of documents at a time, and their leaf
+ * relative doc ids, term frequencies and field lengths are passed to
+ * <code>scoreBlock(weight, context, docs, freqs, lengths, scores,
+ * count)</code> which is expected to fill in the first <code>count</code>
+ * entries of <code>scores</code>. The scores are then returned from the
+ * buffer as the query reaches the documents. This works with any
+ * collector, <code>TopScoreDocCollector</code> included.
+ *
+ * The arrays are reused from one block to the next and support the buffer
+ * protocol, <code>numpy.asarray(freqs)[:count]</code> reads them without
+ * copying and <code>numpy.asarray(scores)[:count] = ...</code> writes the
+ * scores back.
+ *
+ * Phrase and synonym queries, whose frequencies are not the ones of a
+ * single term's postings, are scored with blocks of one document. As
+ * blocks are read ahead, queries skipping over many documents, such as
+ * conjunctions, may score documents that are never collected.
+ *
+ * Norms are encoded like {@link
+ * org.apache.lucene.search.similarities.BM25Similarity} does and decoded
+ * into field lengths, 0 for documents without a norm. When the field omits
+ * norms, lengths are {@link #NO_NORMS}, for which BM25 uses <code>k1</code>
+ * as the length normalization of every document.
+ */
+
+public class PythonBlockSimilarity extends Similarity {
+
+    public static final int DEFAULT_BLOCK_SIZE = 1024;
+    /* the length passed for every document when the field omits norms */
+    public static final int NO_NORMS = -1;
+
+    private long pythonObject;
+    private final int blockSize;
+
+    public PythonBlockSimilarity()
+    {
+        this(DEFAULT_BLOCK_SIZE);
+    }
+
+    public PythonBlockSimilarity(int blockSize)
+    {
+        if (blockSize <= 0)
+            throw new IllegalArgumentException("blockSize must be > 0");
+
+        this.blockSize = blockSize;
+    }
+
+    public void pythonExtension(long pythonObject)
+    {
+        this.pythonObject = pythonObject;
+    }
+    public long pythonExtension()
+    {
+        return this.pythonObject;
+    }
+
+    public void finalize()
+        throws Throwable
+    {
+        pythonDecRef();
+    }
+
+    public native void pythonDecRef();
+
+    public int getBlockSize()
+    {
+        return blockSize;
+    }
+
+    @Override
+    public long computeNorm(FieldInvertState state)
+    {
+        return SmallFloat.intToByte4(state.getLength() - state.getNumOverlap());
+    }
+
+    @Override
+    public SimWeight computeWeight(
+        float boost, CollectionStatistics collectionStats,
+        TermStatistics... termStats)
+    {
+        return new BlockWeight(boost, collectionStats, termStats);
+    }
+
+    @Override
+    public SimScorer simScorer(SimWeight weight, LeafReaderContext context)
+        throws IOException
+    {
+        return new BlockScorer((BlockWeight) weight, context);
+    }
+
+    public native void scoreBlock(BlockWeight weight,
+                                  LeafReaderContext context,
+                                  int[] docs, float[] freqs, int[] lengths,
+                                  float[] scores, int count)
+        throws IOException;
+
+    public static class BlockWeight extends SimWeight {
+
+        public final float boost;
+        public final CollectionStatistics collectionStats;
+        public final TermStatistics[] termStats;
+
+        BlockWeight(float boost, CollectionStatistics collectionStats,
+                    TermStatistics[] termStats)
+        {
+            this.boost = boost;
+            this.collectionStats = collectionStats;
+            this.termStats = termStats;
+        }
+    }
+
+    private class BlockScorer extends SimScorer {
+
+        private final BlockWeight weight;
+        private final LeafReaderContext context;
+        private final String field;
+        private final boolean readAhead;
+
+        private PostingsEnum postings;
+        private NumericDocValues norms;
+        private boolean started;
+
+        private int[] docs;
+        private float[] freqs;
+        private int[] lengths;
+        private float[] scores;
+        private int count, pos;
+
+        // documents not found in the postings are scored one at a time
+        private final int[] oneDoc = new int[1];
+        private final float[] oneFreq = new float[1];
+        private final int[] oneLength = new int[1];
+        private final float[] oneScore = new float[1];
+
+        BlockScorer(BlockWeight weight, LeafReaderContext context)
+        {
+            this.weight = weight;
+            this.context = context;
+            this.field = weight.collectionStats.field();
+            this.readAhead = (weight.termStats.length == 1 &&
+                              weight.termStats[0] != null);
+        }
+
+        /* scorers are created for every leaf, even when not scoring */
+        private void start()
+            throws IOException
+        {
+            started = true;
+            norms = context.reader().getNormValues(field);
+
+            if (readAhead)
+            {
+                Term term = new Term(field, weight.termStats[0].term());
+
+                postings = context.reader().postings(term, PostingsEnum.FREQS);
+                if (postings != null)
+                {
+                    docs = new int[blockSize];
+                    freqs = new float[blockSize];
+                    lengths = new int[blockSize];
+                    scores = new float[blockSize];
+                }
+            }
+        }
+
+        private int length(int doc)
+            throws IOException
+        {
+            if (norms == null)
+                return NO_NORMS;
+
+            if (doc < norms.docID())
+                norms = context.reader().getNormValues(field);
+
+            if (norms.advanceExact(doc))
+                return SmallFloat.byte4ToInt((byte) norms.longValue());
+
+            return 0;
+        }
+
+        private void fill(int target)
+            throws IOException
+        {
+            int doc = postings.docID();
+
+            if (doc < target)
+                doc = postings.advance(target);
+
+            count = pos = 0;
+            while (doc != DocIdSetIterator.NO_MORE_DOCS &&
+                   count < docs.length) {
+                docs[count] = doc;
+                freqs[count] = postings.freq();
+                lengths[count] = length(doc);
+                count += 1;
+                doc = postings.nextDoc();
+            }
+
+            if (count > 0)
+                scoreBlock(weight, context, docs, freqs, lengths, scores,
+                           count);
+        }
+
+        @Override
+        public float score(int doc, float freq)
+            throws IOException
+        {
+            if (!started)
+                start();
+
+            if (postings != null)
+            {
+                if ((count == 0 || doc > docs[count - 1]) &&
+                    postings.docID() != DocIdSetIterator.NO_MORE_DOCS)
+                    fill(doc);
+
+                while (pos < count && docs[pos] < doc)
+                    pos += 1;
+
+                if (pos < count && docs[pos] == doc && freqs[pos] == freq)
+                    return scores[pos];
+            }
+
+            oneDoc[0] = doc;
+            oneFreq[0] = freq;
+            oneLength[0] = length(doc);
+            scoreBlock(weight, context, oneDoc, oneFreq, oneLength, oneScore,
+                       1);
+
+            return oneScore[0];
+        }
+
+        @Deprecated
+        @Override
+        public float computeSlopFactor(int distance)
+        {
+            return 1.0f / (distance + 1);
+        }
+
+        @Deprecated
+        @Override
+        public float computePayloadFactor(
+            int doc, int start, int end, BytesRef payload)
+        {
+            return 1.0f;
+        }
+    }
+}
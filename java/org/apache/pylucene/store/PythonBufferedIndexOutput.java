@@ -0,0 +1,165 @@
+/* ====================================================================
+ *   Licensed under the Apache License, Version 2.0 (the "License");
+ *   you may not use this file except in compliance with the License.
+ *   You may obtain a copy of the License at
+ *
+ *       http://www.apache.org/licenses/LICENSE-2.0
+ *
+ *   Unless required by applicable law or agreed to in writing, software
+ *   distributed under the License is distributed on an "AS IS" BASIS,
+ *   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ *   See the License for the specific language governing permissions and
+ *   limitations under the License.
+ * ====================================================================
+ */
+
+package org.apache.pylucene.store;
+
+import java.io.IOException;
+import java.util.zip.CRC32;
+import org.apache.lucene.store.IndexOutput;
+
+/**
+ * Like {@link PythonIndexOutput} but bytes are buffered and checksummed in
+ * Java. Python only implements <code>writeInternal(b, offset, length)
+ * </code>, called once per filled buffer, or directly with the caller's
+ * array for writes larger than the buffer, and <code>closeInternal()
+ * </code>. Only <code>length</code> bytes from <code>offset</code> are to
+ * be written, for example with <code>f.write(memoryview(b)[offset:offset
+ * + length])</code>.
+ */
+
+public class PythonBufferedIndexOutput extends IndexOutput {
+
+    public static final int DEFAULT_BUFFER_SIZE = 8192;
+
+    private long pythonObject;
+
+    private final byte[] buffer;
+    private final CRC32 crc = new CRC32();
+    private int position;     // bytes in buffer
+    private int checksummed;  // bytes in buffer already added to crc
+    private long flushed;     // bytes passed to writeInternal()
+    private boolean closed;
+
+    public PythonBufferedIndexOutput(String resourceDescription, String name)
+    {
+        this(resourceDescription, name, DEFAULT_BUFFER_SIZE);
+    }
+
+    public PythonBufferedIndexOutput(String resourceDescription, String name,
+                                     int bufferSize)
+    {
+        super(resourceDescription, name);
+
+        if (bufferSize <= 0)
+            throw new IllegalArgumentException("bufferSize must be > 0");
+
+        buffer = new byte[bufferSize];
+    }
+
+    public void pythonExtension(long pythonObject)
+    {
+        this.pythonObject = pythonObject;
+    }
+    public long pythonExtension()
+    {
+        return this.pythonObject;
+    }
+
+    public void finalize()
+        throws Throwable
+    {
+        pythonDecRef();
+    }
+
+    public native void pythonDecRef();
+
+    public native void writeInternal(byte[] b, int offset, int length)
+        throws IOException;
+
+    public native void closeInternal()
+        throws IOException;
+
+    @Override
+    public long getFilePointer()
+    {
+        return flushed + position;
+    }
+
+    @Override
+    public long getChecksum()
+        throws IOException
+    {
+        crc.update(buffer, checksummed, position - checksummed);
+        checksummed = position;
+
+        return crc.getValue();
+    }
+
+    @Override
+    public void writeByte(byte b)
+        throws IOException
+    {
+        if (position == buffer.length)
+            flushBuffer();
+
+        buffer[position++] = b;
+    }
+
+    @Override
+    public void writeBytes(byte[] b, int offset, int length)
+        throws IOException
+    {
+        if (length >= buffer.length)
+        {
+            flushBuffer();
+            crc.update(b, offset, length);
+            writeInternal(b, offset, length);
+            flushed += length;
+        }
+        else
+        {
+            while (length > 0) {
+                if (position == buffer.length)
+                    flushBuffer();
+
+                int count = Math.min(length, buffer.length - position);
+
+                System.arraycopy(b, offset, buffer, position, count);
+                position += count;
+                offset += count;
+                length -= count;
+            }
+        }
+    }
+
+    @Override
+    public void close()
+        throws IOException
+    {
+        if (!closed)
+        {
+            closed = true;
+            try {
+                flushBuffer();
+            } finally {
+                closeInternal();
+            }
+        }
+    }
+
+    protected void flushBuffer()
+        throws IOException
+    {
+        if (position > 0)
+        {
+            int count = position;
+
+            crc.update(buffer, checksummed, count - checksummed);
+            position = checksummed = 0;
+            writeInternal(buffer, 0, count);
+            flushed += count;
+        }
+    }
+}
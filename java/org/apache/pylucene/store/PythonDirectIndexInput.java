@@ -0,0 +1,98 @@
+/* ====================================================================
+ *   Licensed under the Apache License, Version 2.0 (the "License");
+ *   you may not use this file except in compliance with the License.
+ *   You may obtain a copy of the License at
+ *
+ *       http://www.apache.org/licenses/LICENSE-2.0
+ *
+ *   Unless required by applicable law or agreed to in writing, software
+ *   distributed under the License is distributed on an "AS IS" BASIS,
+ *   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ *   See the License for the specific language governing permissions and
+ *   limitations under the License.
+ * ====================================================================
+ */
+
+package org.apache.pylucene.store;
+
+import java.io.EOFException;
+import java.io.IOException;
+import org.apache.lucene.store.BufferedIndexInput;
+import org.apache.lucene.store.IOContext;
+
+/**
+ * Like {@link PythonIndexInput} but instead of returning a new byte[] from
+ * Python for every buffer refill, <code>readInto(b, offset, length,
+ * pos)</code> is passed the input's own buffer to fill in place, for
+ * example with <code>f.readinto(memoryview(b)[offset:offset + length])
+ * </code>, and returns the number of bytes read.
+ */
+
+public class PythonDirectIndexInput extends BufferedIndexInput {
+
+    private long pythonObject;
+
+    public PythonDirectIndexInput(String resourceDesc)
+    {
+        super(resourceDesc);
+    }
+
+    public PythonDirectIndexInput(String resourceDesc, int bufferSize)
+    {
+        super(resourceDesc, bufferSize);
+    }
+
+    public PythonDirectIndexInput(String resourceDesc, IOContext context)
+    {
+        super(resourceDesc, context);
+    }
+
+    public void pythonExtension(long pythonObject)
+    {
+        this.pythonObject = pythonObject;
+    }
+    public long pythonExtension()
+    {
+        return this.pythonObject;
+    }
+
+    public void finalize()
+        throws Throwable
+    {
+        pythonDecRef();
+    }
+
+    public native void pythonDecRef();
+
+    @Override
+    public native PythonDirectIndexInput clone();
+    @Override
+    public native long length();
+    @Override
+    public native void close()
+        throws IOException;
+    @Override
+    public native void seekInternal(long pos)
+        throws IOException;
+
+    public native int readInto(byte[] b, int offset, int length, long pos)
+        throws IOException;
+
+    @Override
+    protected void readInternal(byte[] b, int offset, int length)
+        throws IOException
+    {
+        long pos = getFilePointer();
+
+        while (length > 0) {
+            int count = readInto(b, offset, length, pos);
+
+            if (count <= 0)
+                throw new EOFException("read past EOF: " + this);
+
+            offset += count;
+            length -= count;
+            pos += count;
+        }
+    }
+}
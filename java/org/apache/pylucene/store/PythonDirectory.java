@@ -17,7 +17,9 @@ package org.apache.pylucene.store;
 
 import java.io.IOException;
 import java.util.Collection;
+import java.util.EnumMap;
 
+import org.apache.lucene.store.BufferedIndexInput;
 import org.apache.lucene.store.Directory;
 import org.apache.lucene.store.IOContext;
 import org.apache.lucene.store.IndexInput;
@@ -29,6 +31,8 @@ import org.apache.lucene.store.Lock;
 public class PythonDirectory extends Directory {
 
     private long pythonObject;
+    private final EnumMap<IOContext.Context, Integer> bufferSizes =
+        new EnumMap<IOContext.Context, Integer>(IOContext.Context.class);
 
     public PythonDirectory()
     {
@@ -49,6 +53,34 @@ public class PythonDirectory extends Directory {
         pythonDecRef();
     }
 
+    /**
+     * Sets the size of the buffer inputs opened in <code>context</code>
+     * should use, see {@link #getBufferSize}.
+     */
+    public void setBufferSize(IOContext.Context context, int bufferSize)
+    {
+        if (bufferSize < BufferedIndexInput.MIN_BUFFER_SIZE)
+            throw new IllegalArgumentException("bufferSize must be at least " + BufferedIndexInput.MIN_BUFFER_SIZE);
+
+        bufferSizes.put(context, bufferSize);
+    }
+
+    /**
+     * Returns the buffer size set for <code>context</code> with
+     * {@link #setBufferSize} or else Lucene's default for it, meant to be
+     * passed to a new {@link PythonIndexInput} or
+     * {@link PythonDirectIndexInput} from <code>openInput()</code>.
+     */
+    public int getBufferSize(IOContext context)
+    {
+        Integer bufferSize = bufferSizes.get(context.context);
+
+        if (bufferSize == null)
+            return BufferedIndexInput.bufferSize(context);
+
+        return bufferSize;
+    }
+
     @Override
     public void sync(Collection<String> names)
         throws IOException
@@ -0,0 +1,53 @@
+/* ====================================================================
+ *   Licensed under the Apache License, Version 2.0 (the "License");
+ *   you may not use this file except in compliance with the License.
+ *   You may obtain a copy of the License at
+ *
+ *       http://www.apache.org/licenses/LICENSE-2.0
+ *
+ *   Unless required by applicable law or agreed to in writing, software
+ *   distributed under the License is distributed on an "AS IS" BASIS,
+ *   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ *   See the License for the specific language governing permissions and
+ *   limitations under the License.
+ * ====================================================================
+ */
+
+package org.apache.pylucene.store;
+
+import java.io.IOException;
+import org.apache.lucene.store.IOContext;
+
+/**
+ * A {@link PythonDirectIndexInput} whose <code>slice(sliceDescription,
+ * offset, length)</code> is also implemented in Python, for inputs that can
+ * cheaply open a new input over a sub-range of their data, such as an mmap
+ * region, instead of going through Lucene's default slice wrapper which
+ * buffers every byte twice.
+ */
+
+public class PythonSliceableIndexInput extends PythonDirectIndexInput {
+
+    public PythonSliceableIndexInput(String resourceDesc)
+    {
+        super(resourceDesc);
+    }
+
+    public PythonSliceableIndexInput(String resourceDesc, int bufferSize)
+    {
+        super(resourceDesc, bufferSize);
+    }
+
+    public PythonSliceableIndexInput(String resourceDesc, IOContext context)
+    {
+        super(resourceDesc, context);
+    }
+
+    @Override
+    public native PythonSliceableIndexInput clone();
+
+    @Override
+    public native PythonSliceableIndexInput slice(String sliceDescription,
+                                                  long offset, long length)
+        throws IOException;
+}
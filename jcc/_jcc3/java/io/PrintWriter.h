@@ -29,7 +29,7 @@ namespace java {
             static jclass initializeClass(bool);
 
             explicit PrintWriter(jobject obj) : Writer(obj) {
-                initializeClass(false);
+                env->getClass(initializeClass);
             }
             PrintWriter(Writer writer);
             PrintWriter(const PrintWriter& obj) : Writer(obj) {}
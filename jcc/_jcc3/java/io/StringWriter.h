@@ -29,7 +29,7 @@ namespace java {
             static jclass initializeClass(bool);
 
             explicit StringWriter(jobject obj) : Writer(obj) {
-                initializeClass(false);
+                env->getClass(initializeClass);
             }
             StringWriter();
             StringWriter(const StringWriter& obj) : Writer(obj) {}
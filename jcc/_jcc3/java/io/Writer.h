@@ -29,7 +29,7 @@ namespace java {
             static jclass initializeClass(bool);
 
             explicit Writer(jobject obj) : Object(obj) {
-                initializeClass(false);
+                env->getClass(initializeClass);
             }
         };
 
@@ -29,7 +29,7 @@ namespace java {
             static jclass initializeClass(bool);
 
             explicit Character(jobject obj) : Object(obj) {
-                initializeClass(false);
+                env->getClass(initializeClass);
             }
             Character(jchar);
 
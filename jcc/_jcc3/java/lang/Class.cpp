@@ -397,7 +397,7 @@ namespace java {
         {
             if (!(arg = castCheck(arg, Class::initializeClass, 1)))
                 return NULL;
-            return t_Class::wrap_Object(Class(((t_Class *) arg)->object.this$));
+            return t_Class::wrap_Object(Class(env->newLocalRef(((t_Class *) arg)->object.this$)));
         }
         static PyObject *t_Class_instance_(PyTypeObject *type, PyObject *arg)
         {
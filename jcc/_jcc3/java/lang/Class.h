@@ -40,7 +40,7 @@ namespace java {
             static jclass initializeClass(bool);
 
             explicit Class(jobject obj) : Object(obj) {
-                initializeClass(false);
+                env->getClass(initializeClass);
             }
             Class(const Class& obj) : Object(obj) {}
 
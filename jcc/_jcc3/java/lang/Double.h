@@ -29,7 +29,7 @@ namespace java {
             static jclass initializeClass(bool);
 
             explicit Double(jobject obj) : Object(obj) {
-                initializeClass(false);
+                env->getClass(initializeClass);
             }
             Double(jdouble);
 
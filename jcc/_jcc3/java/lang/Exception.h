@@ -30,7 +30,7 @@ namespace java {
             static jclass initializeClass(bool);
 
             explicit Exception(jobject obj) : Throwable(obj) {
-                initializeClass(false);
+                env->getClass(initializeClass);
             }
         };
 
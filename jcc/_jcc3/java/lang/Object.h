@@ -31,7 +31,7 @@ namespace java {
 
             explicit Object();
             explicit Object(jobject obj) : JObject(obj) {
-                initializeClass(false);
+                env->getClass(initializeClass);
             }
 
             String toString() const;
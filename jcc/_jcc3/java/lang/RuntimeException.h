@@ -30,7 +30,7 @@ namespace java {
             static jclass initializeClass(bool);
 
             explicit RuntimeException(jobject obj) : Exception(obj) {
-                initializeClass(false);
+                env->getClass(initializeClass);
             }
         };
 
@@ -30,7 +30,7 @@ namespace java {
             static jclass initializeClass(bool);
 
             explicit String(jobject obj) : Object(obj) {
-                initializeClass(false);
+                env->getClass(initializeClass);
             }
             String();
             String(const String& obj) : Object(obj) {}
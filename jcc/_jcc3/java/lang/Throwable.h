@@ -36,7 +36,7 @@ namespace java {
             static jclass initializeClass(bool);
 
             explicit Throwable(jobject obj) : Object(obj) {
-                initializeClass(false);
+                env->getClass(initializeClass);
             }
 
             void printStackTrace() const;
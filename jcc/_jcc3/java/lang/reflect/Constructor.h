@@ -36,7 +36,7 @@ namespace java {
                 static jclass initializeClass(bool);
 
                 explicit Constructor(jobject obj) : Object(obj) {
-                    initializeClass(false);
+                    env->getClass(initializeClass);
                 }
                 Constructor(const Constructor& obj) : Object(obj) {}
 
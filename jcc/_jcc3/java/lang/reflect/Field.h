@@ -34,7 +34,7 @@ namespace java {
                 static jclass initializeClass(bool);
 
                 explicit Field(jobject obj) : Object(obj) {
-                    initializeClass(false);
+                    env->getClass(initializeClass);
                 }
                 Field(const Field& obj) : Object(obj) {}
 
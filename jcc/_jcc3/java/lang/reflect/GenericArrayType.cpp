@@ -73,7 +73,7 @@ namespace java {
             {
                 if (!(arg = castCheck(arg, GenericArrayType::initializeClass, 1)))
                     return NULL;
-                return t_GenericArrayType::wrap_Object(GenericArrayType(((t_GenericArrayType *) arg)->object.this$));
+                return t_GenericArrayType::wrap_Object(GenericArrayType(env->newLocalRef(((t_GenericArrayType *) arg)->object.this$)));
             }
             static PyObject *t_GenericArrayType_instance_(PyTypeObject *type, PyObject *arg)
             {
@@ -29,7 +29,7 @@ namespace java {
 
                 explicit GenericArrayType(jobject obj) : java::lang::reflect::Type(obj) {
                     if (obj != NULL)
-                        initializeClass(false);
+                        env->getClass(initializeClass);
                 }
                 GenericArrayType(const GenericArrayType& obj) : java::lang::reflect::Type(obj) {}
 
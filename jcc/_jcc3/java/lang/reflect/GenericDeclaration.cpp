@@ -75,7 +75,7 @@ namespace java {
             {
                 if (!(arg = castCheck(arg, GenericDeclaration::initializeClass, 1)))
                     return NULL;
-                return t_GenericDeclaration::wrap_Object(GenericDeclaration(((t_GenericDeclaration *) arg)->object.this$));
+                return t_GenericDeclaration::wrap_Object(GenericDeclaration(env->newLocalRef(((t_GenericDeclaration *) arg)->object.this$)));
             }
             static PyObject *t_GenericDeclaration_instance_(PyTypeObject *type, PyObject *arg)
             {
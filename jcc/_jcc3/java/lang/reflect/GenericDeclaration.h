@@ -32,7 +32,7 @@ namespace java {
 
                 explicit GenericDeclaration(jobject obj) : java::lang::Object(obj) {
                     if (obj != NULL)
-                        initializeClass(false);
+                        env->getClass(initializeClass);
                 }
                 GenericDeclaration(const GenericDeclaration& obj) : java::lang::Object(obj) {}
 
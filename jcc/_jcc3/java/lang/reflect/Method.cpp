@@ -239,7 +239,7 @@ namespace java {
             {
                 if (!(arg = castCheck(arg, Method::initializeClass, 1)))
                     return NULL;
-                return t_Method::wrap_Object(Method(((t_Method *) arg)->object.this$));
+                return t_Method::wrap_Object(Method(env->newLocalRef(((t_Method *) arg)->object.this$)));
             }
 
             static PyObject *t_Method_instance_(PyTypeObject *type, PyObject *arg)
@@ -36,7 +36,7 @@ namespace java {
                 static jclass initializeClass(bool);
 
                 explicit Method(jobject obj) : Object(obj) {
-                    initializeClass(false);
+                    env->getClass(initializeClass);
                 }
                 Method(const Method& obj) : Object(obj) {}
 
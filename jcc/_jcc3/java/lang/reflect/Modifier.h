@@ -29,7 +29,7 @@ namespace java {
                 explicit Modifier();
             public:
                 explicit Modifier(jobject obj) : Object(obj) {
-                    initializeClass(false);
+                    env->getClass(initializeClass);
                 }
                 static Class *class$;
                 static jmethodID *_mids;
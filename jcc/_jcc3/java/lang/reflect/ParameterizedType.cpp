@@ -90,7 +90,7 @@ namespace java {
             {
                 if (!(arg = castCheck(arg, ParameterizedType::initializeClass, 1)))
                     return NULL;
-                return t_ParameterizedType::wrap_Object(ParameterizedType(((t_ParameterizedType *) arg)->object.this$));
+                return t_ParameterizedType::wrap_Object(ParameterizedType(env->newLocalRef(((t_ParameterizedType *) arg)->object.this$)));
             }
             static PyObject *t_ParameterizedType_instance_(PyTypeObject *type, PyObject *arg)
             {
@@ -31,7 +31,7 @@ namespace java {
 
                 explicit ParameterizedType(jobject obj) : java::lang::reflect::Type(obj) {
                     if (obj != NULL)
-                        initializeClass(false);
+                        env->getClass(initializeClass);
                 }
                 ParameterizedType(const ParameterizedType& obj) : java::lang::reflect::Type(obj) {}
 
@@ -63,7 +63,7 @@ namespace java {
             {
                 if (!(arg = castCheck(arg, Type::initializeClass, 1)))
                     return NULL;
-                return t_Type::wrap_Object(Type(((t_Type *) arg)->object.this$));
+                return t_Type::wrap_Object(Type(env->newLocalRef(((t_Type *) arg)->object.this$)));
             }
             static PyObject *t_Type_instance_(PyTypeObject *type, PyObject *arg)
             {
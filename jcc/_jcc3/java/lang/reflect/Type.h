@@ -25,7 +25,7 @@ namespace java {
 
                 explicit Type(jobject obj) : java::lang::Object(obj) {
                     if (obj != NULL)
-                        initializeClass(false);
+                        env->getClass(initializeClass);
                 }
                 Type(const Type& obj) : java::lang::Object(obj) {}
             };
@@ -91,7 +91,7 @@ namespace java {
             {
                 if (!(arg = castCheck(arg, TypeVariable::initializeClass, 1)))
                     return NULL;
-                return t_TypeVariable::wrap_Object(TypeVariable(((t_TypeVariable *) arg)->object.this$));
+                return t_TypeVariable::wrap_Object(TypeVariable(env->newLocalRef(((t_TypeVariable *) arg)->object.this$)));
             }
             static PyObject *t_TypeVariable_instance_(PyTypeObject *type, PyObject *arg)
             {
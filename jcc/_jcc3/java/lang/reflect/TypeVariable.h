@@ -35,7 +35,7 @@ namespace java {
 
                 explicit TypeVariable(jobject obj) : java::lang::reflect::Type(obj) {
                     if (obj != NULL)
-                        initializeClass(false);
+                        env->getClass(initializeClass);
                 }
                 TypeVariable(const TypeVariable& obj) : java::lang::reflect::Type(obj) {}
 
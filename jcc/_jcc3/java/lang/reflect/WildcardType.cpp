@@ -81,7 +81,7 @@ namespace java {
             {
                 if (!(arg = castCheck(arg, WildcardType::initializeClass, 1)))
                     return NULL;
-                return t_WildcardType::wrap_Object(WildcardType(((t_WildcardType *) arg)->object.this$));
+                return t_WildcardType::wrap_Object(WildcardType(env->newLocalRef(((t_WildcardType *) arg)->object.this$)));
             }
             static PyObject *t_WildcardType_instance_(PyTypeObject *type, PyObject *arg)
             {
@@ -30,7 +30,7 @@ namespace java {
 
                 explicit WildcardType(jobject obj) : java::lang::reflect::Type(obj) {
                     if (obj != NULL)
-                        initializeClass(false);
+                        env->getClass(initializeClass);
                 }
                 WildcardType(const WildcardType& obj) : java::lang::reflect::Type(obj) {}
 
@@ -33,7 +33,7 @@ namespace java {
             static jclass initializeClass(bool);
 
             explicit Enumeration(jobject obj) : JObject(obj) {
-                initializeClass(false);
+                env->getClass(initializeClass);
             }
 
             jboolean hasMoreElements() const;
@@ -33,7 +33,7 @@ namespace java {
             static jclass initializeClass(bool);
 
             explicit Iterator(jobject obj) : JObject(obj) {
-                initializeClass(false);
+                env->getClass(initializeClass);
             }
 
             jboolean hasNext() const;
@@ -323,11 +323,12 @@ class PythonThreadState {
     PyThreadState *state;
     int handler;
   public:
+    /* handlers is shared by all threads, only update it with the GIL */
     PythonThreadState(int handler=0)
     {
-        state = PyEval_SaveThread();
         this->handler = handler;
         env->handlers += handler;
+        state = PyEval_SaveThread();
     }
     ~PythonThreadState()
     {
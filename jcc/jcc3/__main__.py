@@ -58,6 +58,9 @@ if len(sys.argv) == 1 or '--help' in sys.argv:
                               modules, as an alternative to selectively renaming
                               or excluding classes due to name conflicts
     --no-generics           - disable support for Java generics
+    --lazy                  - defer looking up Java classes and reading their
+                              static fields until first accessed from Python
+                              instead of doing it for all classes in initVM()
 
     If you're planning to use pythonic wrappers you should read the relevant
     documentation first:
@@ -389,6 +389,7 @@ def jcc(args):
     imports = {}
     extra_setup_args = []
     initvm_args = {}
+    lazy = False
 
     i = 1
     while i < len(args):
@@ -502,6 +503,8 @@ def jcc(args):
                 arch.append(args[i])
             elif arg == '--no-generics':
                 generics = False
+            elif arg == '--lazy':
+                lazy = True
             elif arg == '--find-jvm-dll':
                 find_jvm_dll = True
             elif arg == '--resources':
@@ -672,7 +675,7 @@ def jcc(args):
                            mappings.get(className), sequences.get(className),
                            renames.get(className),
                            declares, typeset, moduleName, generics,
-                           _dll_export)
+                           _dll_export, lazy)
 
                 line(out_h)
                 line(out_h, 0, '#endif')
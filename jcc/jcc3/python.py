@@ -39,15 +39,15 @@ RESULTS = { 'boolean': 'Py_RETURN_BOOL(%s);',
             'short': 'return PyLong_FromLong((long) %s);',
             'java.lang.String': 'return j2p(%s);' }
 
-CALLARGS = { 'boolean': ('O', '(%s ? Py_True : Py_False)', False),
-             'byte': ('O', 'PyLong_FromLong(%s)', True),
-             'char': ('O', 'c2p(%s);', True),
-             'double': ('d', '(double) %s', False),
-             'float': ('f', '(float) %s', False),
-             'int': ('i', '(int) %s', False),
-             'long': ('L', '(long long) %s', False),
-             'short': ('i', '(int) %s', False),
-             'java.lang.String': ('O', 'env->fromJString((jstring) %s, 0)', True) }
+CALLARGS = { 'boolean': ('PyBool_FromLong((long) %s)', True),
+             'byte': ('PyLong_FromLong((long) %s)', True),
+             'char': ('c2p(%s)', True),
+             'double': ('PyFloat_FromDouble((double) %s)', True),
+             'float': ('PyFloat_FromDouble((double) %s)', True),
+             'int': ('PyLong_FromLong((long) %s)', True),
+             'long': ('PyLong_FromLongLong((PY_LONG_LONG) %s)', True),
+             'short': ('PyLong_FromLong((long) %s)', True),
+             'java.lang.String': ('env->fromJString((jstring) %s, 0)', True) }
 
 BOXED = { 'java.lang.Boolean': (True, True),
           'java.lang.Byte': (True, True),
@@ -68,6 +68,10 @@ def is_boxed(clsName):
 def is_unboxed(clsName):
     return BOXED.get(clsName, (False, False))[1]
 
+# methods taking several arguments are called with METH_FASTCALL when the
+# wrappers are built for a Python that has it as a public calling convention
+FASTCALL = sys.version_info >= (3, 7)
+
 
 def parseArgs(params, current, generics, genericParams=None):
 
@@ -221,14 +225,14 @@ def fieldValue(cls, value, fieldType):
     if fieldType.isArray():
         fieldType = fieldType.getComponentType()
         if fieldType.isArray():
-            result = 'JArray<jobject>(%s->this$).wrap(NULL)'
+            result = 'JArray<jobject>(env->newLocalRef(%s->this$)).wrap(NULL)'
         elif fieldType.isPrimitive():
             result = '%s->wrap()'
         elif fieldType.getName() == 'java.lang.String':
-            result = 'JArray<jstring>(%s->this$).wrap()'
+            result = 'JArray<jstring>(env->newLocalRef(%s->this$)).wrap()'
         else:
             parts = typename(fieldType, cls, False).rpartition('::')
-            result = 'JArray<jobject>(%%s->this$).wrap(%s%st_%s::wrap_jobject)' %(parts)
+            result = 'JArray<jobject>(env->newLocalRef(%%s->this$)).wrap(%s%st_%s::wrap_jobject)' %(parts)
 
     elif fieldType.getName() == 'java.lang.String':
         result = 'j2p(*%s)'
@@ -256,14 +260,14 @@ def returnValue(cls, returnType, value, genericRT=None, typeParams=None):
             returnType = returnType.getComponentType()
             depth += 1
         if depth > 1:
-            return 'return JArray<jobject>(%s.this$).wrap(NULL);' %(value)
+            return 'return JArray<jobject>(env->newLocalRef(%s.this$)).wrap(NULL);' %(value)
         elif returnType.isPrimitive():
             return 'return %s.wrap();' %(value)
         elif returnType.getName() == 'java.lang.String':
-            return 'return JArray<jstring>(%s.this$).wrap();' %(value)
+            return 'return JArray<jstring>(env->newLocalRef(%s.this$)).wrap();' %(value)
 
         ns, sep, n = typename(returnType, cls, False).rpartition('::')
-        return 'return JArray<jobject>(%s.this$).wrap(%s%st_%s::wrap_jobject);' %(value, ns, sep, n)
+        return 'return JArray<jobject>(env->newLocalRef(%s.this$)).wrap(%s%st_%s::wrap_jobject);' %(value, ns, sep, n)
 
     ns, sep, n = typename(returnType, cls, False).rpartition('::')
     if genericRT is not None:
@@ -302,19 +306,19 @@ def returnValue(cls, returnType, value, genericRT=None, typeParams=None):
             if Class.instance_(gd):
                 for clsParam in getTypeParameters(gd):
                     if genericRT == clsParam:
-                        return 'return self->parameters[%d] != NULL ? wrapType(self->parameters[%d], %s.this$) : %s%st_%s::wrap_Object(%s);' %(i, i, value, ns, sep, n, value)
+                        return 'return self->parameters[%d] != NULL ? wrapType(self->parameters[%d], env->newLocalRef(%s.this$)) : %s%st_%s::wrap_Object(%s);' %(i, i, value, ns, sep, n, value)
                     i += 1
             elif Method.instance_(gd):
                 for clsParam in getTypeParameters(gd):
                     if genericRT == clsParam and i in typeParams:
-                        return 'return p%d != NULL && p%d[0] != NULL ? wrapType(p%d[0], %s.this$) : %s%st_%s::wrap_Object(%s);' %(i, i, i, value, ns, sep, n, value)
+                        return 'return p%d != NULL && p%d[0] != NULL ? wrapType(p%d[0], env->newLocalRef(%s.this$)) : %s%st_%s::wrap_Object(%s);' %(i, i, i, value, ns, sep, n, value)
                     i += 1
 
     return 'return %s%st_%s::wrap_Object(%s);' %(ns, sep, n, value)
 
 
 def call(out, indent, cls, inCase, method, names, cardinality, isExtension,
-         generics):
+         generics, overload=None):
 
     if inCase:
         line(out, indent, '{')
@@ -350,11 +354,17 @@ def call(out, indent, cls, inCase, method, names, cardinality, isExtension,
         line(out)
         if isExtension and name == 'clone' and Modifier.isNative(modifiers):
             line(out, indent, 'if (arg)')
+        elif cardinality > 1 and FASTCALL:
+            line(out, indent, 'if (!parseFastArgs(args, nargs, "%s"%s%s))',
+                 *parseArgs(params, cls, generics, genericParams))
         else:
             line(out, indent, 'if (!parseArg%s(arg%s, "%s"%s%s))',
                  s, s, *parseArgs(params, cls, generics, genericParams))
         line(out, indent, '{')
         indent += 1
+        if overload is not None:
+            line(out, indent, 'if (overload < 0)')
+            line(out, indent + 1, 'cache.put(args, nargs, %d);', overload)
 
     name = cppname(name)
     if Modifier.isStatic(modifiers):
@@ -367,7 +377,7 @@ def call(out, indent, cls, inCase, method, names, cardinality, isExtension,
 
     if isExtension and name == 'clone' and Modifier.isNative(modifiers):
         line(out)
-        line(out, indent, '%s object(result.this$);', typename(cls, cls, False))
+        line(out, indent, '%s object(env->newLocalRef(result.this$));', typename(cls, cls, False))
         line(out, indent, 'if (PyObject_TypeCheck(arg, PY_TYPE(FinalizerProxy)) &&')
         line(out, indent, '    PyObject_TypeCheck(((t_fp *) arg)->object, Py_TYPE(self)))')
         line(out, indent, '{')
@@ -402,9 +412,45 @@ def methodargs(methods, superMethods):
         elif count == 1:
             return ', PyObject *arg', ', arg', 1
 
+    if FASTCALL:
+        return ', PyObject *const *args, Py_ssize_t nargs', ', args, nargs', 2
+
     return ', PyObject *args', ', args', 2
 
 
+def cachedOverloads(methods, cls, generics):
+
+    # with a cache, an overload found for arguments of the same types is
+    # called directly: for them, parseArgs() matches by type only, except
+    # for boxed parameters that also check values, stop at the first one
+    cached = set()
+    if not FASTCALL:
+        return cached
+
+    arities = {}
+    for method in methods:
+        params = method.getParameterTypes()
+        arities[len(params)] = arities.get(len(params), 0) + 1
+
+    stopped = set()
+    for i, method in enumerate(methods):
+        params = method.getParameterTypes()
+        count = len(params)
+        if count == 0 or arities[count] < 2 or count in stopped:
+            continue
+        if generics:
+            sig = parseArgs(params, cls, generics,
+                            method.getGenericParameterTypes())[0]
+        else:
+            sig = parseArgs(params, cls, generics)[0]
+        if 'O' in sig:
+            stopped.add(count)
+        else:
+            cached.add(i)
+
+    return cached
+
+
 def jniname(cls):
 
     if cls.isPrimitive():
@@ -469,14 +515,13 @@ def extension(env, out, indent, cls, names, name, count, method, generics):
              typename(returnType, cls, False),
              not returnType.isPrimitive() and '((jobject) NULL)' or '')
 
-    sigs = []
     decrefs = []
-    args = []
+    args = ['obj']
     i = 0
     for param in method.getParameterTypes():
         typeName = param.getName()
         if typeName in CALLARGS:
-            sig, code, decref = CALLARGS[typeName]
+            code, decref = CALLARGS[typeName]
         elif param.isArray():
             param = param.getComponentType()
             if param.isPrimitive():
@@ -488,30 +533,23 @@ def extension(env, out, indent, cls, names, name, count, method, generics):
             else:
                 parts = typename(param, cls, False).rpartition('::')
                 code = 'JArray<jobject>(%%s).wrap(%s%st_%s::wrap_jobject)' %(parts)
-            sig, decref = 'O', True
-        elif param.getName() == 'java.lang.String':
-            sig, code, decref = 'O', 'j2p(%%s))', True
+            decref = True
         else:
             parts = typename(param, cls, False).rpartition('::')
-            sig, code, decref = 'O', '%s%st_%s::wrap_Object(%s%s%s(%%s))' %(parts*2), True
-        if sig == 'O':
-            line(out, indent, 'PyObject *o%d = %s;', i, code %('a%d' %(i)))
-            args.append('o%d' %(i))
-        else:
-            args.append(code %('a%d' %(i)))
-        sigs.append(sig)
+            code, decref = '%s%st_%s::wrap_Object(%s%s%s(%%s))' %(parts*2), True
+        line(out, indent, 'PyObject *o%d = %s;', i, code %('a%d' %(i)))
+        args.append('o%d' %(i))
         decrefs.append(decref)
         i += 1
 
-    args = ', '.join(args)
-    if args:
-        args = ', ' + args
-    line(out, indent, 'PyObject *result = PyObject_CallMethod(obj, "%s", "%s"%s);',
-         name, ''.join(sigs), args)
+    # the method is looked up once per Python type, not once per call
+    line(out, indent, 'static PythonMethod method("%s");', name)
+    line(out, indent, 'PyObject *args[] = { %s };', ', '.join(args))
+    line(out, indent, 'PyObject *result = method.call(args, %d);', len(args))
     i = 0
     for decref in decrefs:
         if decref:
-            line(out, indent, 'Py_DECREF(o%d);', i)
+            line(out, indent, 'Py_XDECREF(o%d);', i)
         i += 1
     line(out, indent, 'if (!result)')
     line(out, indent + 1, 'throwPythonError();')
@@ -547,7 +585,18 @@ def python(env, out_h, out, cls, superClasses, names, superNames,
            constructors, methods, protectedMethods,
            methodNames, fields, instanceFields,
            mapping, sequence, rename, declares, typeset, moduleName, generics,
-           _dll_export):
+           _dll_export, lazy=False):
+
+    for method in methods:
+        if method.getName() == 'pythonExtension':
+            isExtension = True
+            break
+    else:
+        isExtension = False
+
+    # in lazy mode, static fields are resolved on first access instead of
+    # when initVM() runs, extensions need their natives registered eagerly
+    isLazy = lazy and fields and not isExtension
 
     line(out_h)
     line(out_h, 0, '#include <Python.h>')
@@ -590,6 +639,8 @@ def python(env, out_h, out, cls, superClasses, names, superNames,
         line(out_h, indent + 1, 'static PyObject *wrap_jobject(const jobject&, %s);', _clsParams)
     line(out_h, indent + 1, 'static void install(PyObject *module);')
     line(out_h, indent + 1, 'static void initialize(PyObject *module);')
+    if isLazy:
+        line(out_h, indent + 1, 'static void resolve();')
     line(out_h, indent, '};')
 
     if env.java_version >= '1.5':
@@ -615,13 +666,6 @@ def python(env, out_h, out, cls, superClasses, names, superNames,
                 line(out, 0, '#include "%s.h"',
                      inner.getName().replace('.', '/'))
 
-    for method in methods:
-        if method.getName() == 'pythonExtension':
-            isExtension = True
-            break
-    else:
-        isExtension = False
-
     line(out)
     indent = 0
     for name in names[:-1]:
@@ -890,11 +934,11 @@ def python(env, out_h, out, cls, superClasses, names, superNames,
             elif count == 1:
                 args = 'METH_O'
             else:
-                args = 'METH_VARARGS'
+                args = FASTCALL and 'METH_FASTCALL' or 'METH_VARARGS'
         elif isExtension and name == 'clone' and Modifier.isNative(modifiers):
             args = 'METH_O'
         else:
-            args = 'METH_VARARGS'
+            args = FASTCALL and 'METH_FASTCALL' or 'METH_VARARGS'
         if Modifier.isStatic(modifiers):
             args += ' | METH_CLASS'
 
@@ -1077,7 +1121,7 @@ def python(env, out_h, out, cls, superClasses, names, superNames,
     if isExtension:
         line(out, indent + 1, 'jclass cls = env->getClass(%s::initializeClass);',
              cppname(names[-1]))
-    elif fields:
+    elif fields and not isLazy:
         line(out, indent + 1, 'env->getClass(%s::initializeClass);', cppname(names[-1]))
 
     if isExtension:
@@ -1092,25 +1136,39 @@ def python(env, out_h, out, cls, superClasses, names, superNames,
         line(out, indent + 1, 'env->registerNatives(cls, methods, %d);',
              count)
 
-    for field in fields:
-        fieldType = field.getType()
-        fieldName = field.getName()
-        cppFieldName = cppname(fieldName)
-        if cppFieldName in methodNames:
-            fieldName += RENAME_FIELD_SUFFIX
-            cppFieldName += RENAME_FIELD_SUFFIX
-        value = '%s::%s' %(cppname(names[-1]), cppFieldName)
-        value = fieldValue(cls, value, fieldType)
-        line(out, indent + 1, 'PyObject_SetAttrString((PyObject *) PY_TYPE(%s), "%s", make_descriptor(%s));',
-             names[-1], fieldName, value)
+    def fieldDescriptors(resolved):
+        for field in fields:
+            fieldType = field.getType()
+            fieldName = field.getName()
+            cppFieldName = cppname(fieldName)
+            if cppFieldName in methodNames:
+                fieldName += RENAME_FIELD_SUFFIX
+                cppFieldName += RENAME_FIELD_SUFFIX
+            if resolved:
+                value = '%s::%s' %(cppname(names[-1]), cppFieldName)
+                value = fieldValue(cls, value, fieldType)
+            else:
+                value = 't_%s::resolve, "%s"' %(names[-1], fieldName)
+            line(out, indent + 1, 'PyObject_SetAttrString((PyObject *) PY_TYPE(%s), "%s", make_descriptor(%s));',
+                 names[-1], fieldName, value)
+
+    fieldDescriptors(not isLazy)
     line(out, indent, '}')
 
+    if isLazy:
+        line(out)
+        line(out, indent, 'void t_%s::resolve()', names[-1])
+        line(out, indent, '{')
+        line(out, indent + 1, 'env->getClass(%s::initializeClass);', cppname(names[-1]))
+        fieldDescriptors(True)
+        line(out, indent, '}')
+
     line(out)
     line(out, indent, 'static PyObject *t_%s_cast_(PyTypeObject *type, PyObject *arg)', names[-1])
     line(out, indent, '{')
     line(out, indent + 1, 'if (!(arg = castCheck(arg, %s::initializeClass, 1)))', cppname(names[-1]))
     line(out, indent + 2, 'return NULL;')
-    line(out, indent + 1, 'return t_%s::wrap_Object(%s(((t_%s *) arg)->object.this$));', names[-1], cppname(names[-1]), names[-1])
+    line(out, indent + 1, 'return t_%s::wrap_Object(%s(env->newLocalRef(((t_%s *) arg)->object.this$)));', names[-1], cppname(names[-1]), names[-1])
     line(out, indent, '}')
 
     line(out, indent, 'static PyObject *t_%s_instance_(PyTypeObject *type, PyObject *arg)', names[-1])
@@ -1196,18 +1254,45 @@ def python(env, out_h, out, cls, superClasses, names, superNames,
 
         line(out, indent, '{')
         if len(methods) > 1:
+            cached = cachedOverloads(methods, cls, generics)
+            if cached:
+                line(out, indent + 1, 'static OverloadCache cache;')
+                line(out, indent + 1, 'int overload = cache.get(args, nargs);')
+                line(out)
+                line(out, indent, '%sdispatch:', HALF_INDENT)
+                line(out, indent + 1, 'switch (overload) {')
+                for i in sorted(cached):
+                    line(out, indent + 1, '%scase %d:', HALF_INDENT, i)
+                    line(out, indent + 2, 'goto overload%d;', i)
+                line(out, indent + 1, '}')
+                line(out)
             currLen = -1
-            line(out, indent + 1, 'switch (PyTuple_GET_SIZE(args)) {')
-            for method in methods:
+            if FASTCALL:
+                line(out, indent + 1, 'switch (nargs) {')
+            else:
+                line(out, indent + 1, 'switch (PyTuple_GET_SIZE(args)) {')
+            for i, method in enumerate(methods):
                 params = method.getParameterTypes()
                 if len(params) != currLen:
                     if currLen >= 0:
                         line(out, indent + 2, 'break;')
                     currLen = len(params)
                     line(out, indent + 1, '%scase %d:', HALF_INDENT, currLen)
+                if i in cached:
+                    overload = i
+                    line(out, indent + 1, '%soverload%d:', HALF_INDENT, i)
+                else:
+                    overload = None
                 call(out, indent + 2, cls, True, method, names, cardinality,
-                     isExtension, generics)
+                     isExtension, generics, overload)
             line(out, indent + 1, '}')
+            if cached:
+                line(out)
+                line(out, indent + 1, 'if (overload >= 0)')
+                line(out, indent + 1, '{')
+                line(out, indent + 2, 'overload = -1;')
+                line(out, indent + 2, 'goto dispatch;')
+                line(out, indent + 1, '}')
         else:
             call(out, indent + 1, cls, False, methods[0], names, cardinality,
                  isExtension, generics)
@@ -1700,6 +1785,21 @@ def compile(env, jccPath, output, moduleName, install, dist, debug, jars,
     line(out)
     line(out, 0, '%s._set_exception_types(JavaError, InvalidArgsError)',
          extname)
+    line(out)
+    line(out, 0, 'class localFrame(object):')
+    line(out, 1, '"""Java objects wrapped inside hold local references until exited,')
+    line(out, 1, '   capacity, the number of them to reserve room for, only applies')
+    line(out, 1, '   to the outermost frame, nested frames share it"""')
+    line(out, 1, 'def __init__(self, capacity=None):')
+    line(out, 2, 'self.capacity = capacity')
+    line(out, 1, 'def __enter__(self):')
+    line(out, 2, 'if self.capacity is None:')
+    line(out, 3, 'self.depth = %s._push_local_frame()', extname)
+    line(out, 2, 'else:')
+    line(out, 3, 'self.depth = %s._push_local_frame(self.capacity)', extname)
+    line(out, 2, 'return self')
+    line(out, 1, 'def __exit__(self, *args):')
+    line(out, 2, '%s._pop_local_frame(self.depth)', extname)
 
     if version:
         line(out)
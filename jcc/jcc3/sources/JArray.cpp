@@ -27,25 +27,180 @@ using namespace java::lang;
 
 template<typename T> class _t_JArray : public t_JArray<T> {
 public:
+    typedef T element_type;
+    void *elements;     /* shared by the buffer views, while any */
+    Py_ssize_t views;
     static PyObject *format;
 };
 
+
+/* PEP 3118 buffer protocol, for arrays of primitive types only.
+ * The elements are obtained with Get<Type>ArrayElements() when the first
+ * buffer is requested, either pinned or copied by the JVM, and released,
+ * with changes written back, when the last view on it is released. While
+ * viewed, elements are read from there instead of one JNI call each.
+ */
+
+template<typename T> class buffer_traits {
+public:
+    static const char *format;
+    static void *get(JNIEnv *vm_env, jarray array) { return NULL; }
+    static void release(JNIEnv *vm_env, jarray array, void *buf,
+                        jint mode) {}
+    static void refresh(JNIEnv *vm_env, jarray array, void *buf,
+                        Py_ssize_t n) {}
+    static PyObject *item(void *buf, Py_ssize_t n) { return NULL; }
+};
+
+template<typename T> const char *buffer_traits<T>::format = NULL;
+
+#define DEFINE_BUFFER_TRAITS(T, Type, fmt, wrapfn)                      \
+    template<> class buffer_traits<T> {                                 \
+    public:                                                             \
+        static const char *format;                                      \
+        static void *get(JNIEnv *vm_env, jarray array)                  \
+        {                                                               \
+            return vm_env->Get##Type##ArrayElements((T##Array) array,   \
+                                                    NULL);              \
+        }                                                               \
+        static void release(JNIEnv *vm_env, jarray array, void *buf,    \
+                            jint mode)                                  \
+        {                                                               \
+            vm_env->Release##Type##ArrayElements((T##Array) array,      \
+                                                 (T *) buf, mode);      \
+        }                                                               \
+        static void refresh(JNIEnv *vm_env, jarray array, void *buf,    \
+                            Py_ssize_t n)                               \
+        {                                                               \
+            vm_env->Get##Type##ArrayRegion((T##Array) array, n, 1,      \
+                                           (T *) buf + n);              \
+        }                                                               \
+        static PyObject *item(void *buf, Py_ssize_t n)                  \
+        {                                                               \
+            return wrapfn(((T *) buf)[n]);                              \
+        }                                                               \
+    };                                                                  \
+    const char *buffer_traits<T>::format = fmt;
+
+DEFINE_BUFFER_TRAITS(jboolean, Boolean, "?", PyBool_FromLong)
+DEFINE_BUFFER_TRAITS(jbyte, Byte, "b", PyLong_FromLong)
+DEFINE_BUFFER_TRAITS(jchar, Char, "H", c2p)
+DEFINE_BUFFER_TRAITS(jdouble, Double, "d", PyFloat_FromDouble)
+DEFINE_BUFFER_TRAITS(jfloat, Float, "f", PyFloat_FromDouble)
+DEFINE_BUFFER_TRAITS(jint, Int, "i", PyLong_FromLong)
+DEFINE_BUFFER_TRAITS(jlong, Long, "q", PyLong_FromLongLong)
+DEFINE_BUFFER_TRAITS(jshort, Short, "h", PyLong_FromLong)
+
+
+/* the elements lo to hi of a buffer, as a list */
+template<typename T>
+static PyObject *listOf(void *buf, Py_ssize_t lo, Py_ssize_t hi)
+{
+    PyObject *list = PyList_New(hi - lo);
+
+    for (Py_ssize_t i = lo; list != NULL && i < hi; i++) {
+        PyObject *value = buffer_traits<T>::item(buf, i);
+
+        if (value == NULL)
+        {
+            Py_DECREF(list);
+            return NULL;
+        }
+        PyList_SET_ITEM(list, i - lo, value);
+    }
+
+    return list;
+}
+
+/* the elements lo to hi of a buffer, as the same type of sequence
+ * JArray<T>::toSequence() returns: a str for char[], a tuple for byte[]
+ */
+template<typename T>
+static PyObject *sequenceOf(void *buf, Py_ssize_t lo, Py_ssize_t hi)
+{
+    return listOf<T>(buf, lo, hi);
+}
+
+template<> PyObject *sequenceOf<jbyte>(void *buf, Py_ssize_t lo, Py_ssize_t hi)
+{
+    PyObject *tuple = PyTuple_New(hi - lo);
+
+    for (Py_ssize_t i = lo; tuple != NULL && i < hi; i++)
+        PyTuple_SET_ITEM(tuple, i - lo, PyLong_FromLong(((jbyte *) buf)[i]));
+
+    return tuple;
+}
+
+template<> PyObject *sequenceOf<jchar>(void *buf, Py_ssize_t lo, Py_ssize_t hi)
+{
+    jchar *chars = (jchar *) buf;
+
+    if (sizeof(Py_UNICODE) == sizeof(jchar))
+        return PyUnicode_FromUnicode((const Py_UNICODE *) chars + lo, hi - lo);
+    else
+    {
+        PyObject *string = PyUnicode_FromUnicode(NULL, hi - lo);
+
+        if (string != NULL)
+        {
+            Py_UNICODE *pchars = PyUnicode_AS_UNICODE(string);
+
+            for (Py_ssize_t i = lo; i < hi; i++)
+                pchars[i - lo] = (Py_UNICODE) chars[i];
+        }
+
+        return string;
+    }
+}
+
+
 template<typename U>
 static PyObject *get(U *self, Py_ssize_t n)
 {
+    if (self->elements != NULL)
+    {
+        if (n < 0)
+            n = self->array.length + n;
+
+        if (n >= 0 && n < self->array.length)
+            return buffer_traits<typename U::element_type>::item(
+                self->elements, n);
+
+        PyErr_SetString(PyExc_IndexError, "index out of range");
+        return NULL;
+    }
+
     return self->array.get(n);
 }
 
 template<typename U>
-static PyObject *toSequence(U *self)
+static PyObject *toSequence(U *self, Py_ssize_t lo, Py_ssize_t hi)
 {
-    return self->array.toSequence();
+    if (self->elements != NULL)
+    {
+        Py_ssize_t length = self->array.length;
+
+        if (lo < 0) lo = length + lo;
+        if (lo < 0) lo = 0;
+        else if (lo > length) lo = length;
+        if (hi < 0) hi = length + hi;
+        if (hi < 0) hi = 0;
+        else if (hi > length) hi = length;
+        if (lo > hi) lo = hi;
+
+        return sequenceOf<typename U::element_type>(self->elements, lo, hi);
+    }
+
+    return self->array.toSequence(lo, hi);
 }
 
 template<typename U>
-static PyObject *toSequence(U *self, Py_ssize_t lo, Py_ssize_t hi)
+static PyObject *toSequence(U *self)
 {
-    return self->array.toSequence(lo, hi);
+    if (self->elements != NULL)
+        return toSequence<U>(self, 0, self->array.length);
+
+    return self->array.toSequence();
 }
 
 template<typename U> class _t_iterator {
@@ -80,6 +235,12 @@ static int init(U *self, PyObject *args, PyObject *kwds)
     if (!PyArg_ParseTuple(args, "O", &obj))
         return -1;
 
+    if (self->views > 0)
+    {
+        PyErr_SetString(PyExc_BufferError, "array is being viewed");
+        return -1;
+    }
+
     if (PySequence_Check(obj))
     {
         self->array = JArray<T>(obj);
@@ -339,7 +500,20 @@ static PyObject *seq_repeat(U *self, Py_ssize_t n)
 template<typename U>
 static int seq_set(U *self, Py_ssize_t n, PyObject *value)
 {
-    return self->array.set(n, value);
+    int result = self->array.set(n, value);
+
+    if (result == 0 && self->elements != NULL)
+    {
+        /* keep the viewed elements, written back later, current */
+        if (n < 0)
+            n = self->array.length + n;
+
+        buffer_traits<typename U::element_type>::refresh(
+            env->get_vm_env(), (jarray) self->array.this$,
+            self->elements, n);
+    }
+
+    return result;
 }
 
 template<typename U>
@@ -387,7 +561,7 @@ static int seq_setslice(U *self, Py_ssize_t lo, Py_ssize_t hi, PyObject *values)
         if (value == NULL)
             goto error;
 
-        if (self->array.set(i, value) < 0)
+        if (seq_set<U>(self, i, value) < 0)
             goto error;
     }
 
@@ -486,6 +660,110 @@ static PyGetSetDef t_JArray_jbyte__fields[] = {
 };
 
 
+template<typename T, typename U>
+static int getbuffer(U *self, Py_buffer *view, int flags)
+{
+    if (self->array.this$ == NULL)
+    {
+        PyErr_SetString(PyExc_BufferError, "array is null");
+        view->obj = NULL;
+        return -1;
+    }
+
+    if (self->elements == NULL)
+    {
+        JNIEnv *vm_env = env->get_vm_env();
+        void *buf = buffer_traits<T>::get(vm_env, (jarray) self->array.this$);
+
+        if (buf == NULL)
+        {
+            PyErr_NoMemory();
+            view->obj = NULL;
+            return -1;
+        }
+        self->elements = buf;
+    }
+    self->views += 1;
+
+    view->obj = (PyObject *) self;
+    Py_INCREF(self);
+
+    view->buf = self->elements;
+    view->len = self->array.length * sizeof(T);
+    view->readonly = 0;
+    view->itemsize = sizeof(T);
+    view->format = (flags & PyBUF_FORMAT)
+        ? (char *) buffer_traits<T>::format : NULL;
+    view->ndim = 1;
+    view->shape = (flags & PyBUF_ND) ? &self->array.length : NULL;
+    view->strides = (flags & PyBUF_STRIDES) == PyBUF_STRIDES
+        ? &view->itemsize : NULL;
+    view->suboffsets = NULL;
+    view->internal = NULL;
+
+    return 0;
+}
+
+template<typename T, typename U>
+static void releasebuffer(U *self, Py_buffer *view)
+{
+    JNIEnv *vm_env = env->get_vm_env();
+
+    if (!vm_env)
+    {
+        /* the last view may be released by a thread that was never
+         * attached to the JVM, the garbage collector for example.
+         */
+        env->attachCurrentThread(NULL, 0);
+        vm_env = env->get_vm_env();
+    }
+
+    if (--self->views == 0)
+    {
+        buffer_traits<T>::release(vm_env, (jarray) self->array.this$,
+                                  self->elements, 0);
+        self->elements = NULL;
+    }
+}
+
+template<typename U>
+static PyObject *view(U *self)
+{
+    return PyMemoryView_FromObject((PyObject *) self);
+}
+
+template<typename U>
+static PyObject *tolist(U *self)
+{
+    typedef buffer_traits<typename U::element_type> traits;
+
+    if (self->array.this$ == NULL)
+        return PyList_New(0);
+
+    /* arrays of objects are already converted to a list */
+    if (traits::format == NULL)
+        return toSequence<U>(self);
+
+    Py_ssize_t length = self->array.length;
+
+    if (self->elements != NULL)
+        return listOf<typename U::element_type>(self->elements, 0, length);
+
+    JNIEnv *vm_env = env->get_vm_env();
+    jarray array = (jarray) self->array.this$;
+    void *buf = traits::get(vm_env, array);
+
+    if (buf == NULL)
+        return PyErr_NoMemory();
+
+    PyObject *list = listOf<typename U::element_type>(buf, 0, length);
+
+    traits::release(vm_env, array, buf, JNI_ABORT);
+
+    return list;
+}
+
+
 template<typename T>
 static jclass initializeClass(bool getOnly)
 {
@@ -526,7 +804,7 @@ static PyObject *cast_(PyTypeObject *type, PyObject *args, PyObject *kwds)
         return NULL;
     }
 
-    return JArray<T>(((t_JObject *) arg)->object.this$).wrap();
+    return JArray<T>(env->newLocalRef(((t_JObject *) arg)->object.this$)).wrap();
 }
 
 template<typename T>
@@ -615,8 +893,11 @@ public:
               (PyCFunction) instance_<T>, METH_VARARGS | METH_CLASS, "" },
             { "assignable_",
               (PyCFunction) assignable_<T>, METH_VARARGS | METH_CLASS, "" },
+            { "tolist", (PyCFunction) tolist<U>, METH_NOARGS, "" },
+            { "view", (PyCFunction) view<U>, METH_NOARGS, "" },
             { NULL, NULL, 0, NULL }
         };
+        int methodCount = sizeof(methods) / sizeof(PyMethodDef);
 
         PyType_Slot slots[] = {
             { Py_tp_dealloc, (void *) dealloc<T,U> },
@@ -637,13 +918,28 @@ public:
             { Py_tp_methods, methods },
             { Py_tp_init, (void *) init<T,U> },
             { Py_tp_new, (void *) _new },
+            { 0, NULL },  // to patch in buffer protocol
+            { 0, NULL },  // to patch in buffer protocol
             { 0, NULL },  // to patch in byte[].string_ and bytes_
             { 0, NULL }
         };
+        int count = sizeof(slots) / sizeof(PyType_Slot);
+
+        if (buffer_traits<T>::format == NULL)  // no view() without buffer
+            methods[methodCount - 2] = methods[methodCount - 1];
+        else
+        {
+            slots[count - 4] = {
+                Py_bf_getbuffer, (void *) getbuffer<T,U>
+            };
+            slots[count - 3] = {
+                Py_bf_releasebuffer, (void *) releasebuffer<T,U>
+            };
+        }
 
         if (!strcmp(type_name, "byte"))
         {
-            slots[(sizeof(slots) / sizeof(PyType_Slot)) - 2] = {
+            slots[count - 2] = {
                 Py_tp_getset, (void *) t_JArray_jbyte__fields
             };
         }
@@ -869,7 +1165,7 @@ template<> PyObject *cast_<jobject>(PyTypeObject *type,
         return NULL;
     }
 
-    return JArray<jobject>(((t_JObject *) arg)->object.this$).wrap(wrapfn);
+    return JArray<jobject>(env->newLocalRef(((t_JObject *) arg)->object.this$)).wrap(wrapfn);
 }
 
 template<> PyObject *wrapfn_<jobject>(const jobject &object) {
@@ -1016,6 +1312,8 @@ PyObject *JArray<jobject>::wrap(PyObject *(*wrapfn)(const jobject&)) const
 
         memset((void *) &(obj->array), 0, sizeof(JArray<jobject>));
         obj->array = *this;
+        obj->elements = NULL;
+        obj->views = 0;
         obj->wrapfn = wrapfn;
 
         return (PyObject *) obj;
@@ -1033,6 +1331,8 @@ PyObject *JArray<jstring>::wrap() const
 
         memset((void *) &(obj->array), 0, sizeof(JArray<jstring>));
         obj->array = *this;
+        obj->elements = NULL;
+        obj->views = 0;
 
         return (PyObject *) obj;
     }
@@ -1049,6 +1349,8 @@ PyObject *JArray<jboolean>::wrap() const
 
         memset((void *) &(obj->array), 0, sizeof(JArray<jboolean>));
         obj->array = *this;
+        obj->elements = NULL;
+        obj->views = 0;
 
         return (PyObject *) obj;
     }
@@ -1065,6 +1367,8 @@ PyObject *JArray<jbyte>::wrap() const
 
         memset((void *) &(obj->array), 0, sizeof(JArray<jbyte>));
         obj->array = *this;
+        obj->elements = NULL;
+        obj->views = 0;
 
         return (PyObject *) obj;
     }
@@ -1081,6 +1385,8 @@ PyObject *JArray<jchar>::wrap() const
 
         memset((void *) &(obj->array), 0, sizeof(JArray<jchar>));
         obj->array = *this;
+        obj->elements = NULL;
+        obj->views = 0;
 
         return (PyObject *) obj;
     }
@@ -1097,6 +1403,8 @@ PyObject *JArray<jdouble>::wrap() const
 
         memset((void *) &(obj->array), 0, sizeof(JArray<jdouble>));
         obj->array = *this;
+        obj->elements = NULL;
+        obj->views = 0;
 
         return (PyObject *) obj;
     }
@@ -1113,6 +1421,8 @@ PyObject *JArray<jfloat>::wrap() const
 
         memset((void *) &(obj->array), 0, sizeof(JArray<jfloat>));
         obj->array = *this;
+        obj->elements = NULL;
+        obj->views = 0;
 
         return (PyObject *) obj;
     }
@@ -1129,6 +1439,8 @@ PyObject *JArray<jint>::wrap() const
 
         memset((void *) &(obj->array), 0, sizeof(JArray<jint>));
         obj->array = *this;
+        obj->elements = NULL;
+        obj->views = 0;
 
         return (PyObject *) obj;
     }
@@ -1145,6 +1457,8 @@ PyObject *JArray<jlong>::wrap() const
 
         memset((void *) &(obj->array), 0, sizeof(JArray<jlong>));
         obj->array = *this;
+        obj->elements = NULL;
+        obj->views = 0;
 
         return (PyObject *) obj;
     }
@@ -1161,6 +1475,8 @@ PyObject *JArray<jshort>::wrap() const
 
         memset((void *) &(obj->array), 0, sizeof(JArray<jshort>));
         obj->array = *this;
+        obj->elements = NULL;
+        obj->views = 0;
 
         return (PyObject *) obj;
     }
@@ -21,6 +21,12 @@
 
 extern jobjectArray fromPySequence(jclass cls, PyObject *sequence);
 extern jobjectArray fromPySequence(jclass cls, PyObject **args, int length);
+extern PyObject *fromJObjectArray(jobjectArray array,
+                                  Py_ssize_t lo, Py_ssize_t hi,
+                                  PyObject *(*wrapfn)(const jobject&));
+extern PyObject *fromJStringArray(jobjectArray array,
+                                  Py_ssize_t lo, Py_ssize_t hi);
+extern jobjectArray toJStringArray(jclass cls, PyObject *sequence);
 extern PyObject *PyErr_SetJavaError();
 
 extern PyTypeObject *PY_TYPE(JArrayObject);
@@ -146,19 +152,10 @@ template<> class JArray<jobject> : public java::lang::Object {
         else if (hi > length) hi = length;
         if (lo > hi) lo = hi;
 
-        PyObject *list = PyList_New(hi - lo);
-
         if (!wrapfn)
             wrapfn = java::lang::t_Object::wrap_jobject;
 
-        for (Py_ssize_t i = lo; i < hi; i++) {
-            jobject jobj = env->getObjectArrayElement((jobjectArray) this$, i);
-            PyObject *obj = (*wrapfn)(jobj);
-
-            PyList_SET_ITEM(list, i - lo, obj);
-        }
-
-        return list;
+        return fromJObjectArray((jobjectArray) this$, lo, hi, wrapfn);
     }
 
     PyObject *get(Py_ssize_t n, PyObject *(*wrapfn)(const jobject&))
@@ -250,24 +247,8 @@ template<> class JArray<jstring> : public java::lang::Object {
     }
 
 #ifdef PYTHON
-    JArray<jstring>(PyObject *sequence) : java::lang::Object(env->get_vm_env()->NewObjectArray(PySequence_Length(sequence), env->findClass("java/lang/String"), NULL)) {
-        length = env->getArrayLength((jobjectArray) this$);
-
-        for (Py_ssize_t i = 0; i < length; i++) {
-            PyObject *obj = PySequence_GetItem(sequence, i);
-
-            if (obj == NULL)
-                break;
-
-            jstring str = env->fromPyString(obj);
-
-            Py_DECREF(obj);
-            if (PyErr_Occurred())
-                break;
-
-            env->setObjectArrayElement((jobjectArray) this$, i, str);
-            env->get_vm_env()->DeleteLocalRef(str);
-        }
+    JArray<jstring>(PyObject *sequence) : java::lang::Object(toJStringArray(env->findClass("java/lang/String"), sequence)) {
+        length = this$ ? env->getArrayLength((jobjectArray) this$) : 0;
     }
 
     PyObject *toSequence()
@@ -288,17 +269,7 @@ template<> class JArray<jstring> : public java::lang::Object {
         else if (hi > length) hi = length;
         if (lo > hi) lo = hi;
 
-        PyObject *list = PyList_New(hi - lo);
-
-        for (Py_ssize_t i = lo; i < hi; i++) {
-            jstring str = (jstring)
-                env->getObjectArrayElement((jobjectArray) this$, i);
-            PyObject *obj = env->fromJString(str, 1);
-
-            PyList_SET_ITEM(list, i - lo, obj);
-        }
-
-        return list;
+        return fromJStringArray((jobjectArray) this$, lo, hi);
     }
 
     PyObject *get(Py_ssize_t n)
@@ -19,13 +19,17 @@
 #include <jni.h>
 
 #include <vector>
+#include <time.h>
 
 #include "JCCEnv.h"
+#include "JObject.h"
 
 #if defined(_MSC_VER) || defined(__WIN32)
 _DLL_EXPORT DWORD VM_ENV = 0;
+_DLL_EXPORT DWORD LOCAL_FRAME = 0;
 #else
 pthread_key_t JCCEnv::VM_ENV = (pthread_key_t) NULL;
+pthread_key_t JCCEnv::LOCAL_FRAME = (pthread_key_t) NULL;
 #endif
 
 #if defined(_MSC_VER) || defined(__WIN32)
@@ -42,6 +46,27 @@ public:
     }
 };
 
+class frameLock {
+    localFrame *frame;
+public:
+    frameLock(localFrame *frame) : frame(frame) {
+        EnterCriticalSection(&frame->mutex);
+    }
+    virtual ~frameLock() {
+        LeaveCriticalSection(&frame->mutex);
+    }
+};
+
+localFrame::localFrame() : depth(0), suspended(0), next(NULL)
+{
+    InitializeCriticalSection(&mutex);
+}
+
+localFrame::~localFrame()
+{
+    DeleteCriticalSection(&mutex);
+}
+
 #else
 
 static pthread_mutex_t *mutex = NULL;
@@ -56,6 +81,100 @@ public:
     }
 };
 
+class frameLock {
+    localFrame *frame;
+public:
+    frameLock(localFrame *frame) : frame(frame) {
+        pthread_mutex_lock(&frame->mutex);
+    }
+    virtual ~frameLock() {
+        pthread_mutex_unlock(&frame->mutex);
+    }
+};
+
+localFrame::localFrame() : depth(0), suspended(0), next(NULL)
+{
+    pthread_mutex_init(&mutex, NULL);
+}
+
+localFrame::~localFrame()
+{
+    pthread_mutex_destroy(&mutex);
+}
+
+#endif
+
+#ifdef JCC_SINGLE_REFS_LOCK
+#define REFS_MUTEX(shard) mutex
+#else
+#define REFS_MUTEX(shard) (&(shard).mutex)
+#endif
+
+#if defined(_MSC_VER) || defined(__WIN32)
+
+static int64_t nanoTime()
+{
+    static LARGE_INTEGER frequency = { 0 };
+    LARGE_INTEGER counter;
+
+    if (!frequency.QuadPart)
+        QueryPerformanceFrequency(&frequency);
+    QueryPerformanceCounter(&counter);
+
+    return (int64_t) ((double) counter.QuadPart * 1e9 / frequency.QuadPart);
+}
+
+class refLock {
+    CRITICAL_SECTION *m;
+public:
+    refLock(refShard &shard) {
+        m = REFS_MUTEX(shard);
+        if (!TryEnterCriticalSection(m))
+        {
+            int64_t start = nanoTime();
+
+            EnterCriticalSection(m);
+            shard.waits += 1;
+            shard.waitTime += nanoTime() - start;
+        }
+        shard.locks += 1;
+    }
+    virtual ~refLock() {
+        LeaveCriticalSection(m);
+    }
+};
+
+#else
+
+static int64_t nanoTime()
+{
+    struct timespec ts;
+
+    clock_gettime(CLOCK_MONOTONIC, &ts);
+
+    return (int64_t) ts.tv_sec * 1000000000LL + ts.tv_nsec;
+}
+
+class refLock {
+    pthread_mutex_t *m;
+public:
+    refLock(refShard &shard) {
+        m = REFS_MUTEX(shard);
+        if (pthread_mutex_trylock(m) != 0)
+        {
+            int64_t start = nanoTime();
+
+            pthread_mutex_lock(m);
+            shard.waits += 1;
+            shard.waitTime += nanoTime() - start;
+        }
+        shard.locks += 1;
+    }
+    virtual ~refLock() {
+        pthread_mutex_unlock(m);
+    }
+};
+
 #endif
 
 // borrowed from ICU (http://icu-project.org/apiref/icu4c/utf16_8h.html)
@@ -85,6 +204,10 @@ JCCEnv::JCCEnv(JavaVM *vm, JNIEnv *vm_env)
         mutex = new CRITICAL_SECTION();
         InitializeCriticalSection(mutex);  // recursive by default
     }
+#ifndef JCC_SINGLE_REFS_LOCK
+    for (int i = 0; i < JCC_REFS_SHARDS; i++)
+        InitializeCriticalSection(&refs[i].mutex);
+#endif
 #else
     if (!mutex)
     {
@@ -95,7 +218,18 @@ JCCEnv::JCCEnv(JavaVM *vm, JNIEnv *vm_env)
         mutex = new pthread_mutex_t();
         pthread_mutex_init(mutex, &attr);
     }
+#ifndef JCC_SINGLE_REFS_LOCK
+    for (int i = 0; i < JCC_REFS_SHARDS; i++)
+        pthread_mutex_init(&refs[i].mutex, NULL);
 #endif
+#endif
+
+    for (int i = 0; i < JCC_REFS_SHARDS; i++)
+        refs[i].locks = refs[i].waits = refs[i].waitTime = 0;
+
+    strings = NULL;
+    localFrames = 0;
+    frames = NULL;
 
     if (vm)
         set_vm(vm, vm_env);
@@ -329,10 +463,11 @@ jobject JCCEnv::newGlobalRef(jobject obj, int id)
     {
         if (id)  /* zero when weak global ref is desired */
         {
-            lock locked;
+            refShard &shard = refShardFor(id);
+            refLock locked(shard);
 
-            for (std::multimap<int, countedRef>::iterator iter = refs.find(id);
-                 iter != refs.end();
+            for (std::multimap<int, countedRef>::iterator iter = shard.refs.find(id);
+                 iter != shard.refs.end();
                  iter++) {
                 if (iter->first != id)
                     break;
@@ -354,7 +489,7 @@ jobject JCCEnv::newGlobalRef(jobject obj, int id)
 
             ref.global = vm_env->NewGlobalRef(obj);
             ref.count = 1;
-            refs.insert(std::pair<const int, countedRef>(id, ref));
+            shard.refs.insert(std::pair<const int, countedRef>(id, ref));
             vm_env->DeleteLocalRef(obj);
 
             return ref.global;
@@ -372,10 +507,11 @@ jobject JCCEnv::deleteGlobalRef(jobject obj, int id)
     {
         if (id)  /* zero when obj is weak global ref */
         {
-            lock locked;
+            refShard &shard = refShardFor(id);
+            refLock locked(shard);
 
-            for (std::multimap<int, countedRef>::iterator iter = refs.find(id);
-                 iter != refs.end();
+            for (std::multimap<int, countedRef>::iterator iter = shard.refs.find(id);
+                 iter != shard.refs.end();
                  iter++) {
                 if (iter->first != id)
                     break;
@@ -397,7 +533,7 @@ jobject JCCEnv::deleteGlobalRef(jobject obj, int id)
                         }
 
                         vm_env->DeleteGlobalRef(iter->second.global);
-                        refs.erase(iter);
+                        shard.refs.erase(iter);
                     }
                     else
                         iter->second.count -= 1;
@@ -415,6 +551,198 @@ jobject JCCEnv::deleteGlobalRef(jobject obj, int id)
     return NULL;
 }
 
+#if defined(_MSC_VER) || defined(__WIN32)
+
+static localFrame *getLocalFrame()
+{
+    if (!LOCAL_FRAME)
+    {
+        lock locked;
+
+        if (!LOCAL_FRAME)
+            LOCAL_FRAME = TlsAlloc();
+    }
+
+    return (localFrame *) TlsGetValue(LOCAL_FRAME);
+}
+
+static void setLocalFrame(localFrame *frame)
+{
+    TlsSetValue(LOCAL_FRAME, (LPVOID) frame);
+}
+
+#else
+
+static localFrame *getLocalFrame()
+{
+    if (!JCCEnv::LOCAL_FRAME)
+    {
+        lock locked;
+
+        if (!JCCEnv::LOCAL_FRAME)
+            pthread_key_create(&JCCEnv::LOCAL_FRAME, NULL);
+    }
+
+    return (localFrame *) pthread_getspecific(JCCEnv::LOCAL_FRAME);
+}
+
+static void setLocalFrame(localFrame *frame)
+{
+    pthread_setspecific(JCCEnv::LOCAL_FRAME, (void *) frame);
+}
+
+#endif
+
+/* Returns the new depth of the thread's local frame or -1 when the JVM
+ * couldn't reserve capacity local references, see localFrame in JCCEnv.h.
+ */
+int JCCEnv::pushLocalFrame(int capacity)
+{
+    localFrame *frame = getLocalFrame();
+
+    if (frame == NULL)
+    {
+        if (get_vm_env()->PushLocalFrame(capacity) < 0)
+            return -1;
+
+        frame = new localFrame();
+        setLocalFrame(frame);
+
+        lock locked;
+        frame->next = frames;
+        frames = frame;
+        localFrames += 1;
+    }
+
+    return frame->depth += 1;
+}
+
+/* Returns the remaining depth of the thread's local frame or -1 when none
+ * is active. Once the outermost frame is popped, the objects still holding
+ * local references are given global ones.
+ */
+int JCCEnv::popLocalFrame()
+{
+    localFrame *frame = getLocalFrame();
+
+    if (frame == NULL)
+        return -1;
+
+    if (--frame->depth > 0)
+        return frame->depth;
+
+    setLocalFrame(NULL);
+    {
+        /* no other thread releases objects of the frame meanwhile */
+        lock locked;
+
+        for (std::vector<JObject *>::iterator iter = frame->objects.begin();
+             iter != frame->objects.end();
+             iter++)
+            (*iter)->promote$();
+
+        for (localFrame **prev = &frames; *prev != NULL;
+             prev = &(*prev)->next) {
+            if (*prev == frame)
+            {
+                *prev = frame->next;
+                break;
+            }
+        }
+        localFrames -= 1;
+    }
+    delete frame;
+
+    get_vm_env()->PopLocalFrame(NULL);
+
+    return 0;
+}
+
+void JCCEnv::addLocal(localFrame *frame, JObject *obj)
+{
+    frameLock locked(frame);
+
+    frame->objects.push_back(obj);
+    obj->local = (int) frame->objects.size();
+}
+
+/* Unregisters obj from frame, returning false when it's not registered
+ * there. The caller holds the frame's lock.
+ */
+bool JCCEnv::removeLocal(localFrame *frame, JObject *obj)
+{
+    size_t n = (size_t) obj->local - 1;
+
+    if (n >= frame->objects.size() || frame->objects[n] != obj)
+        return false;
+
+    JObject *last = frame->objects.back();
+
+    frame->objects.pop_back();
+    if (last != obj)
+    {
+        frame->objects[n] = last;
+        last->local = (int) n + 1;
+    }
+
+    return true;
+}
+
+/* Releases the local reference held by obj. When freed on another thread
+ * than the one it was created on, the reference can't be deleted from here
+ * and is left to that thread's frame, obj is only unregistered from it,
+ * unless that frame was popped and obj given a global reference meanwhile.
+ */
+void JCCEnv::releaseLocal(JObject *obj)
+{
+    localFrame *frame = get_local_frame();
+
+    if (frame != NULL)
+    {
+        frameLock locked(frame);
+
+        if (removeLocal(frame, obj))
+        {
+            get_vm_env()->DeleteLocalRef(obj->this$);
+            return;
+        }
+    }
+
+    lock locked;
+
+    if (obj->local == 0)
+    {
+        obj->this$ = deleteGlobalRef(obj->this$, obj->id);
+        obj->id = 0;
+        return;
+    }
+
+    for (frame = frames; frame != NULL; frame = frame->next) {
+        frameLock locked(frame);
+
+        if (removeLocal(frame, obj))
+            break;
+    }
+}
+
+void JCCEnv::getRefStats(int64_t *count, int64_t *locks,
+                         int64_t *waits, int64_t *waitTime)
+{
+    /* The counters are read without locking, the totals are approximate
+     * while other threads are wrapping or releasing objects.
+     */
+    *count = *locks = *waits = *waitTime = 0;
+
+    for (int i = 0; i < JCC_REFS_SHARDS; i++) {
+        refShard &shard = refs[i];
+
+        *count += shard.refs.size();
+        *locks += shard.locks;
+        *waits += shard.waits;
+        *waitTime += shard.waitTime;
+    }
+}
+
 jclass JCCEnv::getClass(getclassfn initializeClass) const
 {
     jclass cls = (*initializeClass)(true);
@@ -422,6 +750,8 @@ jclass JCCEnv::getClass(getclassfn initializeClass) const
     if (cls == NULL)
     {
         lock locked;
+        suspendLocalFrame suspended;
+
         cls = (*initializeClass)(false);
     }
 
@@ -975,6 +1305,45 @@ jstring JCCEnv::fromUTF32(const uint32_t *chars, jsize len) const
     return str;
 }
 
+/* Latin-1 is the first 256 code points of UTF-16, widening each byte is a
+ * loop simple enough for compilers to vectorize. Short strings are widened
+ * on the stack to avoid a heap allocation.
+ */
+jstring JCCEnv::fromLatin1(const uint8_t *chars, jsize len) const
+{
+    jchar buffer[JCC_WIDEN_BUFFER_SIZE];
+    jchar *jchars = len <= JCC_WIDEN_BUFFER_SIZE ? buffer : new jchar[len];
+
+    for (jsize i = 0; i < len; ++i)
+        jchars[i] = chars[i];
+
+    jstring str = get_vm_env()->NewString(jchars, len);
+
+    if (jchars != buffer)
+        delete[] jchars;
+
+    reportException();
+
+    return str;
+}
+
+static bool isASCII(const char *chars, size_t len)
+{
+    const char *end = chars + len;
+    uint64_t bits = 0;
+
+    for (; chars + sizeof(bits) <= end; chars += sizeof(bits)) {
+        uint64_t word;
+
+        memcpy(&word, chars, sizeof(word));
+        bits |= word;
+    }
+    while (chars < end)
+        bits |= (uint8_t) *chars++;
+
+    return (bits & 0x8080808080808080ULL) == 0;
+}
+
 #ifdef PYTHON
 
 jstring JCCEnv::fromPyString(PyObject *object) const
@@ -982,6 +1351,28 @@ jstring JCCEnv::fromPyString(PyObject *object) const
     if (object == Py_None)
         return NULL;
 
+    if (strings != NULL && PyUnicode_CheckExact(object) &&
+        PyUnicode_READY(object) == 0 &&
+        PyUnicode_GET_LENGTH(object) <= JCC_STRING_CACHE_MAX_LENGTH)
+    {
+        Py_hash_t hash = PyObject_Hash(object);
+        jstring js = strings->get(object, hash);
+
+        if (js != NULL)
+            return (jstring) get_vm_env()->NewLocalRef(js);
+
+        js = newJString(object);
+        if (js != NULL)
+            strings->put(object, hash, js, id(js));
+
+        return js;
+    }
+
+    return newJString(object);
+}
+
+jstring JCCEnv::newJString(PyObject *object) const
+{
     if (PyUnicode_Check(object))
     {
         PyUnicode_READY(object);
@@ -1005,8 +1396,8 @@ jstring JCCEnv::fromPyString(PyObject *object) const
           }
 
           case PyUnicode_1BYTE_KIND:
-              return get_vm_env()->NewStringUTF(
-                  (const char *) PyUnicode_1BYTE_DATA(object));
+              return fromLatin1(PyUnicode_1BYTE_DATA(object),
+                                (jsize) PyUnicode_GET_LENGTH(object));
 
           case PyUnicode_2BYTE_KIND: {
               Py_ssize_t len = PyUnicode_GET_LENGTH(object);
@@ -1024,7 +1415,16 @@ jstring JCCEnv::fromPyString(PyObject *object) const
         }
     }
     else if (PyBytes_Check(object))
-        return get_vm_env()->NewStringUTF(PyBytes_AS_STRING(object));
+    {
+        const char *chars = PyBytes_AS_STRING(object);
+        Py_ssize_t len = PyBytes_GET_SIZE(object);
+
+        // ASCII is the same in UTF-8 and Latin-1 but may contain NULs
+        if (isASCII(chars, (size_t) len))
+            return fromLatin1((const uint8_t *) chars, (jsize) len);
+
+        return get_vm_env()->NewStringUTF(chars);
+    }
 
 
     PyObject *tuple = Py_BuildValue("(sO)", "expected a string", object);
@@ -1040,35 +1440,115 @@ PyObject *JCCEnv::fromJString(jstring js, int delete_local_ref) const
     if (!js)
         Py_RETURN_NONE;
 
+    JNIEnv *vm_env = get_vm_env();
+    PyObject *result;
+
+    if (strings != NULL &&
+        vm_env->GetStringLength(js) <= JCC_STRING_CACHE_MAX_LENGTH)
+    {
+        int jsid = id(js);
+
+        result = strings->get(js, jsid);
+        if (result == NULL)
+        {
+            result = newPyString(js);
+            if (result != NULL)
+                strings->put(result, PyObject_Hash(result), js, jsid);
+        }
+    }
+    else
+        result = newPyString(js);
+
+    if (delete_local_ref)
+        vm_env->DeleteLocalRef((jobject) js);
+
+    return result;
+}
+
+/* Returns the bitwise or of all chars, whose leftmost bit is all that
+ * PyUnicode_New() needs, and whether any char is a surrogate, checking
+ * four chars at a time.
+ */
+static uint32_t scanUTF16(const jchar *utf16, jsize len16, bool *surrogates)
+{
+    const uint64_t ones = 0x0001000100010001ULL;
+    const uint64_t highs = 0x8000800080008000ULL;
+    uint64_t bits = 0, found = 0;
+    jsize i = 0;
+
+    for (; i + 4 <= len16; i += 4) {
+        uint64_t word;
+
+        memcpy(&word, utf16 + i, sizeof(word));
+        bits |= word;
+
+        // a lane is zero when its char is in 0xd800-0xdfff
+        uint64_t lanes = (word & (0xf800 * ones)) ^ (0xd800 * ones);
+        found |= (lanes - ones) & ~lanes & highs;
+    }
+
+    uint32_t max_char = (uint32_t) (bits | (bits >> 16) | (bits >> 32) |
+                                    (bits >> 48)) & 0xffff;
+
+    for (; i < len16; ++i) {
+        max_char |= utf16[i];
+        if ((utf16[i] & 0xf800) == 0xd800)
+            found = 1;
+    }
+
+    *surrogates = found != 0;
+
+    return max_char;
+}
+
+/* Strings without surrogates, by far the most common, are scanned once and
+ * then copied, narrowing to Latin-1 if possible. Strings with surrogates
+ * are decoded code point by code point. No JNI calls are made while the
+ * chars are held so GetStringCritical() is safe and avoids a copy.
+ */
+PyObject *JCCEnv::newPyString(jstring js) const
+{
     JNIEnv *vm_env = get_vm_env();
     jsize len16 = vm_env->GetStringLength(js);
-    jboolean isCopy;
-    const jchar *utf16 = vm_env->GetStringChars(js, &isCopy);
+    const jchar *utf16 = vm_env->GetStringCritical(js, NULL);
 
-    int32_t len32 = 0;
-    uint32_t max_char = 0;
+    if (utf16 == NULL)
+        return PyErr_NoMemory();
 
-    for (jsize i = 0; i < len16;) {
-        uint32_t cp;
+    bool surrogates;
+    uint32_t max_char = scanUTF16(utf16, len16, &surrogates);
+    int32_t len32 = len16;
 
-        U16_NEXT(utf16, i, len16, cp);
-        max_char |= cp;  // we only care about the leftmost bit
-        len32 += 1;
+    if (surrogates)
+    {
+        len32 = 0;
+        max_char = 0;
+
+        for (jsize i = 0; i < len16;) {
+            uint32_t cp;
+
+            U16_NEXT(utf16, i, len16, cp);
+            max_char |= cp;  // we only care about the leftmost bit
+            len32 += 1;
+        }
     }
 
     PyObject *result = PyUnicode_New(len32, max_char);
 
     if (result == NULL) {
-        vm_env->ReleaseStringChars(js, utf16);
+        vm_env->ReleaseStringCritical(js, utf16);
         return NULL;
     }
 
     switch (PyUnicode_KIND(result)) {
-      case PyUnicode_1BYTE_KIND:
+      case PyUnicode_1BYTE_KIND: {
           // note: len16 == len32
+          Py_UCS1 *data = PyUnicode_1BYTE_DATA(result);
+
           for (int32_t i = 0; i < len32; ++i)
-              PyUnicode_1BYTE_DATA(result)[i] = (Py_UCS1) (utf16[i]);
+              data[i] = (Py_UCS1) utf16[i];
           break;
+      }
 
       case PyUnicode_2BYTE_KIND:
           // note: len16 == len32
@@ -1087,13 +1567,11 @@ PyObject *JCCEnv::fromJString(jstring js, int delete_local_ref) const
 
       default:
           Py_DECREF(result);
-          vm_env->ReleaseStringChars(js, utf16);
+          vm_env->ReleaseStringCritical(js, utf16);
           return NULL;
     }
 
-    vm_env->ReleaseStringChars(js, utf16);
-    if (delete_local_ref)
-        vm_env->DeleteLocalRef((jobject) js);
+    vm_env->ReleaseStringCritical(js, utf16);
 
     return result;
 }
@@ -1130,6 +1608,143 @@ PyObject *JCCEnv::getClassName(jobject obj) const
     Py_RETURN_NONE;
 }
 
+void JCCEnv::setStringCache(int capacity)
+{
+    if (strings != NULL)
+    {
+        strings->clear();
+        delete strings;
+        strings = NULL;
+    }
+
+    if (capacity > 0)
+        strings = new stringCache((size_t) capacity);
+}
+
+stringCache::stringCache(size_t capacity)
+{
+    this->capacity = capacity;
+    toJavaHits = toJavaMisses = 0;
+    toPythonHits = toPythonMisses = 0;
+}
+
+void stringCache::use(iterator i)
+{
+    lru.splice(lru.begin(), lru, i);
+}
+
+jstring stringCache::get(PyObject *str, Py_hash_t hash)
+{
+    std::pair<std::multimap<Py_hash_t, iterator>::iterator,
+              std::multimap<Py_hash_t, iterator>::iterator> range =
+        byHash.equal_range(hash);
+
+    for (std::multimap<Py_hash_t, iterator>::iterator i = range.first;
+         i != range.second; i++) {
+        PyObject *cached = i->second->str;
+
+        if (cached == str || PyUnicode_Compare(cached, str) == 0)
+        {
+            use(i->second);
+            toJavaHits += 1;
+
+            return i->second->js;
+        }
+    }
+
+    toJavaMisses += 1;
+
+    return NULL;
+}
+
+PyObject *stringCache::get(jstring js, int id)
+{
+    std::pair<std::multimap<int, iterator>::iterator,
+              std::multimap<int, iterator>::iterator> range =
+        byId.equal_range(id);
+
+    for (std::multimap<int, iterator>::iterator i = range.first;
+         i != range.second; i++) {
+        if (env->isSame(i->second->js, js))
+        {
+            PyObject *str = i->second->str;
+
+            use(i->second);
+            toPythonHits += 1;
+            Py_INCREF(str);
+
+            return str;
+        }
+    }
+
+    toPythonMisses += 1;
+
+    return NULL;
+}
+
+void stringCache::put(PyObject *str, Py_hash_t hash, jstring js, int id)
+{
+    JNIEnv *vm_env = env->get_vm_env();
+
+    if (lru.size() >= capacity)
+    {
+        iterator last = --lru.end();
+        std::pair<std::multimap<Py_hash_t, iterator>::iterator,
+                  std::multimap<Py_hash_t, iterator>::iterator> hashes =
+            byHash.equal_range(last->hash);
+        std::pair<std::multimap<int, iterator>::iterator,
+                  std::multimap<int, iterator>::iterator> ids =
+            byId.equal_range(last->id);
+
+        for (std::multimap<Py_hash_t, iterator>::iterator i = hashes.first;
+             i != hashes.second; i++) {
+            if (i->second == last)
+            {
+                byHash.erase(i);
+                break;
+            }
+        }
+        for (std::multimap<int, iterator>::iterator i = ids.first;
+             i != ids.second; i++) {
+            if (i->second == last)
+            {
+                byId.erase(i);
+                break;
+            }
+        }
+
+        vm_env->DeleteGlobalRef(last->js);
+        Py_DECREF(last->str);
+        lru.erase(last);
+    }
+
+    entry e;
+
+    e.str = str;
+    e.js = (jstring) vm_env->NewGlobalRef(js);
+    e.hash = hash;
+    e.id = id;
+    Py_INCREF(str);
+
+    lru.push_front(e);
+    byHash.insert(std::pair<Py_hash_t, iterator>(hash, lru.begin()));
+    byId.insert(std::pair<int, iterator>(id, lru.begin()));
+}
+
+void stringCache::clear()
+{
+    JNIEnv *vm_env = env->get_vm_env();
+
+    for (iterator i = lru.begin(); i != lru.end(); i++) {
+        vm_env->DeleteGlobalRef(i->js);
+        Py_DECREF(i->str);
+    }
+
+    lru.clear();
+    byHash.clear();
+    byId.clear();
+}
+
 /* may be called from finalizer thread which has no vm_env thread local */
 void JCCEnv::finalizeObject(JNIEnv *jenv, PyObject *obj)
 {
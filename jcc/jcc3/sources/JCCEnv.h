@@ -43,6 +43,8 @@
 #endif
 
 #include <map>
+#include <list>
+#include <vector>
 
 #ifdef PYTHON
 #include <Python.h>
@@ -57,9 +59,11 @@ class JCCEnv;
 #ifdef _jcc_shared
 _DLL_IMPORT extern JCCEnv *env;
 _DLL_IMPORT extern DWORD VM_ENV;
+_DLL_IMPORT extern DWORD LOCAL_FRAME;
 #else
 _DLL_EXPORT extern JCCEnv *env;
 _DLL_EXPORT extern DWORD VM_ENV;
+_DLL_EXPORT extern DWORD LOCAL_FRAME;
 #endif
 
 #else
@@ -79,12 +83,78 @@ public:
     int count;
 };
 
+/* The table of global references is split into JCC_REFS_SHARDS partitions,
+ * selected by identity hash code, each guarded by its own lock so that
+ * threads wrapping unrelated objects don't serialize on a single mutex.
+ * Building with -DJCC_SINGLE_REFS_LOCK restores the former behavior of one
+ * table guarded by the global JCCEnv lock.
+ */
+#ifdef JCC_SINGLE_REFS_LOCK
+#undef JCC_REFS_SHARDS
+#define JCC_REFS_SHARDS 1
+#elif !defined(JCC_REFS_SHARDS)
+#define JCC_REFS_SHARDS 64
+#endif
+
+class refShard {
+public:
+    std::multimap<int, countedRef> refs;
+#ifndef JCC_SINGLE_REFS_LOCK
+#if defined(_MSC_VER) || defined(__WIN32)
+    CRITICAL_SECTION mutex;
+#else
+    pthread_mutex_t mutex;
+#endif
+#endif
+    int64_t locks;     /* number of times the lock was acquired */
+    int64_t waits;     /* number of times acquiring it had to block */
+    int64_t waitTime;  /* nanoseconds spent blocked */
+};
+
+/* Strings up to this many chars are widened to UTF-16 on the stack */
+#ifndef JCC_WIDEN_BUFFER_SIZE
+#define JCC_WIDEN_BUFFER_SIZE 1024
+#endif
+
+class stringCache;
+class JObject;
+
+/* The JObject instances created on a thread between JCCEnv::pushLocalFrame()
+ * and the matching JCCEnv::popLocalFrame() keep the local reference they're
+ * constructed with instead of a global one, sparing the global reference
+ * table and the identity hash code call. The ones still alive when the
+ * outermost frame is popped are then turned into global references. Such
+ * objects must not be used by another thread while the frame is active but
+ * they may be freed there, by the garbage collector for example: they're
+ * then unregistered from the frame they were created in, the local
+ * reference being released with it.
+ * Native callbacks from Java and class initialization suspend the frame
+ * since the objects they create outlive the native frame they run in.
+ */
+class localFrame {
+public:
+    std::vector<JObject *> objects;  /* indexed by JObject::local - 1 */
+    int depth;       /* nesting of pushLocalFrame() calls */
+    int suspended;   /* nesting of suspendLocalFrame instances */
+    localFrame *next;  /* the next thread's, see JCCEnv::frames */
+#if defined(_MSC_VER) || defined(__WIN32)
+    CRITICAL_SECTION mutex;  /* guards objects */
+#else
+    pthread_mutex_t mutex;   /* guards objects */
+#endif
+
+    localFrame();
+    ~localFrame();
+};
+
 class _DLL_EXPORT JCCEnv {
 protected:
     jclass _sys, _obj, _thr;
     jclass _boo, _byt, _cha, _dou, _flo, _int, _lon, _sho;
     jmethodID *_mids;
 
+    static bool removeLocal(localFrame *frame, JObject *obj);
+
     enum {
         mid_sys_identityHashCode,
         mid_sys_setProperty,
@@ -116,8 +186,11 @@ protected:
 
 public:
     JavaVM *vm;
-    std::multimap<int, countedRef> refs;
+    refShard refs[JCC_REFS_SHARDS];
     int handlers;
+    int localFrames;       /* threads with an active local frame */
+    localFrame *frames;    /* their frames, guarded by the JCCEnv lock */
+    stringCache *strings;  /* NULL unless initVM(stringCache=N) */
 
     explicit JCCEnv(JavaVM *vm, JNIEnv *env);
 
@@ -126,14 +199,38 @@ public:
     {
         return (JNIEnv *) TlsGetValue(VM_ENV);
     }
+
+    inline localFrame *get_local_frame() const
+    {
+        return localFrames ? (localFrame *) TlsGetValue(LOCAL_FRAME) : NULL;
+    }
 #else
     static pthread_key_t VM_ENV;
+    static pthread_key_t LOCAL_FRAME;
 
     inline JNIEnv *get_vm_env() const
     {
         return (JNIEnv *) pthread_getspecific(VM_ENV);
     }
+
+    inline localFrame *get_local_frame() const
+    {
+        return localFrames
+            ? (localFrame *) pthread_getspecific(LOCAL_FRAME) : NULL;
+    }
 #endif
+    /* the current thread's local frame unless none or suspended */
+    inline localFrame *use_local_frame() const
+    {
+        localFrame *frame = get_local_frame();
+
+        return frame && !frame->suspended ? frame : NULL;
+    }
+    int pushLocalFrame(int capacity);
+    int popLocalFrame();
+    void addLocal(localFrame *frame, JObject *obj);
+    void releaseLocal(JObject *obj);
+
     void set_vm(JavaVM *vm, JNIEnv *vm_env);
     void set_vm_env(JNIEnv *vm_env);
     int attachCurrentThread(char *name, int asDaemon);
@@ -153,6 +250,20 @@ public:
     jobject newGlobalRef(jobject obj, int id);
     jobject deleteGlobalRef(jobject obj, int id);
 
+    /* for constructing a JObject from the reference held by another */
+    inline jobject newLocalRef(jobject obj) const
+    {
+        return obj ? get_vm_env()->NewLocalRef(obj) : NULL;
+    }
+
+    void getRefStats(int64_t *count, int64_t *locks,
+                     int64_t *waits, int64_t *waitTime);
+
+    inline refShard &refShardFor(int id)
+    {
+        return refs[(((uint32_t) id * 2654435761U) >> 16) % JCC_REFS_SHARDS];
+    }
+
     jclass getClass(getclassfn initializeClass) const;
     jobject newObject(getclassfn initializeClass, jmethodID **mids, int m, ...);
 
@@ -281,14 +392,18 @@ public:
     char *getClassPath();
 
     jstring fromUTF32(const uint32_t *chars, jsize len) const;
+    jstring fromLatin1(const uint8_t *chars, jsize len) const;
 #ifdef PYTHON
     jclass getPythonExceptionClass() const;
     bool restorePythonException(jthrowable throwable) const;
     jstring fromPyString(PyObject *object) const;
     PyObject *fromJString(jstring js, int delete_local_ref) const;
+    jstring newJString(PyObject *object) const;
+    PyObject *newPyString(jstring js) const;
     PyObject *toPyUnicode(jobject obj) const;
     PyObject *getClassName(jobject obj) const;
     void finalizeObject(JNIEnv *jenv, PyObject *obj);
+    void setStringCache(int capacity);
 #endif
 
     inline int isSame(jobject o1, jobject o2) const
@@ -299,21 +414,92 @@ public:
 
 #ifdef PYTHON
 
+/* The optional cache of strings converted between Python and Java, enabled
+ * with initVM(stringCache=N). Each entry pairs a Python str with a Java
+ * String of equal value and is found either by the str's hash or by the
+ * String's identity hash code so that repeated field names and terms are
+ * neither copied nor allocated again, in either direction. Once full, the
+ * least recently used entry is evicted. Strings longer than
+ * JCC_STRING_CACHE_MAX_LENGTH are never cached. Only used with the GIL.
+ */
+#ifndef JCC_STRING_CACHE_MAX_LENGTH
+#define JCC_STRING_CACHE_MAX_LENGTH 256
+#endif
+
+class stringCache {
+public:
+    class entry {
+    public:
+        PyObject *str;   /* new reference */
+        jstring js;      /* global reference */
+        Py_hash_t hash;
+        int id;
+    };
+    typedef std::list<entry>::iterator iterator;
+
+    std::list<entry> lru;  /* most recently used first */
+    std::multimap<Py_hash_t, iterator> byHash;
+    std::multimap<int, iterator> byId;
+    size_t capacity;
+    int64_t toJavaHits, toJavaMisses;
+    int64_t toPythonHits, toPythonMisses;
+
+    explicit stringCache(size_t capacity);
+
+    jstring get(PyObject *str, Py_hash_t hash);
+    PyObject *get(jstring js, int id);
+    void put(PyObject *str, Py_hash_t hash, jstring js, int id);
+    void clear();
+
+private:
+    void use(iterator i);
+};
+
+#endif
+
+class suspendLocalFrame {
+  private:
+    localFrame *frame;
+  public:
+    suspendLocalFrame()
+    {
+        frame = env->use_local_frame();
+        if (frame)
+            frame->suspended += 1;
+    }
+    ~suspendLocalFrame()
+    {
+        if (frame)
+            frame->suspended -= 1;
+    }
+};
+
+#ifdef PYTHON
+
 class PythonGIL {
   private:
     PyGILState_STATE state;
+    localFrame *frame;
   public:
     PythonGIL()
     {
         state = PyGILState_Ensure();
+        frame = NULL;
     }
+    /* native callbacks from Java suspend the thread's local frame, the local
+     * references they create are released when they return */
     PythonGIL(JNIEnv *vm_env)
     {
         state = PyGILState_Ensure();
         env->set_vm_env(vm_env);
+        frame = env->use_local_frame();
+        if (frame)
+            frame->suspended += 1;
     }
     ~PythonGIL()
     {
+        if (frame)
+            frame->suspended -= 1;
         PyGILState_Release(state);
     }
 };
@@ -323,11 +509,12 @@ class PythonThreadState {
     PyThreadState *state;
     int handler;
   public:
+    /* handlers is shared by all threads, only update it with the GIL */
     PythonThreadState(int handler=0)
     {
-        state = PyEval_SaveThread();
         this->handler = handler;
         env->handlers += handler;
+        state = PyEval_SaveThread();
     }
     ~PythonThreadState()
     {
@@ -97,10 +97,68 @@ static PyTypeObject JObject_type = {
 PyType_Def PY_TYPE_DEF(JObject) = {};
 PyTypeObject *PY_TYPE(JObject) = &JObject_type;
 
+/* Wrappers of the generated types are recycled through free lists, one per
+ * size since generic types append their type parameters to t_JObject, and
+ * JOBJECT_FREE_LIST_SIZE wrappers at most per list. Python subclasses are
+ * not recycled, their instances are collected and deallocated differently.
+ * Only used with the GIL.
+ */
+#ifndef JOBJECT_FREE_LIST_SIZE
+#define JOBJECT_FREE_LIST_SIZE 1024
+#endif
+#define JOBJECT_FREE_LISTS 4
+
+static PyObject *freeLists[JOBJECT_FREE_LISTS];
+static int freeCounts[JOBJECT_FREE_LISTS];
+
+static int freeList(PyTypeObject *type)
+{
+    Py_ssize_t extra = type->tp_basicsize - (Py_ssize_t) sizeof(t_JObject);
+
+    if (type->tp_dealloc != (destructor) t_JObject_dealloc ||
+        PyType_IS_GC(type) || type->tp_itemsize != 0 || extra < 0 ||
+        extra % sizeof(PyTypeObject *) != 0)
+        return -1;
+
+    extra /= sizeof(PyTypeObject *);
+
+    return extra < JOBJECT_FREE_LISTS ? (int) extra : -1;
+}
+
+PyObject *allocJObject(PyTypeObject *type)
+{
+    int i = freeList(type);
+
+    if (i >= 0 && freeLists[i] != NULL)
+    {
+        PyObject *self = freeLists[i];
+
+        /* the next free wrapper is linked through ob_type */
+        freeLists[i] = (PyObject *) Py_TYPE(self);
+        freeCounts[i] -= 1;
+        memset((void *) self, 0, type->tp_basicsize);
+
+        return PyObject_Init(self, type);
+    }
+
+    return PyType_GenericAlloc(type, 0);
+}
+
 static void t_JObject_dealloc(t_JObject *self)
 {
+    PyTypeObject *type = Py_TYPE(self);
+    int i;
+
     self->object = JObject(NULL);
-    self->ob_base.ob_type->tp_free((PyObject *) self);
+
+    if ((i = freeList(type)) >= 0 && freeCounts[i] < JOBJECT_FREE_LIST_SIZE)
+    {
+        self->ob_base.ob_type = (PyTypeObject *) freeLists[i];
+        freeLists[i] = (PyObject *) self;
+        freeCounts[i] += 1;
+    }
+    else
+        type->tp_free((PyObject *) self);
 }
 
 static PyObject *t_JObject_new(PyTypeObject *type,
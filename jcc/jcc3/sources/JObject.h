@@ -18,43 +18,51 @@
 #include <stdio.h>
 #include "JCCEnv.h"
 
+/* JObject has no virtual methods so that it is no larger than the reference
+ * it holds and its bookkeeping, it is never deleted through a pointer to it.
+ */
 class _DLL_EXPORT JObject {
 public:
     jobject this$;
 
     inline explicit JObject(jobject obj)
     {
-        if (obj)
+        localFrame *frame;
+
+        id = 0;
+        local = 0;
+
+        if (!obj)
+            this$ = NULL;
+        else if ((frame = env->use_local_frame()) != NULL)
         {
-            id = env->id(obj);
-            this$ = env->newGlobalRef(obj, id);
+            this$ = obj;
+            env->addLocal(frame, this);
         }
         else
         {
-            id = 0;
-            this$ = NULL;
+            id = env->id(obj);
+            this$ = env->newGlobalRef(obj, id);
         }
     }
 
     inline JObject(const JObject& obj)
     {
-        id = obj.id ? obj.id : env->id(obj.this$);
-        this$ = env->newGlobalRef(obj.this$, id);
+        copy$(obj);
     }
 
-    virtual ~JObject()
+    inline ~JObject()
     {
-        this$ = env->deleteGlobalRef(this$, id);
+        release$();
     }
 
     JObject& weaken$()
     {
-        if (id)
+        if (id || local)
         {
             jobject ref = env->newGlobalRef(this$, 0);
 
-            env->deleteGlobalRef(this$, id);
-            id = 0;
+            release$();
             this$ = ref;
         }
 
@@ -73,12 +81,11 @@ public:
 
     JObject& operator=(const JObject& obj)
     {
-        jobject prev = this$;
-        int objid = obj.id ? obj.id : env->id(obj.this$);
-
-        this$ = env->newGlobalRef(obj.this$, objid);
-        env->deleteGlobalRef(prev, id);
-        id = objid;
+        if (this != &obj)
+        {
+            release$();
+            copy$(obj);
+        }
 
         return *this;
     }
@@ -87,7 +94,54 @@ protected:
     JObject() {}
 
 private:
-    int id;      // zero when this$ is a weak ref */
+    int id;      // zero when this$ is a weak or local ref
+    int local;   // one past the index in the thread's localFrame, or zero
+
+    friend class JCCEnv;
+
+    inline void copy$(const JObject& obj)
+    {
+        localFrame *frame;
+
+        id = 0;
+        local = 0;
+
+        if (!obj.this$)
+            this$ = NULL;
+        else if ((frame = env->use_local_frame()) != NULL)
+        {
+            this$ = env->get_vm_env()->NewLocalRef(obj.this$);
+            env->addLocal(frame, this);
+        }
+        else
+        {
+            id = obj.id ? obj.id : env->id(obj.this$);
+            this$ = env->newGlobalRef(obj.local
+                                      ? env->newLocalRef(obj.this$)
+                                      : obj.this$, id);
+        }
+    }
+
+    inline void release$()
+    {
+        if (local)
+        {
+            env->releaseLocal(this);
+            this$ = NULL;
+            local = 0;
+        }
+        else
+            this$ = env->deleteGlobalRef(this$, id);
+        id = 0;
+    }
+
+    /* called when the outermost local frame is popped */
+    inline void promote$()
+    {
+        id = env->id(this$);
+        this$ = env->newGlobalRef(this$, id);
+        local = 0;
+    }
 };
 
 
@@ -104,6 +158,9 @@ public:
 
 DECLARE_TYPE(JObject);
 
+/* Allocates a wrapper of type, a generated type, from its free list */
+PyObject *allocJObject(PyTypeObject *type);
+
 #endif /* PYTHON */
 
 
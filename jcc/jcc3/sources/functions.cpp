@@ -74,6 +74,65 @@ PyObject *_set_function_self(PyObject *self, PyObject *args)
     Py_RETURN_NONE;
 }
 
+/* The local frames entered with localFrame() in the generated __init__.py,
+ * see localFrame in JCCEnv.h.
+ */
+PyObject *_push_local_frame(PyObject *self, PyObject *args)
+{
+    int capacity = -1;
+
+    if (!PyArg_ParseTuple(args, "|i", &capacity))
+        return NULL;
+
+    if (env->vm == NULL || env->get_vm_env() == NULL)
+    {
+        PyErr_SetString(PyExc_RuntimeError,
+                        "initVM() or attachCurrentThread() must be called first");
+        return NULL;
+    }
+
+    /* nested frames only count their depth in the outermost JNI frame */
+    if (env->get_local_frame() != NULL)
+    {
+        if (capacity >= 0)
+        {
+            PyErr_SetString(PyExc_ValueError,
+                            "capacity only applies to the outermost local frame");
+            return NULL;
+        }
+    }
+    else if (capacity < 0)
+        capacity = 16;
+
+    int depth = env->pushLocalFrame(capacity);
+
+    if (depth < 0)
+        return PyErr_SetJavaError();
+
+    return PyLong_FromLong(depth);
+}
+
+PyObject *_pop_local_frame(PyObject *self, PyObject *args)
+{
+    int depth;
+
+    if (!PyArg_ParseTuple(args, "i", &depth))
+        return NULL;
+
+    localFrame *frame = env->vm != NULL ? env->get_local_frame() : NULL;
+
+    if (frame == NULL || frame->depth != depth)
+    {
+        PyErr_SetString(PyExc_RuntimeError,
+                        "local frames must be exited in reverse order");
+        return NULL;
+    }
+
+    env->popLocalFrame();
+
+    Py_RETURN_NONE;
+}
+
 PyObject *findClass(PyObject *self, PyObject *args)
 {
     char *className;
@@ -320,6 +379,19 @@ int __parseArg(PyObject *arg, char *types, ...)
     return _parseArgs(&arg, 1, types, list, check);
 }
 
+#if PY_VERSION_HEX >= 0x03070000
+int __parseFastArgs(PyObject *const *args, Py_ssize_t nargs, char *types, ...)
+{
+    va_list list, check;
+
+    va_start(list, types);
+    va_start(check, types);
+
+    return _parseArgs((PyObject **) args, (unsigned int) nargs, types,
+		      list, check);
+}
+#endif
+
 int _parseArgs(PyObject **args, unsigned int count, char *types,
 	       va_list list, va_list check)
 {
@@ -1371,6 +1443,57 @@ PyObject *PyErr_SetArgsError(PyTypeObject *type, char *name, PyObject *args)
     return NULL;
 }
 
+#if PY_VERSION_HEX >= 0x03070000
+static PyObject *argsTuple(PyObject *const *args, Py_ssize_t nargs)
+{
+    PyObject *tuple = PyTuple_New(nargs);
+
+    if (tuple != NULL)
+    {
+        for (Py_ssize_t i = 0; i < nargs; i++) {
+            Py_INCREF(args[i]);
+            PyTuple_SET_ITEM(tuple, i, args[i]);
+        }
+    }
+
+    return tuple;
+}
+
+PyObject *PyErr_SetArgsError(PyObject *self, char *name,
+                             PyObject *const *args, Py_ssize_t nargs)
+{
+    if (!PyErr_Occurred())
+    {
+        PyObject *tuple = argsTuple(args, nargs);
+
+        if (tuple != NULL)
+        {
+            PyErr_SetArgsError(self, name, tuple);
+            Py_DECREF(tuple);
+        }
+    }
+
+    return NULL;
+}
+
+PyObject *PyErr_SetArgsError(PyTypeObject *type, char *name,
+                             PyObject *const *args, Py_ssize_t nargs)
+{
+    if (!PyErr_Occurred())
+    {
+        PyObject *tuple = argsTuple(args, nargs);
+
+        if (tuple != NULL)
+        {
+            PyErr_SetArgsError(type, name, tuple);
+            Py_DECREF(tuple);
+        }
+    }
+
+    return NULL;
+}
+#endif
+
 PyObject *PyErr_SetJavaError()
 {
     JNIEnv *vm_env = env->get_vm_env();
@@ -1389,6 +1512,229 @@ PyObject *PyErr_SetJavaError()
     return NULL;
 }
 
+#if PY_VERSION_HEX >= 0x030D0000
+/* still exported but no longer declared */
+extern "C" PyAPI_FUNC(int) _PyObject_GetMethod(PyObject *obj, PyObject *name,
+                                               PyObject **method);
+#endif
+
+PyObject *PythonMethod::lookup(PyObject *self)
+{
+    PyTypeObject *selfType = Py_TYPE(self);
+    struct entry *e = NULL;
+
+    for (int i = 0; i < SIZE; i++) {
+        if (entries[i].type == selfType)
+        {
+            e = &entries[i];
+            break;
+        }
+    }
+
+    if (e == NULL || e->version != selfType->tp_version_tag ||
+        !PyType_HasFeature(selfType, Py_TPFLAGS_VALID_VERSION_TAG))
+    {
+        /* the raw entry found along the MRO, not bound by descriptors such
+         * as staticmethod or classmethod, which aren't cached
+         */
+        PyObject *attr = _PyType_Lookup(selfType, pyName);
+
+        if (e == NULL)
+        {
+            e = &entries[next];
+            next = (next + 1) % SIZE;
+        }
+
+        Py_XDECREF(e->function);
+        e->function = NULL;
+        e->type = NULL;
+
+        if (attr == NULL || !PyFunction_Check(attr) ||
+            !PyType_HasFeature(selfType, Py_TPFLAGS_VALID_VERSION_TAG))
+            return NULL;
+
+        Py_INCREF(attr);
+        e->function = attr;
+        e->type = selfType;
+        e->version = selfType->tp_version_tag;
+    }
+
+    /* an attribute of the object itself hides the method */
+#ifdef Py_TPFLAGS_MANAGED_DICT
+    if (PyType_HasFeature(selfType, Py_TPFLAGS_MANAGED_DICT))
+    {
+        /* _PyObject_GetDictPtr() would turn the object's inline values
+         * into a dict, _PyObject_GetMethod() reads them as they are and
+         * returns the type's function unbound unless it's hidden
+         */
+        PyObject *method = NULL;
+        int unbound = _PyObject_GetMethod(self, pyName, &method);
+
+        Py_XDECREF(method);
+        if (unbound && method == e->function)
+            return e->function;
+
+        if (method == NULL)
+            PyErr_Clear();
+
+        return NULL;
+    }
+#endif
+
+    /* an object without a dict yet has none */
+    if (selfType->tp_dictoffset != 0)
+    {
+        PyObject **dict = _PyObject_GetDictPtr(self);
+
+        if (dict != NULL && *dict != NULL &&
+            PyDict_GetItem(*dict, pyName) != NULL)
+            return NULL;
+    }
+
+    return e->function;
+}
+
+PyObject *PythonMethod::call(PyObject **args, size_t nargs)
+{
+    PyObject *self = args[0];
+
+    for (size_t i = 0; i < nargs; i++) {
+        if (args[i] == NULL)
+        {
+            if (!PyErr_Occurred())
+                PyErr_SetString(PyExc_SystemError, "null argument");
+            return NULL;
+        }
+    }
+
+    if (pyName == NULL)
+    {
+        pyName = PyUnicode_InternFromString(name);
+        if (pyName == NULL)
+            return NULL;
+    }
+
+    PyObject *callable = lookup(self);
+    PyObject *result;
+#if PY_VERSION_HEX >= 0x03090000
+    size_t flags = 0;
+#endif
+
+    if (callable != NULL)
+    {
+        /* the cache may be reset by the call, keep the function alive */
+        Py_INCREF(callable);
+    }
+    else
+    {
+        callable = PyObject_GetAttr(self, pyName);
+        if (callable == NULL)
+            return NULL;
+
+        args += 1;
+        nargs -= 1;
+#if PY_VERSION_HEX >= 0x03090000
+        flags = PY_VECTORCALL_ARGUMENTS_OFFSET;
+#endif
+    }
+
+#if PY_VERSION_HEX >= 0x03090000
+    result = PyObject_Vectorcall(callable, args, nargs | flags, NULL);
+#else
+    PyObject *tuple = PyTuple_New(nargs);
+
+    if (tuple == NULL)
+        result = NULL;
+    else
+    {
+        for (size_t i = 0; i < nargs; i++) {
+            Py_INCREF(args[i]);
+            PyTuple_SET_ITEM(tuple, i, args[i]);
+        }
+        result = PyObject_Call(callable, tuple, NULL);
+        Py_DECREF(tuple);
+    }
+#endif
+
+    Py_DECREF(callable);
+
+    return result;
+}
+
+#if PY_VERSION_HEX >= 0x03070000
+
+/* single characters match char parameters too, tag their type */
+#define CHAR_TYPE(type) ((PyTypeObject *) (((Py_intptr_t) (type)) | 1))
+
+bool OverloadCache::key(PyObject *const *args, Py_ssize_t nargs,
+                        PyTypeObject **types)
+{
+    if (nargs > MAXARGS)
+        return false;
+
+    for (Py_ssize_t i = 0; i < nargs; i++) {
+        PyObject *arg = args[i];
+        PyTypeObject *type = Py_TYPE(arg);
+
+        if (type == &PyLong_Type || type == &PyFloat_Type ||
+            type == &PyBool_Type || arg == Py_None)
+            types[i] = type;
+        else if (type == &PyUnicode_Type)
+            types[i] = (PyUnicode_GET_LENGTH(arg) == 1 &&
+                        PyUnicode_READ_CHAR(arg, 0) < 0x10000)
+                ? CHAR_TYPE(type) : type;
+        else if (type == &PyBytes_Type)
+            types[i] = PyBytes_GET_SIZE(arg) == 1 ? CHAR_TYPE(type) : type;
+        else
+            return false;
+    }
+
+    return true;
+}
+
+int OverloadCache::get(PyObject *const *args, Py_ssize_t nargs)
+{
+    PyTypeObject *types[MAXARGS];
+
+    if (count == 0 || !key(args, nargs, types))
+        return -1;
+
+    for (int i = 0; i < count; i++) {
+        struct entry *e = &entries[i];
+
+        if (e->nargs == nargs &&
+            !memcmp(e->types, types, nargs * sizeof(PyTypeObject *)))
+            return e->overload;
+    }
+
+    return -1;
+}
+
+void OverloadCache::put(PyObject *const *args, Py_ssize_t nargs, int overload)
+{
+    PyTypeObject *types[MAXARGS];
+    struct entry *e;
+
+    if (!key(args, nargs, types))
+        return;
+
+    if (count < SIZE)
+        e = &entries[count++];
+    else
+    {
+        e = &entries[next];
+        next = (next + 1) % SIZE;
+    }
+
+    e->nargs = nargs;
+    memcpy(e->types, types, nargs * sizeof(PyTypeObject *));
+    e->overload = overload;
+}
+
+#undef CHAR_TYPE
+
+#endif
+
 void throwPythonError(void)
 {
     PyObject *exc = PyErr_Occurred();
@@ -1524,6 +1870,40 @@ PyObject *callSuper(PyTypeObject *type, PyObject *self,
     return value;
 }
 
+#if PY_VERSION_HEX >= 0x03070000
+
+PyObject *callSuper(PyTypeObject *type, const char *name,
+                    PyObject *const *args, Py_ssize_t nargs, int cardinality)
+{
+    PyObject *tuple = argsTuple(args, nargs);
+    PyObject *value;
+
+    if (!tuple)
+        return NULL;
+
+    value = callSuper(type, name, tuple, cardinality);
+    Py_DECREF(tuple);
+
+    return value;
+}
+
+PyObject *callSuper(PyTypeObject *type, PyObject *self, const char *name,
+                    PyObject *const *args, Py_ssize_t nargs, int cardinality)
+{
+    PyObject *tuple = argsTuple(args, nargs);
+    PyObject *value;
+
+    if (!tuple)
+        return NULL;
+
+    value = callSuper(type, self, name, tuple, cardinality);
+    Py_DECREF(tuple);
+
+    return value;
+}
+
+#endif
+
 PyObject *castCheck(PyObject *obj, getclassfn initializeClass,
                     int reportError)
 {
@@ -1628,6 +2008,16 @@ static bool setArrayObj(jobjectArray array, int index, PyObject *obj)
 }
 
 
+static bool isStringClass(jclass cls)
+{
+    static jclass stringClass = NULL;
+
+    if (stringClass == NULL)
+        stringClass = env->getClass(String::initializeClass);
+
+    return env->isSame(cls, stringClass);
+}
+
 jobjectArray fromPySequence(jclass cls, PyObject *sequence)
 {
     if (sequence == Py_None)
@@ -1639,6 +2029,9 @@ jobjectArray fromPySequence(jclass cls, PyObject *sequence)
         return NULL;
     }
 
+    if (isStringClass(cls))
+        return toJStringArray(cls, sequence);
+
     int length = PySequence_Length(sequence);
     jobjectArray array;
 
@@ -1673,6 +2066,9 @@ jobjectArray fromPySequence(jclass cls, PyObject **args, int length)
 {
     jobjectArray array;
 
+    if (isStringClass(cls))
+        return toJStringArray(cls, args, length);
+
     try {
         array = env->newObjectArray(cls, length);
     } catch (int e) {
@@ -1701,6 +2097,190 @@ jobjectArray fromPySequence(jclass cls, PyObject **args, int length)
     return array;
 }
 
+/* Elements are converted between Python lists and Java arrays in one
+ * pass, their local references released together with the local frame
+ * they were created in, a frame per ARRAY_FRAME_SIZE elements. These
+ * return NULL with a Python error set on failure.
+ */
+#define ARRAY_FRAME_SIZE 256
+
+PyObject *fromJObjectArray(jobjectArray array, Py_ssize_t lo, Py_ssize_t hi,
+                           PyObject *(*wrapfn)(const jobject&))
+{
+    JNIEnv *vm_env = env->get_vm_env();
+    PyObject *list = PyList_New(hi - lo);
+    /* inside a local frame, chunked frames would delete the local refs
+     * the wrappers keep, the ones not kept are deleted one by one instead
+     */
+    bool frames = env->use_local_frame() == NULL;
+
+    if (list == NULL)
+        return NULL;
+
+    for (Py_ssize_t i = lo; i < hi;) {
+        Py_ssize_t end = hi - i > ARRAY_FRAME_SIZE
+            ? i + ARRAY_FRAME_SIZE : hi;
+        bool failed = false;
+
+        if (frames && vm_env->PushLocalFrame((jint) (end - i)) < 0)
+        {
+            Py_DECREF(list);
+            return PyErr_SetJavaError();
+        }
+
+        for (; i < end; i++) {
+            jobject jobj = vm_env->GetObjectArrayElement(array, (jsize) i);
+            PyObject *obj = (*wrapfn)(jobj);
+
+            if (!frames && jobj != NULL &&
+                (obj == NULL || !PyObject_TypeCheck(obj, PY_TYPE(JObject)) ||
+                 ((t_JObject *) obj)->object.this$ != jobj))
+                vm_env->DeleteLocalRef(jobj);
+
+            if (obj == NULL)
+            {
+                failed = true;
+                break;
+            }
+            PyList_SET_ITEM(list, i - lo, obj);
+        }
+
+        if (frames)
+            vm_env->PopLocalFrame(NULL);
+        if (failed || vm_env->ExceptionCheck())
+        {
+            Py_DECREF(list);
+            if (!PyErr_Occurred())
+                PyErr_SetJavaError();
+            return NULL;
+        }
+    }
+
+    return list;
+}
+
+PyObject *fromJStringArray(jobjectArray array, Py_ssize_t lo, Py_ssize_t hi)
+{
+    JNIEnv *vm_env = env->get_vm_env();
+    PyObject *list = PyList_New(hi - lo);
+
+    if (list == NULL)
+        return NULL;
+
+    for (Py_ssize_t i = lo; i < hi;) {
+        Py_ssize_t end = hi - i > ARRAY_FRAME_SIZE
+            ? i + ARRAY_FRAME_SIZE : hi;
+        bool failed = false;
+
+        if (vm_env->PushLocalFrame((jint) (end - i)) < 0)
+        {
+            Py_DECREF(list);
+            return PyErr_SetJavaError();
+        }
+
+        for (; i < end; i++) {
+            jstring js = (jstring)
+                vm_env->GetObjectArrayElement(array, (jsize) i);
+            PyObject *str = env->fromJString(js, 0);
+
+            if (str == NULL)
+            {
+                failed = true;
+                break;
+            }
+            PyList_SET_ITEM(list, i - lo, str);
+        }
+
+        vm_env->PopLocalFrame(NULL);
+        if (failed || vm_env->ExceptionCheck())
+        {
+            Py_DECREF(list);
+            if (!PyErr_Occurred())
+                PyErr_SetJavaError();
+            return NULL;
+        }
+    }
+
+    return list;
+}
+
+jobjectArray toJStringArray(jclass cls, PyObject **items, Py_ssize_t length)
+{
+    JNIEnv *vm_env = env->get_vm_env();
+    jobjectArray array = vm_env->NewObjectArray((jsize) length, cls, NULL);
+
+    if (array == NULL)
+    {
+        PyErr_SetJavaError();
+        return NULL;
+    }
+
+    for (Py_ssize_t i = 0; i < length;) {
+        Py_ssize_t end = length - i > ARRAY_FRAME_SIZE
+            ? i + ARRAY_FRAME_SIZE : length;
+        bool failed = false;
+
+        if (vm_env->PushLocalFrame((jint) (end - i)) < 0)
+            failed = true;
+        else
+        {
+            for (; i < end; i++) {
+                PyObject *obj = items[i];
+                jobject jobj;
+
+                if (PyObject_TypeCheck(obj, PY_TYPE(JObject)))
+                    jobj = ((t_JObject *) obj)->object.this$;
+                else if (PyObject_TypeCheck(obj, PY_TYPE(FinalizerProxy)))
+                    jobj = ((t_JObject *) ((t_fp *) obj)->object)->object.this$;
+                else
+                {
+                    jobj = env->fromPyString(obj);
+                    if (jobj == NULL && obj != Py_None)
+                    {
+                        failed = true;
+                        break;
+                    }
+                }
+
+                if (jobj != NULL && !vm_env->IsInstanceOf(jobj, cls))
+                {
+                    PyErr_SetObject(PyExc_TypeError, obj);
+                    failed = true;
+                    break;
+                }
+                vm_env->SetObjectArrayElement(array, (jsize) i, jobj);
+            }
+            vm_env->PopLocalFrame(NULL);
+        }
+
+        if (failed || vm_env->ExceptionCheck())
+        {
+            if (!PyErr_Occurred())
+                PyErr_SetJavaError();
+            vm_env->DeleteLocalRef(array);
+            return NULL;
+        }
+    }
+
+    return array;
+}
+
+jobjectArray toJStringArray(jclass cls, PyObject *sequence)
+{
+    PyObject *fast = PySequence_Fast(sequence, "not a sequence");
+
+    if (fast == NULL)
+        return NULL;
+
+    jobjectArray array =
+        toJStringArray(cls, PySequence_Fast_ITEMS(fast),
+                       PySequence_Fast_GET_SIZE(fast));
+
+    Py_DECREF(fast);
+
+    return array;
+}
+
 PyTypeObject *makeType(PyType_Def *def)
 {
     if (def->type == NULL)
@@ -23,10 +23,17 @@
 
 typedef PyTypeObject **(*getparametersfn)(void *);
 typedef int (*boxfn)(PyTypeObject *, PyObject *, java::lang::Object *);
+typedef void (*resolvefn)(void);
 
 PyObject *PyErr_SetArgsError(char *name, PyObject *args);
 PyObject *PyErr_SetArgsError(PyObject *self, char *name, PyObject *args);
 PyObject *PyErr_SetArgsError(PyTypeObject *type, char *name, PyObject *args);
+#if PY_VERSION_HEX >= 0x03070000
+PyObject *PyErr_SetArgsError(PyObject *self, char *name,
+                             PyObject *const *args, Py_ssize_t nargs);
+PyObject *PyErr_SetArgsError(PyTypeObject *type, char *name,
+                             PyObject *const *args, Py_ssize_t nargs);
+#endif
 PyObject *PyErr_SetJavaError();
 
 extern PyObject *PyExc_JavaError;
@@ -36,6 +43,78 @@ extern PyObject *PyExc_InvalidArgsError;
 void throwPythonError(void);
 void throwTypeError(const char *name, PyObject *object);
 
+/* A method of Python extension objects called from Java.
+ * The function implementing it is looked up on the object's type once
+ * and cached until the type changes, its version tag tells, for the last
+ * SIZE types the method was called on, Python subclasses of the same
+ * extension for example. It is then called with the object prepended to
+ * the arguments, through vectorcall, instead of looking up and binding the
+ * method by name on every call.
+ * Methods set on an object itself, or not implemented by a plain Python
+ * function, are looked up and called as before.
+ * args[0] is the object, args[1..nargs - 1] the arguments, a NULL
+ * argument means its conversion failed. Must be called with the GIL.
+ */
+class PythonMethod {
+public:
+    explicit PythonMethod(const char *name)
+        : name(name), pyName(NULL), next(0)
+    {
+        memset(entries, 0, sizeof(entries));
+    }
+
+    PyObject *call(PyObject **args, size_t nargs);
+
+private:
+    enum { SIZE = 4 };
+
+    const char *name;
+    PyObject *pyName;
+    struct entry {
+        PyTypeObject *type;
+        unsigned int version;
+        PyObject *function;
+    } entries[SIZE];
+    int next;
+
+    PyObject *lookup(PyObject *self);
+};
+
+#if PY_VERSION_HEX >= 0x03070000
+
+/* The overload of a METH_FASTCALL method last chosen for a combination of
+ * argument types. Only arguments of types for which parseArgs() matches
+ * overloads regardless of their values, int, float, bool, None, and str
+ * or bytes telling single characters apart, are cached, the others, Java
+ * objects and sequences among them, always go through all overloads.
+ * get() returns -1 when nothing is cached for the arguments. Must be
+ * called with the GIL.
+ */
+class OverloadCache {
+public:
+    OverloadCache() : count(0), next(0)
+    {
+    }
+
+    int get(PyObject *const *args, Py_ssize_t nargs);
+    void put(PyObject *const *args, Py_ssize_t nargs, int overload);
+
+private:
+    enum { SIZE = 4, MAXARGS = 4 };
+
+    struct entry {
+        Py_ssize_t nargs;
+        PyTypeObject *types[MAXARGS];
+        int overload;
+    } entries[SIZE];
+    int count, next;
+
+    static bool key(PyObject *const *args, Py_ssize_t nargs,
+                    PyTypeObject **types);
+};
+
+#endif
+
 #if defined(_MSC_VER) || defined(__SUNPRO_CC)
 
 #define parseArgs __parseArgs
@@ -47,6 +126,11 @@ int __parseArg(PyObject *arg, char *types, ...);
 int _parseArgs(PyObject **args, unsigned int count, char *types,
 	       va_list list, va_list check);
 
+#if PY_VERSION_HEX >= 0x03070000
+#define parseFastArgs __parseFastArgs
+int __parseFastArgs(PyObject *const *args, Py_ssize_t nargs, char *types, ...);
+#endif
+
 #else
 
 #define parseArgs(args, types, rest...) \
@@ -56,6 +140,9 @@ int _parseArgs(PyObject **args, unsigned int count, char *types,
 #define parseArg(arg, types, rest...) \
     _parseArgs(&(arg), 1, types, ##rest)
 
+#define parseFastArgs(args, nargs, types, rest...) \
+    _parseArgs((PyObject **) (args), (unsigned int) (nargs), types, ##rest)
+
 int _parseArgs(PyObject **args, unsigned int count, char *types, ...);
 
 #endif
@@ -96,6 +183,7 @@ PyObject *make_descriptor(getclassfn initializeClass, int generics);
 PyObject *make_descriptor(PyObject *value);
 PyObject *make_descriptor(PyObject *(*wrapfn)(const jobject &));
 PyObject *make_descriptor(boxfn fn);
+PyObject *make_descriptor(resolvefn fn, const char *name);
 PyObject *make_descriptor(jboolean value);
 PyObject *make_descriptor(jbyte value);
 PyObject *make_descriptor(jchar value);
@@ -111,6 +199,12 @@ PyObject *callSuper(PyTypeObject *type,
                     const char *name, PyObject *args, int cardinality);
 PyObject *callSuper(PyTypeObject *type, PyObject *self,
                     const char *name, PyObject *args, int cardinality);
+#if PY_VERSION_HEX >= 0x03070000
+PyObject *callSuper(PyTypeObject *type, const char *name,
+                    PyObject *const *args, Py_ssize_t nargs, int cardinality);
+PyObject *callSuper(PyTypeObject *type, PyObject *self, const char *name,
+                    PyObject *const *args, Py_ssize_t nargs, int cardinality);
+#endif
 
 template<class T> PyObject *get_iterator(T *self)
 {
@@ -257,7 +351,7 @@ template<class T, class U, class V> PyObject *get_generic_next(T *self)
 
     PyTypeObject *param = self->parameters[0];
     if (param != NULL)
-        return wrapType(param, next.this$);
+        return wrapType(param, env->newLocalRef(next.this$));
 
     return U::wrap_Object(next);
 }
@@ -269,6 +363,11 @@ PyObject *get_extension_nextElement(PyObject *self);
 
 jobjectArray fromPySequence(jclass cls, PyObject *sequence);
 jobjectArray fromPySequence(jclass cls, PyObject **args, int length);
+PyObject *fromJObjectArray(jobjectArray array, Py_ssize_t lo, Py_ssize_t hi,
+                           PyObject *(*wrapfn)(const jobject&));
+PyObject *fromJStringArray(jobjectArray array, Py_ssize_t lo, Py_ssize_t hi);
+jobjectArray toJStringArray(jclass cls, PyObject *sequence);
+jobjectArray toJStringArray(jclass cls, PyObject **items, Py_ssize_t length);
 PyObject *castCheck(PyObject *obj, getclassfn initializeClass,
                     int reportError);
 PyTypeObject *makeType(PyType_Def *def);
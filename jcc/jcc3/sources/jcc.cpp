@@ -48,6 +48,8 @@ static PyObject *t_jccenv_isShared(PyObject *self);
 static PyObject *t_jccenv_strhash(PyObject *self, PyObject *arg);
 static PyObject *t_jccenv__dumpRefs(PyObject *self,
                                     PyObject *args, PyObject *kwds);
+static PyObject *t_jccenv__refStats(PyObject *self);
+static PyObject *t_jccenv__stringCacheStats(PyObject *self);
 static PyObject *t_jccenv__addClassPath(PyObject *self, PyObject *args);
 
 static PyObject *t_jccenv__get_jni_version(PyObject *self, void *data);
@@ -78,6 +80,10 @@ static PyMethodDef t_jccenv_methods[] = {
       METH_O, NULL },
     { "_dumpRefs", (PyCFunction) t_jccenv__dumpRefs,
       METH_VARARGS | METH_KEYWORDS, NULL },
+    { "_refStats", (PyCFunction) t_jccenv__refStats,
+      METH_NOARGS, NULL },
+    { "_stringCacheStats", (PyCFunction) t_jccenv__stringCacheStats,
+      METH_NOARGS, NULL },
     { "_addClassPath", (PyCFunction) t_jccenv__addClassPath,
       METH_VARARGS, NULL },
     { NULL, NULL, 0, NULL }
@@ -229,53 +235,92 @@ static PyObject *t_jccenv__dumpRefs(PyObject *self,
                                      &classes, &values))
         return NULL;
 
+    size_t size = 0;
+
+    for (int i = 0; i < JCC_REFS_SHARDS; i++)
+        size += env->refs[i].refs.size();
+
     if (classes)
         result = PyDict_New();
     else
-        result = PyList_New(env->refs.size());
+        result = PyList_New(size);
 
     int count = 0;
 
-    for (std::multimap<int, countedRef>::iterator iter = env->refs.begin();
-         iter != env->refs.end();
-         iter++) {
-        if (classes)  // return dict of { class name: instance count }
-        {
-            PyObject *key = env->getClassName(iter->second.global);
-            PyObject *value = PyDict_GetItem(result, key);
-
-            if (value == NULL)
-                value = PyLong_FromLong(1);
-            else
-                value = PyLong_FromLong(PyLong_AsLong(value) + 1);
+    for (int i = 0; i < JCC_REFS_SHARDS; i++) {
+        std::multimap<int, countedRef> &refs = env->refs[i].refs;
 
-            PyDict_SetItem(result, key, value);
-            Py_DECREF(key);
-            Py_DECREF(value);
-        }
-        else if (values)  // return list of (value string, ref count)
-        {
-            PyObject *key = env->toPyUnicode(iter->second.global);
-            PyObject *value = PyLong_FromLong(iter->second.count);
+        for (std::multimap<int, countedRef>::iterator iter = refs.begin();
+             iter != refs.end();
+             iter++) {
+            if (classes)  // return dict of { class name: instance count }
+            {
+                PyObject *key = env->getClassName(iter->second.global);
+                PyObject *value = PyDict_GetItem(result, key);
 
-            PyList_SET_ITEM(result, count++, PyTuple_Pack(2, key, value));
-            Py_DECREF(key);
-            Py_DECREF(value);
-        }
-        else  // return list of (id hash code, ref count)
-        {
-            PyObject *key = PyLong_FromLong(iter->first);
-            PyObject *value = PyLong_FromLong(iter->second.count);
+                if (value == NULL)
+                    value = PyLong_FromLong(1);
+                else
+                    value = PyLong_FromLong(PyLong_AsLong(value) + 1);
 
-            PyList_SET_ITEM(result, count++, PyTuple_Pack(2, key, value));
-            Py_DECREF(key);
-            Py_DECREF(value);
+                PyDict_SetItem(result, key, value);
+                Py_DECREF(key);
+                Py_DECREF(value);
+            }
+            else if (values)  // return list of (value string, ref count)
+            {
+                PyObject *key = env->toPyUnicode(iter->second.global);
+                PyObject *value = PyLong_FromLong(iter->second.count);
+
+                PyList_SET_ITEM(result, count++, PyTuple_Pack(2, key, value));
+                Py_DECREF(key);
+                Py_DECREF(value);
+            }
+            else  // return list of (id hash code, ref count)
+            {
+                PyObject *key = PyLong_FromLong(iter->first);
+                PyObject *value = PyLong_FromLong(iter->second.count);
+
+                PyList_SET_ITEM(result, count++, PyTuple_Pack(2, key, value));
+                Py_DECREF(key);
+                Py_DECREF(value);
+            }
         }
     }
 
     return result;
 }
 
+static PyObject *t_jccenv__refStats(PyObject *self)
+{
+    int64_t count, locks, waits, waitTime;
+
+    env->getRefStats(&count, &locks, &waits, &waitTime);
+
+    return Py_BuildValue("{sisLsLsLsL}",
+                         "shards", (int) JCC_REFS_SHARDS,
+                         "refs", (long long) count,
+                         "locks", (long long) locks,
+                         "waits", (long long) waits,
+                         "waitTime", (long long) waitTime);
+}
+
+static PyObject *t_jccenv__stringCacheStats(PyObject *self)
+{
+    stringCache *strings = env->strings;
+
+    if (strings == NULL)
+        Py_RETURN_NONE;
+
+    return Py_BuildValue("{snsnsLsLsLsL}",
+                         "capacity", (Py_ssize_t) strings->capacity,
+                         "size", (Py_ssize_t) strings->lru.size(),
+                         "toJavaHits", (long long) strings->toJavaHits,
+                         "toJavaMisses", (long long) strings->toJavaMisses,
+                         "toPythonHits", (long long) strings->toPythonHits,
+                         "toPythonMisses", (long long) strings->toPythonMisses);
+}
+
 static PyObject *t_jccenv__addClassPath(PyObject *self, PyObject *args)
 {
     const char *classpath;
@@ -360,16 +405,17 @@ _DLL_EXPORT PyObject *initVM(PyObject *self, PyObject *args, PyObject *kwds)
 {
     static char *kwnames[] = {
         "classpath", "initialheap", "maxheap", "maxstack",
-        "vmargs", NULL
+        "vmargs", "stringCache", NULL
     };
     const char *classpath = NULL;
     char *initialheap = NULL, *maxheap = NULL, *maxstack = NULL;
     PyObject *vmargs = NULL;
+    int cacheSize = -1;
 
-    if (!PyArg_ParseTupleAndKeywords(args, kwds, "|zzzzO", kwnames,
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "|zzzzOi", kwnames,
                                      &classpath,
                                      &initialheap, &maxheap, &maxstack,
-                                     &vmargs))
+                                     &vmargs, &cacheSize))
         return NULL;
 
     if (env->vm)
@@ -395,6 +441,9 @@ _DLL_EXPORT PyObject *initVM(PyObject *self, PyObject *args, PyObject *kwds)
 
         Py_XDECREF(module_cp);
 
+        if (cacheSize >= 0)
+            env->setStringCache(cacheSize);
+
         return getVMEnv(self);
     }
     else
@@ -539,6 +588,9 @@ _DLL_EXPORT PyObject *initVM(PyObject *self, PyObject *args, PyObject *kwds)
         for (unsigned int i = 0; i < nOptions; i++)
             free(vm_options[i].optionString);
 
+        if (cacheSize >= 0)
+            env->setStringCache(cacheSize);
+
         t_jccenv *jccenv = (t_jccenv *) PY_TYPE(JCCEnv)->tp_alloc(PY_TYPE(JCCEnv), 0);
         jccenv->env = env;
 
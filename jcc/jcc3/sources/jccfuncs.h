@@ -22,6 +22,8 @@ PyObject *initVM(PyObject *self, PyObject *args, PyObject *kwds);
 PyObject *getVMEnv(PyObject *self);
 PyObject *_set_exception_types(PyObject *self, PyObject *args);
 PyObject *_set_function_self(PyObject *self, PyObject *args);
+PyObject *_push_local_frame(PyObject *self, PyObject *args);
+PyObject *_pop_local_frame(PyObject *self, PyObject *args);
 PyObject *findClass(PyObject *self, PyObject *args);
 PyObject *makeInterface(PyObject *self, PyObject *args);
 PyObject *makeClass(PyObject *self, PyObject *args);
@@ -42,6 +44,10 @@ PyMethodDef jcc_funcs[] = {
       METH_VARARGS, NULL },
     { "_set_function_self", (PyCFunction) _set_function_self,
       METH_VARARGS, NULL },
+    { "_push_local_frame", (PyCFunction) _push_local_frame,
+      METH_VARARGS, NULL },
+    { "_pop_local_frame", (PyCFunction) _pop_local_frame,
+      METH_VARARGS, NULL },
     { "JArray", (PyCFunction) JArray_Type,
       METH_O, NULL },
     { NULL, NULL, 0, NULL }
@@ -91,8 +91,7 @@ PyObject *t_name::wrap_Object(const javaClass& object)                  \
 {                                                                       \
     if (!!object)                                                       \
     {                                                                   \
-        t_name *self = (t_name *)                                       \
-            PyType_GenericAlloc(PY_TYPE(name), 0);                      \
+        t_name *self = (t_name *) allocJObject(PY_TYPE(name));          \
         if (self)                                                       \
             self->object = object;                                      \
         return (PyObject *) self;                                       \
@@ -109,8 +108,7 @@ PyObject *t_name::wrap_jobject(const jobject& object)                   \
                             (PyObject *) PY_TYPE(name));                \
             return NULL;                                                \
         }                                                               \
-        t_name *self = (t_name *)                                       \
-            PyType_GenericAlloc(PY_TYPE(name), 0);                      \
+        t_name *self = (t_name *) allocJObject(PY_TYPE(name));          \
         if (self)                                                       \
             self->object = javaClass(object);                           \
         return (PyObject *) self;                                       \
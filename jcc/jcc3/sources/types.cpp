@@ -277,6 +277,10 @@ public:
     union {
         PyObject *value;
         getclassfn initializeClass;
+        struct {
+            resolvefn fn;
+            PyObject *name;
+        } resolve;
     } access;
 };
 
@@ -284,6 +288,7 @@ public:
 #define DESCRIPTOR_CLASS   0x0002
 #define DESCRIPTOR_GETFN   0x0004
 #define DESCRIPTOR_GENERIC 0x0008
+#define DESCRIPTOR_LAZY    0x0010
 
 static void t_descriptor_dealloc(t_descriptor *self);
 static PyObject *t_descriptor___get__(t_descriptor *self,
@@ -342,6 +347,10 @@ static void t_descriptor_dealloc(t_descriptor *self)
     {
         Py_DECREF(self->access.value);
     }
+    else if (self->flags & DESCRIPTOR_LAZY)
+    {
+        Py_DECREF(self->access.resolve.name);
+    }
     self->ob_base.ob_type->tp_free((PyObject *) self);
 }
 
@@ -412,6 +421,25 @@ PyObject *make_descriptor(boxfn fn)
     return make_descriptor(PyCapsule_New((void *) fn, "boxfn", NULL));
 }
 
+/* A placeholder for a static field of a class wrapped with --lazy: the first
+ * access resolves the class, which replaces all such placeholders with the
+ * actual field values, and then looks the field up again.
+ */
+PyObject *make_descriptor(resolvefn fn, const char *name)
+{
+    t_descriptor *self = (t_descriptor *)
+        PY_TYPE(ConstVariableDescriptor)->tp_alloc(PY_TYPE(ConstVariableDescriptor), 0);
+
+    if (self)
+    {
+        self->access.resolve.fn = fn;
+        self->access.resolve.name = PyUnicode_FromString(name);
+        self->flags = DESCRIPTOR_LAZY;
+    }
+
+    return (PyObject *) self;
+}
+
 PyObject *make_descriptor(jboolean b)
 {
     t_descriptor *self = (t_descriptor *)
@@ -536,12 +564,38 @@ static PyObject *t_descriptor___get__(t_descriptor *self,
 
     if (self->flags & DESCRIPTOR_CLASS)
     {
+        /* the class's reference belongs to its class$ */
+        jclass cls = env->getClass(self->access.initializeClass);
+
 #ifdef _java_generics
         if (self->flags & DESCRIPTOR_GENERIC)
-            return t_Class::wrap_Object(Class(env->getClass(self->access.initializeClass)), (PyTypeObject *) type);
+            return t_Class::wrap_Object(Class(env->newLocalRef(cls)), (PyTypeObject *) type);
         else
 #endif
-            return t_Class::wrap_Object(Class(env->getClass(self->access.initializeClass)));
+            return t_Class::wrap_Object(Class(env->newLocalRef(cls)));
+    }
+
+    if (self->flags & DESCRIPTOR_LAZY)
+    {
+        PyObject *name = self->access.resolve.name;
+
+        Py_INCREF(name);  // self is released when its slot is replaced
+        try {
+            (*self->access.resolve.fn)();
+        } catch (int e) {
+            Py_DECREF(name);
+            switch (e) {
+              case _EXC_JAVA:
+                return PyErr_SetJavaError();
+              default:
+                return NULL;
+            }
+        }
+
+        PyObject *value = PyObject_GetAttr(type != NULL ? type : (PyObject *) Py_TYPE(obj), name);
+
+        Py_DECREF(name);
+        return value;
     }
 
     Py_RETURN_NONE;
@@ -38,31 +38,24 @@
 
 from icu import Normalizer2, UNormalizationMode2, UNormalizationCheckResult
 
-from org.apache.lucene.analysis.tokenattributes import CharTermAttribute
-from org.apache.pylucene.analysis import PythonTokenFilter
+from org.apache.pylucene.analysis import PythonBatchTokenFilter
 
 
-class ICUNormalizer2Filter(PythonTokenFilter):
+class ICUNormalizer2Filter(PythonBatchTokenFilter):
 
     def __init__(self, input, normalizer=None):
         super(ICUNormalizer2Filter, self).__init__(input)
 
-        self.input = input
-        self.termAtt = self.addAttribute(CharTermAttribute.class_);
-
         if normalizer is None:
             normalizer = Normalizer2.getInstance(None, "nfkc_cf", UNormalizationMode2.COMPOSE)
         self.normalizer = normalizer
 
-    def incrementToken(self):
-
-        if self.input.incrementToken():
-            text = self.termAtt.toString()
-
-            if self.normalizer.quickCheck(text) != UNormalizationCheckResult.YES:
-                self.termAtt.setEmpty()
-                self.termAtt.append(self.normalizer.normalize(text))
+    def filterBatch(self, terms, positionIncrements, startOffsets, endOffsets,
+                    count):
 
-            return True
+        normalizer = self.normalizer
+        YES = UNormalizationCheckResult.YES
 
-        return False
+        return [text if normalizer.quickCheck(text) == YES
+                else normalizer.normalize(text)
+                for text in terms[:count]]
@@ -39,12 +39,11 @@
 #
 # ====================================================================
 
-from org.apache.pylucene.analysis import PythonTokenFilter
-from org.apache.lucene.analysis.tokenattributes import CharTermAttribute
+from org.apache.pylucene.analysis import PythonBatchTokenFilter
 from icu import UTransPosition
 
 
-class ICUTransformFilter(PythonTokenFilter):
+class ICUTransformFilter(PythonBatchTokenFilter):
 
     # Create a new ICUTransformFilter that transforms text on the given
     # stream.
@@ -58,29 +57,24 @@ class ICUTransformFilter(PythonTokenFilter):
 
         # Reusable position object
         self.position = UTransPosition()
-
-        # term attribute, will be updated with transformed text.
-        self.termAtt = self.addAttribute(CharTermAttribute.class_)
-
-        self.input = input
         self.transform = transform
 
-    def incrementToken(self):
+    def filterBatch(self, terms, positionIncrements, startOffsets, endOffsets,
+                    count):
 
-        if self.input.incrementToken():
-            text = self.termAtt.toString()
-            length = len(text)
+        position = self.position
+        transform = self.transform
+        result = []
 
-            self.position.start = 0
-            self.position.limit = length
-            self.position.contextStart = 0
-            self.position.contextLimit = length
+        for text in terms[:count]:
+            length = len(text)
 
-            text = self.transform.filteredTransliterate(text, self.position,
-                                                        False)
-            self.termAtt.setEmpty()
-            self.termAtt.append(text)
+            position.start = 0
+            position.limit = length
+            position.contextStart = 0
+            position.contextLimit = length
 
-            return True
+            result.append(transform.filteredTransliterate(text, position,
+                                                          False))
 
-        return False
+        return result
@@ -0,0 +1,124 @@
+# ====================================================================
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+# ====================================================================
+#
+#  Bulk indexing with Java threads: Python only collects field values,
+#  documents are built, analyzed and added to the index writer by the Java
+#  worker threads of an org.apache.pylucene.index.IndexingPipeline, outside
+#  of the GIL.
+#
+#  Usage:
+#
+#    from lucene.IndexingPipeline import IndexingPipeline
+#
+#    schema = [("name", StringField.TYPE_STORED),
+#              ("contents", TextField.TYPE_NOT_STORED)]
+#
+#    with IndexingPipeline(writer, schema, threads=4) as pipeline:
+#        for path in paths:
+#            pipeline.add({"name": path, "contents": read(path)})
+#    writer.commit()
+#
+
+import os
+
+from org.apache.pylucene.index import \
+    IndexingPipeline as JavaIndexingPipeline
+
+
+class IndexingPipeline(object):
+    """
+    Queues documents, given as dicts or tuples of field values, for Java
+    threads to index.
+
+    The schema is a sequence of (field name, FieldType) pairs, tuples give
+    their values in that order. Values are converted to str, None or a
+    missing dict key omits the field. Documents are queued batchSize at a
+    time, add() waits while queueSize batches are waiting to be indexed.
+    """
+
+    def __init__(self, writer, schema, threads=None, batchSize=256,
+                 queueSize=None):
+
+        if threads is None:
+            threads = os.cpu_count() or 1
+        if queueSize is None:
+            queueSize = threads * 2
+
+        self.fields = [name for name, type in schema]
+        self.batchSize = batchSize
+
+        self._pipeline = JavaIndexingPipeline(writer, self.fields,
+                                              [type for name, type in schema],
+                                              threads, queueSize)
+        self._values = []
+        self._count = 0
+
+    def add(self, document):
+
+        if isinstance(document, dict):
+            values = [document.get(name) for name in self.fields]
+        elif len(document) != len(self.fields):
+            raise ValueError("expected %d values, got %d"
+                             %(len(self.fields), len(document)))
+        else:
+            values = document
+
+        self._values.extend(value if value is None or type(value) is str
+                            else str(value)
+                            for value in values)
+        self._count += 1
+
+        if self._count == self.batchSize:
+            self.flush()
+
+    def addAll(self, documents):
+
+        for document in documents:
+            self.add(document)
+
+    def flush(self):
+        """
+        Queues the documents added since the last batch was queued.
+        """
+
+        if self._count:
+            values = self._values
+            self._values = []
+            self._count = 0
+            self._pipeline.add(values)
+
+    def close(self):
+        """
+        Waits for all documents to be indexed, the writer isn't closed.
+        Documents not yet queued when a worker failed are dropped.
+        """
+
+        try:
+            self.flush()
+        finally:
+            self._pipeline.close()
+
+    @property
+    def count(self):
+        """
+        The number of documents indexed so far.
+        """
+
+        return self._pipeline.getCount()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,174 @@
+# ====================================================================
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+# ====================================================================
+#
+#  A read-only Directory implemented in Python that serves its inputs from
+#  memory-mapped files.
+#
+#  Inputs, their clones and their slices all share the same mapping and
+#  only differ by the offset and length of the region they read, bytes are
+#  copied once, from the mapping straight into the input's Java buffer.
+#  The mapping is released once the input returned by openInput() is
+#  closed and none of its clones or slices are referenced anymore.
+#
+#  To serve other storage, encrypted or overlay files for example, override
+#  map(name) to return any object supporting the buffer protocol.
+#
+#  Usage:
+#
+#    from lucene.MMapPythonDirectory import MMapPythonDirectory
+#    reader = DirectoryReader.open(MMapPythonDirectory(path))
+#
+
+import os, mmap
+from lucene import JavaError
+
+from java.io import FileNotFoundException
+from java.lang import \
+    IllegalArgumentException, UnsupportedOperationException
+from org.apache.lucene.store import NoLockFactory
+from org.apache.pylucene.store import PythonDirectory, PythonSliceableIndexInput
+
+
+class MMapping(object):
+    """
+    The contents of a file, as returned by MMapPythonDirectory.map(), shared
+    by the inputs reading it. It is released when the last of them lets go
+    of it.
+    """
+
+    def __init__(self, data):
+        self.data = data
+        self.view = memoryview(data).cast('B')
+
+    def __len__(self):
+        return len(self.view)
+
+    def __del__(self):
+        self.view.release()
+        if hasattr(self.data, 'close'):
+            self.data.close()
+
+
+class MMapPythonIndexInput(PythonSliceableIndexInput):
+    """
+    An IndexInput reading the region of an MMapping that starts at offset
+    and is length bytes long.
+    """
+
+    def __init__(self, name, mapping, offset, length, bufferSize,
+                 clone=False):
+        if not clone:
+            super(MMapPythonIndexInput, self).__init__(name, bufferSize)
+        self.name = name
+        self.mapping = mapping
+        self.offset = offset
+        self._length = length
+        self.bufferSize = bufferSize
+
+    def length(self):
+        return self._length
+
+    def clone(self):
+        clone = MMapPythonIndexInput(self.name, self.mapping,
+                                     self.offset, self._length,
+                                     self.bufferSize, clone=True)
+        return super(MMapPythonIndexInput, self).clone(clone)
+
+    def slice(self, sliceDescription, offset, length):
+        if offset < 0 or length < 0 or offset + length > self._length:
+            raise JavaError(IllegalArgumentException("slice() %s out of bounds: offset=%d, length=%d, fileLength=%d: %s" %(sliceDescription, offset, length, self._length, self.name)))
+
+        return MMapPythonIndexInput("%s [slice=%s]" %(self.name,
+                                                      sliceDescription),
+                                    self.mapping, self.offset + offset, length,
+                                    self.bufferSize)
+
+    def close(self):
+        # the mapping is shared with this input's clones and slices, which
+        # remain usable, it is released once none of them refer to it
+        self.mapping = None
+
+    def readInto(self, b, offset, length, pos):
+        start = self.offset + pos
+        count = min(length, self._length - pos)
+        if count <= 0:
+            return 0
+
+        with memoryview(b) as view:
+            view[offset:offset + count] = \
+                self.mapping.view[start:start + count]
+
+        return count
+
+    def seekInternal(self, pos):
+        pass
+
+
+class MMapPythonDirectory(PythonDirectory):
+    """
+    A read-only Directory over the files in path, opened with mmap.
+    """
+
+    def __init__(self, path):
+        super(MMapPythonDirectory, self).__init__()
+        self.path = path
+
+    def __repr__(self):
+        return "%s(%s)" %(type(self).__name__, self.path)
+
+    def map(self, name):
+        """
+        Returns an object supporting the buffer protocol holding the
+        contents of file name. If it has a close() method, it is called
+        once the input opened on it, its clones and its slices are all
+        closed or no longer referenced.
+        """
+
+        with open(os.path.join(self.path, name), 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return b''  # empty files cannot be mapped
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def openInput(self, name, context):
+        try:
+            data = self.map(name)
+        except (IOError, OSError):
+            raise JavaError(FileNotFoundException(name))
+
+        mapping = MMapping(data)
+        return MMapPythonIndexInput("%s(path=\"%s\")" %(type(self).__name__,
+                                                         os.path.join(self.path, name)),
+                                    mapping, 0, len(mapping),
+                                    self.getBufferSize(context))
+
+    def fileLength(self, name):
+        try:
+            return os.path.getsize(os.path.join(self.path, name))
+        except (IOError, OSError):
+            raise JavaError(FileNotFoundException(name))
+
+    def listAll(self):
+        return sorted(os.listdir(self.path))
+
+    def obtainLock(self, name):
+        return NoLockFactory.INSTANCE.obtainLock(self, name)
+
+    def close(self):
+        pass
+
+    def _readOnly(self, *args):
+        raise JavaError(UnsupportedOperationException("%s is read-only" %(self)))
+
+    createOutput = createTempOutput = deleteFile = rename = _readOnly
+    sync = syncMetaData = _readOnly
@@ -0,0 +1,125 @@
+# ====================================================================
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+# ====================================================================
+#
+#  A concurrent.futures.ThreadPoolExecutor whose worker threads are
+#  attached to the Java VM once, when they start, as daemon threads named
+#  after the Python worker thread, and detached when they exit. Workers are
+#  reused for the life of the executor so tasks never pay for
+#  attachCurrentThread() themselves and never fail with
+#  'attachCurrentThread() must be called first'.
+#
+#  Usage:
+#
+#    from lucene.ThreadPoolExecutor import ThreadPoolExecutor
+#
+#    with ThreadPoolExecutor(4, 'searcher') as executor:
+#        hits = executor.map(lambda q: searcher.search(q, 10), queries)
+#    print(executor.stats())
+#
+
+import threading, time, weakref
+from concurrent import futures
+from concurrent.futures import thread
+from lucene import getVMEnv
+
+
+def _worker(*args):
+
+    try:
+        thread._worker(*args)
+    finally:
+        env = getVMEnv()
+        if env.isCurrentThreadAttached():
+            env.detachCurrentThread()
+
+
+class ThreadPoolExecutor(futures.ThreadPoolExecutor):
+    """
+    A thread pool executor for running Lucene calls on attached threads.
+
+    An initializer, as accepted by concurrent.futures, is called after the
+    worker thread is attached. stats() returns the number of attached
+    worker threads and their attach latency, in seconds.
+    """
+
+    def __init__(self, max_workers=None, thread_name_prefix='lucene',
+                 initializer=None, initargs=()):
+
+        self._env = getVMEnv()
+        if self._env is None:
+            raise ValueError("initVM() must be called first")
+
+        self._lock = threading.Lock()
+        self._attached = 0
+        self._attachTime = 0.0
+        self._maxAttachTime = 0.0
+        self._userInitializer = initializer
+
+        super(ThreadPoolExecutor, self).__init__(max_workers,
+                                                 thread_name_prefix,
+                                                 self._initializer, initargs)
+
+    def _initializer(self, *args):
+
+        start = time.perf_counter()
+        self._env.attachCurrentThread(threading.current_thread().name, True)
+        elapsed = time.perf_counter() - start
+
+        with self._lock:
+            self._attached += 1
+            self._attachTime += elapsed
+            self._maxAttachTime = max(self._maxAttachTime, elapsed)
+
+        if self._userInitializer is not None:
+            self._userInitializer(*args)
+
+    def _adjust_thread_count(self):
+
+        # as concurrent.futures does, with workers detaching when they exit
+        if self._idle_semaphore.acquire(timeout=0):
+            return
+
+        def weakref_cb(_, q=self._work_queue):
+            q.put(None)
+
+        num_threads = len(self._threads)
+        if num_threads < self._max_workers:
+            thread_name = '%s_%d' %(self._thread_name_prefix or self,
+                                    num_threads)
+            if hasattr(self, '_create_worker_context'):  # Python 3.14
+                args = (weakref.ref(self, weakref_cb),
+                        self._create_worker_context(), self._work_queue)
+            else:
+                args = (weakref.ref(self, weakref_cb), self._work_queue,
+                        self._initializer, self._initargs)
+            t = threading.Thread(name=thread_name, target=_worker, args=args)
+            t.start()
+            self._threads.add(t)
+            thread._threads_queues[t] = self._work_queue
+
+    def stats(self):
+        """
+        Returns a dict with the number of worker threads attached so far
+        and the total, mean and maximum time their attachCurrentThread()
+        calls took.
+        """
+
+        with self._lock:
+            threads = self._attached
+            return {
+                'threads': threads,
+                'attachTime': self._attachTime,
+                'meanAttachTime': threads and self._attachTime / threads,
+                'maxAttachTime': self._maxAttachTime,
+            }
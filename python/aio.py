@@ -0,0 +1,145 @@
+# ====================================================================
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+# ====================================================================
+#
+#  asyncio support for blocking Lucene calls.
+#
+#  Calls are run on a bounded lucene.ThreadPoolExecutor, whose workers are
+#  attached to the Java VM, and return awaitables. The generated wrappers
+#  release the GIL for the duration of every call into Java so several
+#  searches really do run concurrently.
+#
+#  Cancelling the awaiting task interrupts the worker's Java thread with
+#  Thread.interrupt(). Lucene only reacts to interrupts in some places, in
+#  blocking I/O for example, where an interrupt closes NIO channels: avoid
+#  cancelling calls reading from an NIOFSDirectory.
+#
+#  Usage:
+#
+#    from lucene import aio
+#
+#    topDocs = await aio.search(searcher, query, 10)
+#    await aio.commit(writer)
+#
+
+import asyncio, os, threading
+from lucene import getVMEnv
+from lucene.ThreadPoolExecutor import ThreadPoolExecutor
+
+from java.lang import Thread
+from org.apache.lucene.index import DirectoryReader
+
+_executor = None
+_executorLock = threading.Lock()
+
+
+def getExecutor():
+    """
+    Returns the executor used when none is passed to run(), creating a
+    ThreadPoolExecutor with as many workers as there are CPUs, at most 32,
+    on first use.
+    """
+
+    global _executor
+
+    with _executorLock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(min(32, os.cpu_count() or 1),
+                                           'lucene-aio')
+        return _executor
+
+
+def setExecutor(executor):
+    """
+    Sets the executor used when none is passed to run(), its worker
+    threads must be attached to the Java VM.
+    """
+
+    global _executor
+
+    with _executorLock:
+        _executor = executor
+
+
+class _Call(object):
+
+    def __init__(self, fn, args):
+        self.fn = fn
+        self.args = args
+        self.thread = None
+        self.cancelled = False
+        self.lock = threading.Lock()
+
+    def __call__(self):
+        with self.lock:
+            if self.cancelled:
+                raise asyncio.CancelledError()
+            self.thread = Thread.currentThread()
+        try:
+            return self.fn(*self.args)
+        finally:
+            with self.lock:
+                self.thread = None
+            # don't leave the interrupt flag set for the next call
+            Thread.interrupted()
+
+    def interrupt(self):
+        with self.lock:
+            self.cancelled = True
+            if self.thread is not None:
+                env = getVMEnv()
+                if not env.isCurrentThreadAttached():
+                    env.attachCurrentThread()
+                self.thread.interrupt()
+
+
+async def run(fn, *args, executor=None):
+    """
+    Returns the result of fn(*args), called on executor or, by default,
+    on the executor returned by getExecutor().
+    """
+
+    call = _Call(fn, args)
+    loop = asyncio.get_running_loop()
+    future = loop.run_in_executor(executor or getExecutor(), call)
+
+    try:
+        return await future
+    except asyncio.CancelledError:
+        call.interrupt()
+        raise
+
+
+def search(searcher, *args, executor=None):
+    """
+    Awaitable IndexSearcher.search(*args).
+    """
+
+    return run(searcher.search, *args, executor=executor)
+
+
+def commit(writer, executor=None):
+    """
+    Awaitable IndexWriter.commit().
+    """
+
+    return run(writer.commit, executor=executor)
+
+
+def openIfChanged(reader, *args, executor=None):
+    """
+    Awaitable DirectoryReader.openIfChanged(reader, *args).
+    """
+
+    return run(DirectoryReader.openIfChanged, reader, *args,
+               executor=executor)
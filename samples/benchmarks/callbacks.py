@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+
+"""
+Reports the throughput of Java calling into Python extension methods, the
+per-hit callbacks of a PythonSimpleCollector and of a PythonSimilarity
+scorer. Run it against PyLucene built with JCC before and after a change
+to the generated callbacks to compare them:
+
+    python samples/benchmarks/callbacks.py [docs] [seconds]
+
+The collector and scorer do nothing but return, the time measured is the
+one of crossing from Java into Python and back.
+"""
+
+import sys, time, lucene
+
+from org.apache.lucene.analysis.core import WhitespaceAnalyzer
+from org.apache.lucene.document import Document, Field, StringField
+from org.apache.lucene.index import \
+    DirectoryReader, IndexWriter, IndexWriterConfig, Term
+from org.apache.lucene.search import \
+    IndexSearcher, MatchAllDocsQuery, TermQuery
+from org.apache.lucene.search.similarities import BM25Similarity
+from org.apache.lucene.store import RAMDirectory
+from org.apache.pylucene.search import PythonSimpleCollector
+from org.apache.pylucene.search.similarities import PythonSimilarity
+
+
+class Collector(PythonSimpleCollector):
+
+    def collect(self, doc, score):
+        pass
+
+    def doSetNextReader(self, context):
+        pass
+
+    def needsScores(self):
+        return False
+
+
+class Similarity(PythonSimilarity):
+
+    def __init__(self):
+        super(Similarity, self).__init__()
+        self.sim = BM25Similarity()
+
+    def computeNorm(self, state):
+        return self.sim.computeNorm(state)
+
+    def computeWeight(self, boost, collectionStats, termStats):
+        return self.sim.computeWeight(boost, collectionStats, termStats)
+
+    def simScorer(self, stats, context):
+
+        class _scorer(PythonSimilarity.PythonSimScorer):
+            def score(_self, doc, freq):
+                return freq
+
+        return _scorer()
+
+
+def run(fn, calls, seconds):
+
+    count = 0
+    start = time.perf_counter()
+    while True:
+        fn()
+        count += calls
+        elapsed = time.perf_counter() - start
+        if elapsed >= seconds:
+            return count / elapsed
+
+
+def main(docs, seconds):
+
+    lucene.initVM(vmargs=['-Djava.awt.headless=true'])
+
+    directory = RAMDirectory()
+    writer = IndexWriter(directory, IndexWriterConfig(WhitespaceAnalyzer()))
+    for i in range(docs):
+        doc = Document()
+        doc.add(Field("field", "all", StringField.TYPE_NOT_STORED))
+        writer.addDocument(doc)
+    writer.close()
+
+    searcher = IndexSearcher(DirectoryReader.open(directory))
+    collector = Collector()
+    query = MatchAllDocsQuery()
+    print("%-10s %14.0f calls/s" %(
+        'collect', run(lambda: searcher.search(query, collector),
+                       docs, seconds)))
+
+    searcher.setSimilarity(Similarity())
+    query = TermQuery(Term("field", "all"))
+    print("%-10s %14.0f calls/s" %(
+        'score', run(lambda: searcher.search(query, 10), docs, seconds)))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000,
+         float(sys.argv[2]) if len(sys.argv) > 2 else 2.0)
@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+
+"""
+Reports the time it takes to import lucene, to run initVM() and to then run
+a first query. Run it against a PyLucene built with and without the JCC
+--lazy option ('make JCCFLAGS=--lazy install') to compare startup times:
+
+    python samples/benchmarks/startup.py [runs]
+
+Each run happens in a fresh interpreter since initVM() may only be called
+once per process.
+"""
+
+import sys, subprocess
+
+RUN = """
+import time
+t0 = time.perf_counter()
+import lucene
+t1 = time.perf_counter()
+lucene.initVM(vmargs=['-Djava.awt.headless=true'])
+t2 = time.perf_counter()
+
+from org.apache.lucene.analysis.standard import StandardAnalyzer
+from org.apache.lucene.document import Document, Field, TextField
+from org.apache.lucene.index import \\
+    DirectoryReader, IndexWriter, IndexWriterConfig, Term
+from org.apache.lucene.search import IndexSearcher, TermQuery
+from org.apache.lucene.store import RAMDirectory
+
+directory = RAMDirectory()
+writer = IndexWriter(directory, IndexWriterConfig(StandardAnalyzer()))
+doc = Document()
+doc.add(Field("field", "hello world", TextField.TYPE_STORED))
+writer.addDocument(doc)
+writer.close()
+searcher = IndexSearcher(DirectoryReader.open(directory))
+searcher.search(TermQuery(Term("field", "hello")), 10)
+t3 = time.perf_counter()
+
+print(t1 - t0, t2 - t1, t3 - t2)
+"""
+
+
+def main(runs):
+
+    times = []
+    for i in range(runs):
+        output = subprocess.check_output([sys.executable, '-c', RUN])
+        times.append([float(t) for t in output.split()])
+
+    print("best of %d runs:" %(runs))
+    for i, label in enumerate(('import lucene', 'initVM()', 'first query')):
+        print("  %-14s %8.3f s" %(label, min(t[i] for t in times)))
+    print("  %-14s %8.3f s" %('total', min(sum(t) for t in times)))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
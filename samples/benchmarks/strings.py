@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+
+"""
+Reports the throughput of converting Python str objects to Java Strings
+and back, for the different kinds of str, ASCII, Latin-1, UCS-2 and UCS-4,
+and for lengths from short terms to large stored bodies:
+
+    python samples/benchmarks/strings.py [seconds]
+
+str to String is timed through the java.io.StringReader(String)
+constructor, String to str through Document.get() of a stored field, both
+do little beyond passing the String along.
+"""
+
+import sys, time, lucene
+from java.io import StringReader
+from org.apache.lucene.document import Document, StoredField
+
+KINDS = (('ascii', 'abcdefghij'),
+         ('latin-1', 'caf\xe9 na\xefve'),
+         ('ucs-2', 'абвгд €'),
+         ('ucs-4', 'ab\U0001f600cd\U0001f601'))
+LENGTHS = (8, 64, 1024, 65536)
+
+
+def run(fn, arg, seconds):
+
+    count = 0
+    start = time.perf_counter()
+    while True:
+        for i in range(100):
+            fn(arg)
+        count += 100
+        elapsed = time.perf_counter() - start
+        if elapsed >= seconds:
+            return count / elapsed
+
+
+def main(seconds):
+
+    lucene.initVM(vmargs=['-Djava.awt.headless=true'])
+
+    print("%-8s %8s %14s %14s" %('kind', 'length',
+                                 'to Java/s', 'to Python/s'))
+    for kind, chars in KINDS:
+        for length in LENGTHS:
+            text = (chars * (length // len(chars) + 1))[:length]
+            doc = Document()
+            doc.add(StoredField("body", text))
+            toJava = run(StringReader, text, seconds)
+            toPython = run(doc.get, "body", seconds)
+            print("%-8s %8d %14.0f %14.0f" %(kind, length, toJava, toPython))
+
+
+if __name__ == '__main__':
+    main(float(sys.argv[1]) if len(sys.argv) > 1 else 1.0)
@@ -0,0 +1,157 @@
+# ====================================================================
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+# ====================================================================
+
+import sys, lucene, unittest, math
+from PyLuceneTestCase import PyLuceneTestCase
+
+from org.apache.lucene.document import Document, Field, FieldType, TextField
+from org.apache.lucene.index import Term
+from org.apache.lucene.search import \
+    BooleanClause, BooleanQuery, PhraseQuery, TermQuery
+from org.apache.lucene.search.similarities import BM25Similarity
+from org.apache.pylucene.search.similarities import PythonBlockSimilarity
+
+
+class BM25BlockSimilarity(PythonBlockSimilarity):
+    """
+    BM25, as BM25Similarity computes it, a block of documents at a time
+    """
+
+    def __init__(self, blockSize, useNumpy=False, k1=1.2, b=0.75):
+        super(BM25BlockSimilarity, self).__init__(blockSize)
+        self.useNumpy = useNumpy
+        self.k1 = k1
+        self.b = b
+        self.counts = []
+
+    def scoreBlock(self, weight, context, docs, freqs, lengths, scores, count):
+
+        self.counts.append(count)
+
+        stats = weight.collectionStats
+        docCount = stats.docCount()
+        avgdl = stats.sumTotalTermFreq() / docCount
+        idf = sum(math.log(1 + (docCount - termStats.docFreq() + 0.5) /
+                           (termStats.docFreq() + 0.5))
+                  for termStats in weight.termStats)
+        k1, b = self.k1, self.b
+        w = weight.boost * idf * (k1 + 1)
+
+        if self.useNumpy:
+            import numpy
+            f = numpy.asarray(freqs)[:count]
+            l = numpy.asarray(lengths)[:count]
+            norm = numpy.where(l == self.NO_NORMS, k1,
+                               k1 * (1 - b + b * l / avgdl))
+            numpy.asarray(scores)[:count] = w * f / (f + norm)
+        else:
+            for i in range(count):
+                if lengths[i] == self.NO_NORMS:
+                    norm = k1
+                else:
+                    norm = k1 * (1 - b + b * lengths[i] / avgdl)
+                scores[i] = w * freqs[i] / (freqs[i] + norm)
+
+
+class BlockSimilarityTestCase(PyLuceneTestCase):
+
+    def setUp(self):
+        super(BlockSimilarityTestCase, self).setUp()
+
+        noNorms = FieldType(TextField.TYPE_NOT_STORED)
+        noNorms.setOmitNorms(True)
+        noNorms.freeze()
+
+        writer = self.getWriter(maxBufferedDocs=100)
+        for i in range(300):
+            doc = Document()
+            text = ' '.join(["a"] * (i % 7 + 1) + ["b"] * (i % 3) +
+                            ["c"] * (i % 11 + 2))
+            doc.add(Field("field", text, TextField.TYPE_NOT_STORED))
+            doc.add(Field("nonorms", text, noNorms))
+            writer.addDocument(doc)
+        writer.close()
+
+    def assertSameScores(self, query, similarity):
+
+        searcher = self.getSearcher()
+        searcher.setSimilarity(BM25Similarity())
+        expected = searcher.search(query, 300).scoreDocs
+
+        searcher = self.getSearcher()
+        searcher.setSimilarity(similarity)
+        actual = searcher.search(query, 300).scoreDocs
+
+        self.assertEqual(len(expected), len(actual))
+        expected = dict((sd.doc, sd.score) for sd in expected)
+        for sd in actual:
+            self.assertAlmostEqual(expected[sd.doc], sd.score, places=4)
+
+    def testTermQuery(self):
+
+        similarity = BM25BlockSimilarity(32)
+        self.assertSameScores(TermQuery(Term("field", "b")), similarity)
+
+        # 200 docs with b, in 3 leaves, read 32 at a time
+        self.assertEqual(200, sum(similarity.counts))
+        self.assertTrue(len(similarity.counts) <= 3 + 200 // 32)
+        self.assertTrue(all(0 < count <= 32 for count in similarity.counts))
+
+    def testNoNorms(self):
+
+        self.assertSameScores(TermQuery(Term("nonorms", "b")),
+                              BM25BlockSimilarity(32))
+
+    def testBooleanQuery(self):
+
+        builder = BooleanQuery.Builder()
+        builder.add(TermQuery(Term("field", "a")), BooleanClause.Occur.SHOULD)
+        builder.add(TermQuery(Term("field", "b")), BooleanClause.Occur.MUST)
+        self.assertSameScores(builder.build(), BM25BlockSimilarity(16))
+
+    def testPhraseQuery(self):
+
+        builder = PhraseQuery.Builder()
+        builder.add(Term("field", "a"))
+        builder.add(Term("field", "c"))
+        builder.setSlop(2)
+
+        similarity = BM25BlockSimilarity(16)
+        self.assertSameScores(builder.build(), similarity)
+        self.assertTrue(all(count == 1 for count in similarity.counts))
+
+    def testNumpy(self):
+
+        try:
+            import numpy
+        except ImportError:
+            return
+
+        self.assertSameScores(TermQuery(Term("field", "c")),
+                              BM25BlockSimilarity(64, True))
+        self.assertSameScores(TermQuery(Term("nonorms", "c")),
+                              BM25BlockSimilarity(64, True))
+
+
+if __name__ == "__main__":
+    lucene.initVM(vmargs=['-Djava.awt.headless=true'])
+    if '-loop' in sys.argv:
+        sys.argv.remove('-loop')
+        while True:
+            try:
+                unittest.main()
+            except:
+                pass
+    else:
+        unittest.main()
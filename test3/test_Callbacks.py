@@ -0,0 +1,162 @@
+# ====================================================================
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+# ====================================================================
+
+import sys, lucene, unittest
+from PyLuceneTestCase import PyLuceneTestCase
+
+from org.apache.lucene.document import Document, Field, StringField
+from org.apache.lucene.search import MatchAllDocsQuery
+from org.apache.pylucene.search import PythonSimpleCollector
+
+
+class Collector(PythonSimpleCollector):
+
+    def __init__(self):
+        super(Collector, self).__init__()
+        self.calls = []
+
+    def collect(self, doc, score):
+        self.calls.append('class')
+
+    def doSetNextReader(self, context):
+        pass
+
+    def needsScores(self):
+        return False
+
+
+class CallbacksTestCase(PyLuceneTestCase):
+    """
+    Callbacks are looked up once per class, check they still behave like
+    method calls when classes and instances change
+    """
+
+    def setUp(self):
+        super(CallbacksTestCase, self).setUp()
+
+        writer = self.getWriter()
+        for i in range(3):
+            doc = Document()
+            doc.add(Field("id", str(i), StringField.TYPE_STORED))
+            writer.addDocument(doc)
+        writer.close()
+
+        self.searcher = self.getSearcher()
+
+    def search(self, collector):
+
+        del collector.calls[:]
+        self.searcher.search(MatchAllDocsQuery(), collector)
+
+        return collector.calls
+
+    def testClassChange(self):
+
+        collector = Collector()
+        self.assertEqual(['class'] * 3, self.search(collector))
+
+        def collect(self, doc, score):
+            self.calls.append(doc)
+
+        original = Collector.collect
+        Collector.collect = collect
+        try:
+            self.assertEqual([0, 1, 2], self.search(collector))
+        finally:
+            Collector.collect = original
+
+        self.assertEqual(['class'] * 3, self.search(collector))
+
+    def testInstanceAttribute(self):
+
+        collector = Collector()
+        self.assertEqual(['class'] * 3, self.search(collector))
+
+        collector.collect = lambda doc, score: collector.calls.append('self')
+        self.assertEqual(['self'] * 3, self.search(collector))
+
+        del collector.collect
+        self.assertEqual(['class'] * 3, self.search(collector))
+
+    def testSubclass(self):
+
+        class _collector(Collector):
+            def collect(_self, doc, score):
+                _self.calls.append('subclass')
+
+        self.assertEqual(['class'] * 3, self.search(Collector()))
+        self.assertEqual(['subclass'] * 3, self.search(_collector()))
+        self.assertEqual(['class'] * 3, self.search(Collector()))
+
+    def testInlineAttribute(self):
+
+        # attributes set in __init__ are kept in the object's inline values
+        # rather than in a dict on Python 3.11 and later
+        class _collector(Collector):
+            def __init__(_self, override):
+                super(_collector, _self).__init__()
+                if override:
+                    _self.collect = lambda doc, score: _self.calls.append('self')
+
+        self.assertEqual(['self'] * 3, self.search(_collector(True)))
+        self.assertEqual(['class'] * 3, self.search(_collector(False)))
+        self.assertEqual(['self'] * 3, self.search(_collector(True)))
+
+    def testAlternatingSubclasses(self):
+
+        classes = []
+        for i in range(6):
+            class _collector(Collector):
+                def collect(_self, doc, score, i=i):
+                    _self.calls.append(i)
+            classes.append(_collector)
+
+        for j in range(3):
+            for i, cls in enumerate(classes):
+                self.assertEqual([i] * 3, self.search(cls()))
+
+    def testStaticMethod(self):
+
+        calls = []
+
+        class _collector(Collector):
+            @staticmethod
+            def collect(doc, score):
+                calls.append(doc)
+
+        self.search(_collector())
+        self.assertEqual([0, 1, 2], calls)
+        self.assertEqual(['class'] * 3, self.search(Collector()))
+
+    def testError(self):
+
+        class _collector(Collector):
+            def collect(_self, doc, score):
+                raise ValueError(doc)
+
+        with self.assertRaises(ValueError):
+            self.search(_collector())
+
+
+if __name__ == "__main__":
+    lucene.initVM(vmargs=['-Djava.awt.headless=true'])
+    if '-loop' in sys.argv:
+        sys.argv.remove('-loop')
+        while True:
+            try:
+                unittest.main()
+            except:
+                pass
+    else:
+        unittest.main()
@@ -0,0 +1,132 @@
+# ====================================================================
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+# ====================================================================
+
+import sys, lucene, unittest
+from lucene import JArray
+from PyLuceneTestCase import PyLuceneTestCase
+
+from org.apache.lucene.document import \
+    Document, NumericDocValuesField, SortedDocValuesField, \
+    SortedSetDocValuesField
+from org.apache.lucene.index import DocValues
+from org.apache.lucene.util import BytesRef
+from org.apache.pylucene.index import DocValuesExporter
+
+
+class DocValuesExporterTestCase(PyLuceneTestCase):
+
+    def setUp(self):
+        super(DocValuesExporterTestCase, self).setUp()
+
+        writer = self.getWriter()
+        for i in range(20):
+            doc = Document()
+            if i % 3:
+                doc.add(NumericDocValuesField("num", i * 100))
+                doc.add(SortedDocValuesField("sorted", BytesRef("v%02d" %(i % 5))))
+            for j in range(i % 4):
+                doc.add(SortedSetDocValuesField("set", BytesRef("s%d" %(j))))
+            writer.addDocument(doc)
+        writer.forceMerge(1)
+        writer.close()
+
+        self.reader = self.getReader()
+        self.context = self.reader.leaves().get(0)
+
+    def tearDown(self):
+        self.reader.close()
+        super(DocValuesExporterTestCase, self).tearDown()
+
+    def testNumeric(self):
+
+        result = DocValuesExporter.numeric(self.context, "num")
+        values, missing = list(result.values), list(result.missing)
+
+        self.assertEqual([0 if i % 3 == 0 else i * 100 for i in range(20)],
+                         values)
+        self.assertEqual([i % 3 == 0 for i in range(20)], missing)
+
+    def testNumericDocs(self):
+
+        docs = [19, 3, 4, 4, 0]
+        result = DocValuesExporter.numeric(self.context, "num",
+                                           JArray('int')(docs))
+
+        self.assertEqual([1900, 0, 400, 400, 0], list(result.values))
+        self.assertEqual([False, True, False, False, True],
+                         list(result.missing))
+
+    def testSorted(self):
+
+        result = DocValuesExporter.sorted(self.context, "sorted")
+        dv = DocValues.getSorted(self.context.reader(), "sorted")
+
+        for i, (ord, missing) in enumerate(zip(result.values, result.missing)):
+            if i % 3:
+                self.assertFalse(missing)
+                self.assertEqual("v%02d" %(i % 5),
+                                 dv.lookupOrd(ord).utf8ToString())
+            else:
+                self.assertTrue(missing)
+
+    def testSortedSet(self):
+
+        docs = [7, 1, 7, 0, 6]
+        result = DocValuesExporter.sortedSet(self.context, "set",
+                                             JArray('int')(docs))
+        ords, offsets = list(result.ords), list(result.offsets)
+
+        self.assertEqual([0, 3, 4, 7, 7, 9], offsets)
+        self.assertEqual([0, 1, 2, 0, 0, 1, 2, 0, 1], ords)
+
+        result = DocValuesExporter.sortedSet(self.context, "set")
+        offsets = [0]
+        for i in range(20):
+            offsets.append(offsets[-1] + i % 4)
+        self.assertEqual(offsets, list(result.offsets))
+        self.assertEqual([j for i in range(20) for j in range(i % 4)],
+                         list(result.ords))
+
+        result = DocValuesExporter.sortedSet(self.context, "none")
+        self.assertEqual([0] * 21, list(result.offsets))
+        self.assertEqual([], list(result.ords))
+
+    def testNumpy(self):
+
+        try:
+            import numpy
+        except ImportError:
+            return
+
+        result = DocValuesExporter.numeric(self.context, "num")
+        values = numpy.asarray(result.values)
+        missing = numpy.asarray(result.missing)
+
+        self.assertEqual(numpy.int64, values.dtype)
+        self.assertEqual(numpy.bool_, missing.dtype)
+        self.assertEqual(sum(i * 100 for i in range(20) if i % 3),
+                         values[~missing].sum())
+
+
+if __name__ == "__main__":
+    lucene.initVM(vmargs=['-Djava.awt.headless=true'])
+    if '-loop' in sys.argv:
+        sys.argv.remove('-loop')
+        while True:
+            try:
+                unittest.main()
+            except:
+                pass
+    else:
+        unittest.main()
@@ -0,0 +1,142 @@
+# ====================================================================
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+# ====================================================================
+
+import sys, lucene, unittest, math
+from lucene import JavaError
+from PyLuceneTestCase import PyLuceneTestCase
+
+from org.apache.lucene.analysis.core import SimpleAnalyzer
+from org.apache.lucene.document import Document, Field, TextField
+from org.apache.lucene.index import Term
+from org.apache.lucene.search import \
+    BooleanClause, BooleanQuery, PhraseQuery, TermQuery
+from org.apache.lucene.search.similarities import ClassicSimilarity
+from org.apache.pylucene.search.similarities import \
+    ExpressionClassicSimilarity
+
+
+class ExpressionSimilarityTestCase(PyLuceneTestCase):
+
+    def index(self, similarity, texts):
+
+        writer = self.getWriter(analyzer=SimpleAnalyzer(),
+                                similarity=similarity)
+        for text in texts:
+            doc = Document()
+            doc.add(Field("field", text, TextField.TYPE_STORED))
+            writer.addDocument(doc)
+        writer.commit()
+        writer.close()
+
+        searcher = self.getSearcher()
+        searcher.setSimilarity(similarity)
+
+        return searcher
+
+    def scores(self, searcher, query):
+
+        return dict((sd.doc, sd.score)
+                    for sd in searcher.search(query, 100).scoreDocs)
+
+    def testSimpleSimilarity(self):
+
+        # the formulas of SimpleSimilarity in test_Similarity.py
+        similarity = ExpressionClassicSimilarity("freq", "1", "1", "2")
+        searcher = self.index(similarity, ["a c", "a b c"])
+
+        a = Term("field", "a")
+        b = Term("field", "b")
+        c = Term("field", "c")
+
+        self.assertEqual({1: 1.0}, self.scores(searcher, TermQuery(b)))
+
+        builder = BooleanQuery.Builder()
+        builder.add(TermQuery(a), BooleanClause.Occur.SHOULD)
+        builder.add(TermQuery(b), BooleanClause.Occur.SHOULD)
+        self.assertEqual({0: 1.0, 1: 2.0},
+                         self.scores(searcher, builder.build()))
+
+        # phrases sum the idf of their terms
+        builder = PhraseQuery.Builder()
+        builder.add(a)
+        builder.add(c)
+        exact = self.scores(searcher, builder.build())
+        self.assertEqual([0], list(exact.keys()))
+
+        builder.setSlop(2)
+        sloppy = self.scores(searcher, builder.build())
+        self.assertEqual({0: exact[0] * 2, 1: exact[0] * 2}, sloppy)
+
+    def testClassicFormulas(self):
+
+        texts = [' '.join(["a"] * (i % 5 + 1) + ["b"] * i)
+                 for i in range(50)]
+
+        similarity = ClassicSimilarity()
+        searcher = self.index(similarity, texts)
+        expected = self.scores(searcher, TermQuery(Term("field", "a")))
+
+        similarity = ExpressionClassicSimilarity(
+            "sqrt(freq)", "ln((docCount + 1) / (docFreq + 1)) + 1",
+            "1 / sqrt(numTerms)", "1 / (distance + 1)")
+        searcher.setSimilarity(similarity)
+        actual = self.scores(searcher, TermQuery(Term("field", "a")))
+
+        self.assertEqual(sorted(expected.keys()), sorted(actual.keys()))
+        for doc, score in expected.items():
+            self.assertAlmostEqual(score, actual[doc], places=5)
+
+        # beyond the tables
+        self.assertAlmostEqual(math.sqrt(1000.5), similarity.tf(1000.5),
+                               places=3)
+        self.assertAlmostEqual(1.0 / 1001, similarity.sloppyFreq(1000))
+        self.assertAlmostEqual(1.0 / math.sqrt(1001),
+                               similarity.lengthNorm(1001), places=5)
+
+    def testDefaults(self):
+
+        classic = ClassicSimilarity()
+        similarity = ExpressionClassicSimilarity(None, None, None, None)
+
+        for i in range(10):
+            self.assertEqual(classic.tf(float(i)), similarity.tf(float(i)))
+            self.assertEqual(classic.sloppyFreq(i), similarity.sloppyFreq(i))
+            self.assertEqual(classic.lengthNorm(i + 1),
+                             similarity.lengthNorm(i + 1))
+            self.assertEqual(classic.idf(i, 10), similarity.idf(i, 10))
+
+    def testErrors(self):
+
+        with self.assertRaises(JavaError) as cm:
+            ExpressionClassicSimilarity("sqrt(frequency)", None, None, None)
+        self.assertEqual('java.lang.IllegalArgumentException',
+                         cm.exception.getJavaException().getClass().getName())
+
+        with self.assertRaises(JavaError) as cm:
+            ExpressionClassicSimilarity("sqrt(freq", None, None, None)
+        self.assertEqual('java.text.ParseException',
+                         cm.exception.getJavaException().getClass().getName())
+
+
+if __name__ == "__main__":
+    lucene.initVM(vmargs=['-Djava.awt.headless=true'])
+    if '-loop' in sys.argv:
+        sys.argv.remove('-loop')
+        while True:
+            try:
+                unittest.main()
+            except:
+                pass
+    else:
+        unittest.main()
@@ -0,0 +1,119 @@
+# ====================================================================
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+# ====================================================================
+
+import sys, time, lucene, unittest
+from lucene import JavaError
+from PyLuceneTestCase import PyLuceneTestCase
+
+from org.apache.lucene.document import FieldType, StringField, TextField
+from org.apache.lucene.index import Term
+from org.apache.lucene.search import TermQuery
+from java.lang import Thread
+
+
+class IndexingPipelineTestCase(PyLuceneTestCase):
+
+    schema = [("id", StringField.TYPE_STORED),
+              ("body", TextField.TYPE_NOT_STORED),
+              ("odd", StringField.TYPE_NOT_STORED)]
+
+    def testIndex(self):
+
+        from lucene.IndexingPipeline import IndexingPipeline
+
+        writer = self.getWriter()
+        with IndexingPipeline(writer, self.schema, threads=3,
+                              batchSize=64) as pipeline:
+            for i in range(500):
+                pipeline.add({"id": i, "body": "document number %d" %(i),
+                              "odd": "yes" if i % 2 else None})
+            pipeline.addAll((i, "tuple %d" %(i), None)
+                            for i in range(500, 600))
+        self.assertEqual(600, pipeline.count)
+        writer.close()
+
+        searcher = self.getSearcher()
+        self.assertEqual(600, searcher.getIndexReader().numDocs())
+        self.assertEqual(250, searcher.count(TermQuery(Term("odd", "yes"))))
+        self.assertEqual(500, searcher.count(TermQuery(Term("body",
+                                                            "document"))))
+
+        topDocs = searcher.search(TermQuery(Term("body", "599")), 1)
+        self.assertEqual("599", searcher.doc(topDocs.scoreDocs[0].doc).get("id"))
+
+    def testFailure(self):
+
+        from lucene.IndexingPipeline import IndexingPipeline
+
+        # neither indexed nor stored
+        schema = [("id", StringField.TYPE_STORED), ("none", FieldType())]
+
+        writer = self.getWriter()
+        pipeline = IndexingPipeline(writer, schema, threads=2, batchSize=1)
+        pipeline.add(("1", None))
+        pipeline.add(("2", "value"))
+
+        with self.assertRaises(JavaError) as cm:
+            pipeline.close()
+        self.assertEqual('java.lang.IllegalArgumentException',
+                         cm.exception.getJavaException().getClass().getName())
+        writer.close()
+
+        with self.assertRaises(ValueError):
+            pipeline.add(("3",))
+
+    def testFailureBeforeFlush(self):
+
+        from lucene.IndexingPipeline import IndexingPipeline
+
+        schema = [("id", StringField.TYPE_STORED), ("none", FieldType())]
+
+        writer = self.getWriter()
+        pipeline = IndexingPipeline(writer, schema, threads=2, batchSize=2)
+        pipeline.add(("1", "value"))
+        pipeline.add(("2", "value"))
+
+        # wait for a worker to fail, then leave a document pending
+        deadline = time.time() + 10
+        while True:
+            try:
+                pipeline._pipeline.add([])
+            except JavaError:
+                break
+            self.assertLess(time.time(), deadline)
+            time.sleep(0.01)
+        pipeline.add(("3", None))
+
+        with self.assertRaises(JavaError):
+            pipeline.close()
+        writer.close()
+
+        # the workers got their END sentinels and exited
+        for thread in Thread.getAllStackTraces().keySet().toArray():
+            thread = Thread.cast_(thread)
+            if thread.getName().startswith("IndexingPipeline-"):
+                self.assertFalse(thread.isAlive())
+
+
+if __name__ == "__main__":
+    lucene.initVM(vmargs=['-Djava.awt.headless=true'])
+    if '-loop' in sys.argv:
+        sys.argv.remove('-loop')
+        while True:
+            try:
+                unittest.main()
+            except:
+                pass
+    else:
+        unittest.main()
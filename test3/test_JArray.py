@@ -0,0 +1,185 @@
+# ====================================================================
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+# ====================================================================
+
+# test JArray wrappers of Java arrays
+
+import sys, ctypes, lucene, unittest
+from lucene import JArray
+from java.lang import Integer, String
+
+
+class JArrayTestCase(unittest.TestCase):
+
+    def testBufferFormats(self):
+
+        for name, format, values in (('bool', '?', [True, False, True]),
+                                     ('byte', 'b', [1, -2, 3]),
+                                     ('short', 'h', [1, -2, 300]),
+                                     ('int', 'i', [1, -2, 1 << 20]),
+                                     ('long', 'q', [1, -2, 1 << 40]),
+                                     ('float', 'f', [1.0, -2.5, 3.0]),
+                                     ('double', 'd', [1.0, -2.5, 1e100])):
+            array = JArray(name)(values)
+            with memoryview(array) as view:
+                self.assertEqual(format, view.format)
+                self.assertEqual(1, view.ndim)
+                self.assertEqual((3,), view.shape)
+                self.assertEqual(3 * view.itemsize, view.nbytes)
+                self.assertEqual(values, view.tolist())
+
+    def testBufferChar(self):
+
+        array = JArray('char')('abc')
+        with memoryview(array) as view:
+            self.assertEqual('H', view.format)
+            self.assertEqual([ord(c) for c in 'abc'], view.tolist())
+
+    def testBufferWrite(self):
+
+        array = JArray('int')(4)
+        values = (ctypes.c_int * 4).from_buffer(array)
+        values[1] = 5
+        values[3] = -7
+        del values
+        self.assertEqual([0, 5, 0, -7], list(array))
+
+        with memoryview(array) as view:
+            self.assertFalse(view.readonly)
+            view[0] = 1
+        self.assertEqual([1, 5, 0, -7], list(array))
+
+    def testBufferEmpty(self):
+
+        array = JArray('double')(0)
+        with memoryview(array) as view:
+            self.assertEqual(0, view.nbytes)
+
+    def testNoBufferForObjects(self):
+
+        self.assertRaises(TypeError, memoryview, JArray('string')(['a']))
+        self.assertRaises(TypeError, memoryview, JArray('object')(1))
+
+    def testView(self):
+
+        array = JArray('int')([1, 2, 3, 4])
+        with array.view() as view:
+            self.assertEqual([1, 2, 3, 4], view.tolist())
+            array[0] = 10
+            self.assertEqual(10, view[0])
+            self.assertEqual([2, 3], array[1:3])
+            array[3] = 40
+            self.assertEqual(40, view[3])
+            with memoryview(array) as other:
+                self.assertEqual(10, other[0])
+            self.assertEqual(10, array[-4])
+            self.assertEqual(55, sum(array))
+            self.assertRaises(IndexError, lambda: array[4])
+            self.assertRaises(BufferError, array.__init__, 2)
+        self.assertEqual([10, 2, 3, 40], list(array))
+
+        array = JArray('char')('abc')
+        with array.view() as view:
+            self.assertEqual('b', array[1])
+            self.assertEqual(ord('b'), view[1])
+            self.assertEqual('ab', array[0:2])
+        self.assertEqual('ab', array[0:2])
+
+        array = JArray('byte')([1, -2, 3])
+        with array.view():
+            self.assertEqual((1, -2), array[0:2])
+        self.assertEqual((1, -2), array[0:2])
+
+        self.assertFalse(hasattr(JArray('string')(['a']), 'view'))
+
+    def testToList(self):
+
+        self.assertEqual([1.5, 2.5], JArray('double')([1.5, 2.5]).tolist())
+        self.assertEqual([True, False], JArray('bool')([True, False]).tolist())
+        self.assertEqual(['a', 'b'], JArray('char')('ab').tolist())
+        self.assertEqual([1, -2], JArray('byte')([1, -2]).tolist())
+        self.assertEqual([], JArray('byte')(0).tolist())
+        self.assertEqual(['a', None], JArray('string')(['a', None]).tolist())
+        self.assertEqual([], JArray('long')(0).tolist())
+
+        array = JArray('short')([1, 2, 3])
+        with array.view():
+            self.assertEqual([1, 2, 3], array.tolist())
+
+        array = JArray('char')('ab')
+        with array.view():
+            self.assertEqual(['a', 'b'], array.tolist())
+
+        array = JArray('byte')([1, -2])
+        with array.view():
+            self.assertEqual([1, -2], array.tolist())
+
+    def testStrings(self):
+
+        values = ["term%d" %(i) for i in range(1000)]
+        values[10] = None
+        values[500] = "\u00e9t\u00e9 \U0001f600"
+
+        array = JArray('string')(values)
+        self.assertEqual(1000, len(array))
+        self.assertEqual(values, array.tolist())
+        self.assertEqual(values[250:760], array[250:760])
+        self.assertEqual(values[500], array[500])
+
+        self.assertEqual(values, JArray('string')(tuple(values)).tolist())
+        self.assertEqual([], JArray('string')([]).tolist())
+        self.assertRaises(TypeError, JArray('string'), ["a", 1])
+
+    def testJavaStrings(self):
+
+        values = [String("id"), "count", None, String("odd")]
+        array = JArray('string')(values)
+        self.assertEqual(["id", "count", None, "odd"], array.tolist())
+
+        objects = JArray('object')(array).tolist()
+        self.assertEqual(["id", "count", None, "odd"],
+                         JArray('string')(objects).tolist())
+        self.assertRaises(TypeError, JArray('string'), [Integer(1)])
+        self.assertRaises(TypeError, JArray('string'), ["a", Integer(1)])
+
+    def testObjects(self):
+
+        strings = JArray('string')(["a", "b", None] * 200)
+        array = JArray('object')(strings)
+        self.assertEqual(["a", "b", None] * 200,
+                         [value and value.toString()
+                          for value in array.tolist()])
+
+    def testNumpy(self):
+
+        try:
+            import numpy
+        except ImportError:
+            return
+
+        array = JArray('float')([1.0, 2.0, 3.0])
+        self.assertEqual([1.0, 2.0, 3.0],
+                         numpy.frombuffer(array, dtype=numpy.float32).tolist())
+
+
+if __name__ == '__main__':
+    lucene.initVM(vmargs=['-Djava.awt.headless=true'])
+    if '-loop' in sys.argv:
+        sys.argv.remove('-loop')
+        while True:
+            try:
+                unittest.main()
+            except:
+                pass
+    else:
+        unittest.main()
@@ -0,0 +1,156 @@
+# ====================================================================
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+# ====================================================================
+
+import sys, lucene, threading, unittest
+from PyLuceneTestCase import PyLuceneTestCase
+
+from java.lang import Integer
+from org.apache.lucene.document import Document, Field, StringField
+from org.apache.lucene.search import MatchAllDocsQuery
+from org.apache.pylucene.search import PythonSimpleCollector
+
+
+class Collector(PythonSimpleCollector):
+
+    def __init__(self):
+        super(Collector, self).__init__()
+        self.contexts = []
+
+    def collect(self, doc, score):
+        pass
+
+    def doSetNextReader(self, context):
+        self.contexts.append(context)
+
+    def needsScores(self):
+        return False
+
+
+class LocalFrameTestCase(PyLuceneTestCase):
+    """
+    Java objects wrapped inside lucene.localFrame() hold local references,
+    check that the ones escaping it remain usable
+    """
+
+    def setUp(self):
+        super(LocalFrameTestCase, self).setUp()
+
+        writer = self.getWriter()
+        for i in range(100):
+            doc = Document()
+            doc.add(Field("id", str(i), StringField.TYPE_STORED))
+            writer.addDocument(doc)
+        writer.close()
+
+        self.searcher = self.getSearcher()
+
+    def testEscapingObjects(self):
+
+        with lucene.localFrame():
+            topDocs = self.searcher.search(MatchAllDocsQuery(), 100)
+            docs = [self.searcher.doc(sd.doc) for sd in topDocs.scoreDocs]
+            ids = [doc.get("id") for doc in docs]
+
+        self.assertEqual([str(i) for i in range(100)], ids)
+        self.assertEqual(ids, [doc.get("id") for doc in docs])
+        self.assertEqual(100, topDocs.totalHits)
+
+    def testDroppedObjects(self):
+
+        with lucene.localFrame():
+            for i in range(3):
+                topDocs = self.searcher.search(MatchAllDocsQuery(), 100)
+                for sd in topDocs.scoreDocs:
+                    self.assertEqual(str(sd.doc),
+                                     self.searcher.doc(sd.doc).get("id"))
+
+        self.assertEqual(100, len(topDocs.scoreDocs))
+
+    def testNesting(self):
+
+        with lucene.localFrame(512) as outer:
+            value = Integer.valueOf(1)
+            with lucene.localFrame() as inner:
+                values = [Integer.valueOf(i) for i in range(300)]
+                self.assertEqual(outer.depth + 1, inner.depth)
+            self.assertEqual(299, values[-1].intValue())
+            self.assertRaises(ValueError, lucene.localFrame(256).__enter__)
+
+        self.assertEqual(1, value.intValue())
+        self.assertEqual(list(range(300)), [v.intValue() for v in values])
+
+        frame = lucene.localFrame()
+        frame.__enter__()
+        with lucene.localFrame():
+            self.assertRaises(RuntimeError, frame.__exit__)
+        frame.__exit__()
+        self.assertRaises(RuntimeError, frame.__exit__)
+
+    def testClassWrapper(self):
+
+        with lucene.localFrame():
+            for i in range(3):
+                cls = Integer.class_
+                self.assertEqual("java.lang.Integer", cls.getName())
+                del cls
+            self.assertEqual(7, Integer.valueOf(7).intValue())
+
+        self.assertEqual("java.lang.Integer", Integer.class_.getName())
+        self.assertTrue(Integer.class_.isInstance(Integer.valueOf(1)))
+
+    def testOtherThread(self):
+
+        dropped = []
+        with lucene.localFrame():
+            values = [Integer.valueOf(i) for i in range(100)]
+            kept = values[50]
+
+            def drop():
+                lucene.getVMEnv().attachCurrentThread()
+                dropped.append(len(values))
+                del values[:]
+
+            thread = threading.Thread(target=drop)
+            thread.start()
+            thread.join()
+
+            self.assertEqual([100], dropped)
+            self.assertEqual(50, kept.intValue())
+            others = [Integer.valueOf(i) for i in range(10)]
+
+        self.assertEqual(50, kept.intValue())
+        self.assertEqual(list(range(10)), [v.intValue() for v in others])
+
+    def testCallbacks(self):
+
+        collector = Collector()
+        with lucene.localFrame():
+            self.searcher.search(MatchAllDocsQuery(), collector)
+            self.assertTrue(collector.contexts[0].reader().maxDoc() > 0)
+
+        self.assertEqual(100, sum(context.reader().maxDoc()
+                                  for context in collector.contexts))
+
+
+if __name__ == "__main__":
+    lucene.initVM(vmargs=['-Djava.awt.headless=true'])
+    if '-loop' in sys.argv:
+        sys.argv.remove('-loop')
+        while True:
+            try:
+                unittest.main()
+            except:
+                pass
+    else:
+        unittest.main()
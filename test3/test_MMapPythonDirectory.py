@@ -0,0 +1,152 @@
+# ====================================================================
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+# ====================================================================
+
+import sys, lucene, unittest
+import os, shutil
+from lucene import JavaError, JArray
+
+from java.nio.file import Paths
+from org.apache.lucene.analysis.core import WhitespaceAnalyzer
+from org.apache.lucene.document import Document, Field, TextField
+from org.apache.lucene.index import \
+    DirectoryReader, IndexWriter, IndexWriterConfig, Term
+from org.apache.lucene.search import IndexSearcher, TermQuery
+from org.apache.lucene.store import IOContext, SimpleFSDirectory
+
+
+class MMapPythonDirectoryTestCase(unittest.TestCase):
+
+    STORE_DIR = "testmmaprepo"
+
+    def setUp(self):
+
+        if not os.path.exists(self.STORE_DIR):
+            os.mkdir(self.STORE_DIR)
+
+        with open(os.path.join(self.STORE_DIR, "test.bin"), "wb") as f:
+            f.write(bytes(range(256)) * 64)
+
+    def tearDown(self):
+
+        if os.path.exists(self.STORE_DIR):
+            shutil.rmtree(self.STORE_DIR)
+
+    def openStore(self):
+
+        from lucene.MMapPythonDirectory import MMapPythonDirectory
+        return MMapPythonDirectory(self.STORE_DIR)
+
+    def readBytes(self, input, length):
+
+        data = JArray('byte')(length)
+        input.readBytes(data, 0, length)
+
+        return bytes(data[i] & 0xff for i in range(length))
+
+    def testReadSliceClone(self):
+
+        store = self.openStore()
+        input = store.openInput("test.bin", IOContext.DEFAULT)
+        try:
+            self.assertEqual(256 * 64, input.length())
+            self.assertEqual(bytes(range(256)) * 4, self.readBytes(input, 1024))
+
+            input.seek(16000)
+            self.assertEqual(bytes(range(128, 256)), self.readBytes(input, 128))
+
+            slice = input.slice("test", 300, 1000)
+            self.assertEqual(1000, slice.length())
+            self.assertEqual(bytes(range(44, 144)), self.readBytes(slice, 100))
+
+            clone = slice.clone()
+            self.assertEqual(100, clone.getFilePointer())
+            clone.seek(0)
+            self.assertEqual(bytes(range(44, 54)), self.readBytes(clone, 10))
+            self.assertEqual(100, slice.getFilePointer())
+
+            self.assertRaises(JavaError, input.slice, "test", 16000, 1000)
+
+            slice.seek(1000)
+            self.assertRaises(JavaError, slice.readByte)
+        finally:
+            input.close()
+            store.close()
+
+    def testCloseOwner(self):
+
+        store = self.openStore()
+        input = store.openInput("test.bin", IOContext.DEFAULT)
+        slice = input.slice("test", 300, 1000)
+        clone = input.clone()
+        input.close()
+
+        try:
+            clone.seek(16000)
+            self.assertEqual(bytes(range(128, 256)), self.readBytes(clone, 128))
+            self.assertEqual(bytes(range(44, 144)), self.readBytes(slice, 100))
+            self.assertEqual(bytes(range(144, 244)),
+                             self.readBytes(slice.clone(), 100))
+        finally:
+            store.close()
+
+    def testSearch(self):
+
+        directory = SimpleFSDirectory(Paths.get(self.STORE_DIR))
+        writer = IndexWriter(directory,
+                             IndexWriterConfig(WhitespaceAnalyzer()))
+        for i in range(100):
+            doc = Document()
+            doc.add(Field("title", "doc %d" %(i), TextField.TYPE_STORED))
+            writer.addDocument(doc)
+        writer.close()
+        directory.close()
+
+        store = self.openStore()
+        reader = DirectoryReader.open(store)
+        try:
+            searcher = IndexSearcher(reader)
+            topDocs = searcher.search(TermQuery(Term("title", "42")), 10)
+            self.assertEqual(1, topDocs.totalHits)
+            self.assertEqual("doc 42",
+                             searcher.doc(topDocs.scoreDocs[0].doc).get("title"))
+        finally:
+            reader.close()
+            store.close()
+
+    def testReadOnly(self):
+
+        store = self.openStore()
+        try:
+            self.assertRaises(JavaError, store.createOutput,
+                              "test.out", IOContext.DEFAULT)
+            self.assertRaises(JavaError, store.deleteFile, "test.bin")
+            self.assertRaises(JavaError, store.openInput,
+                              "missing.bin", IOContext.DEFAULT)
+            self.assertTrue(os.path.exists(os.path.join(self.STORE_DIR,
+                                                        "test.bin")))
+        finally:
+            store.close()
+
+
+if __name__ == "__main__":
+    lucene.initVM(vmargs=['-Djava.awt.headless=true'])
+    if '-loop' in sys.argv:
+        sys.argv.remove('-loop')
+        while True:
+            try:
+                unittest.main()
+            except:
+                pass
+    else:
+        unittest.main()
@@ -0,0 +1,71 @@
+# ====================================================================
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+# ====================================================================
+
+import sys, lucene, unittest
+from lucene import InvalidArgsError
+from java.lang import Integer
+from PyLuceneTestCase import PyLuceneTestCase
+
+from org.apache.lucene.document import Document, IntPoint
+
+
+class OverloadsTestCase(PyLuceneTestCase):
+    """
+    Overloads chosen for argument types are cached, check that changing
+    argument types still picks the right overload
+    """
+
+    def testStaticOverloads(self):
+
+        for i in range(3):
+            self.assertEqual(12, Integer.valueOf(12).intValue())
+            self.assertEqual(12, Integer.valueOf("12").intValue())
+            self.assertEqual("1100", Integer.toString(12, 2))
+            self.assertEqual(10, Integer.parseInt("1010", 2))
+
+        for i in range(3):
+            with self.assertRaises(InvalidArgsError):
+                Integer.valueOf(1.5)
+            self.assertEqual(5, Integer.valueOf(5).intValue())
+
+    def testArgumentTypes(self):
+
+        writer = self.getWriter()
+        for i in range(10):
+            doc = Document()
+            doc.add(IntPoint("value", i))
+            writer.addDocument(doc)
+        writer.close()
+
+        searcher = self.getSearcher()
+        for i in range(3):
+            query = IntPoint.newRangeQuery("value", 2, 5)
+            self.assertEqual(4, searcher.count(query))
+            query = IntPoint.newRangeQuery("value", [6], [9])
+            self.assertEqual(4, searcher.count(query))
+            query = IntPoint.newRangeQuery("value", 0, 9)
+            self.assertEqual(10, searcher.count(query))
+
+
+if __name__ == "__main__":
+    lucene.initVM(vmargs=['-Djava.awt.headless=true'])
+    if '-loop' in sys.argv:
+        sys.argv.remove('-loop')
+        while True:
+            try:
+                unittest.main()
+            except:
+                pass
+    else:
+        unittest.main()
@@ -80,6 +80,133 @@ class PyLuceneThreadTestCase(PyLuceneTestCase):
         # and all queries have ran successfully
         self.assertEqual(10000, self.totalQueries)
 
+    def testRefStats(self):
+        """ global reference table statistics survive threaded use """
+
+        threads = []
+        for i in range(5):
+            threads.append(threading.Thread(target=self.runSearch,
+                                            args=(200,)))
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        stats = getVMEnv()._refStats()
+        self.assertEqual(1000, self.totalQueries)
+        self.assertTrue(stats['shards'] >= 1)
+        self.assertTrue(stats['refs'] > 0)
+        self.assertTrue(stats['locks'] >= stats['waits'] >= 0)
+        self.assertTrue(stats['waitTime'] >= 0)
+        self.assertEqual(stats['refs'], len(getVMEnv()._dumpRefs()))
+
+    def testGILReleased(self):
+        """ Python threads keep running while another thread is in Java """
+
+        running = threading.Event()
+        done = threading.Event()
+        maxGap = [0.0]
+
+        def spin():
+            last = time.time()
+            running.set()
+            while not done.is_set():
+                now = time.time()
+                if now - last > maxGap[0]:
+                    maxGap[0] = now - last
+                last = now
+
+        thread = threading.Thread(target=spin)
+        thread.start()
+        running.wait()
+
+        Thread.sleep(500)
+        done.set()
+        thread.join()
+
+        # the spinning thread would stall for 500ms if the GIL was held
+        self.assertTrue(maxGap[0] < 0.25)
+
+    def testThreadPoolExecutor(self):
+        """ Run 5 searches on 2 workers attached by the executor """
+
+        from lucene.ThreadPoolExecutor import ThreadPoolExecutor
+
+        def currentThread():
+            thread = Thread.currentThread()
+            return thread.getName(), thread.isDaemon()
+
+        with ThreadPoolExecutor(2, 'searcher') as executor:
+            for future in [executor.submit(self.runSearch, 200, True)
+                           for i in range(5)]:
+                future.result()
+            name, daemon = executor.submit(currentThread).result()
+
+        stats = executor.stats()
+        self.assertEqual(1000, self.totalQueries)
+        self.assertTrue(name.startswith('searcher'))
+        self.assertTrue(daemon)
+        self.assertTrue(1 <= stats['threads'] <= 2)
+        self.assertTrue(stats['maxAttachTime'] >= stats['meanAttachTime'] > 0)
+
+        # the workers detached when they exited
+        for thread in Thread.getAllStackTraces().keySet().toArray():
+            self.assertNotEqual(name, Thread.cast_(thread).getName())
+
+    def testAio(self):
+        """ Run 5 searches concurrently from asyncio """
+
+        import asyncio
+        from lucene import aio
+
+        searcher = self.getSearcher()
+
+        async def main():
+            queries = [TermQuery(Term("field", word))
+                       for word, count in self.testData[0:5]]
+            return await asyncio.gather(*[aio.search(searcher, query, 50)
+                                          for query in queries])
+
+        counts = [topDocs.totalHits for topDocs in asyncio.run(main())]
+        self.assertEqual([count for word, count in self.testData[0:5]],
+                         counts)
+
+    def testAioCancel(self):
+        """ Cancelling an awaited call interrupts its Java thread """
+
+        import asyncio
+        from lucene import aio
+
+        started = threading.Event()
+        done = threading.Event()
+        interrupted = []
+
+        def sleep():
+            started.set()
+            try:
+                Thread.sleep(30000)
+            except lucene.JavaError as e:
+                interrupted.append(e.getJavaException().getClass().getName())
+            done.set()
+
+        async def main():
+            task = asyncio.ensure_future(aio.run(sleep))
+            await asyncio.get_running_loop().run_in_executor(None, started.wait)
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                return True
+            return False
+
+        start = time.time()
+        self.assertTrue(asyncio.run(main()))
+        self.assertTrue(done.wait(10))
+        self.assertTrue(time.time() - start < 30)
+        self.assertEqual(['java.lang.InterruptedException'], interrupted)
+
     def runSearch(self, runCount, mainThread=False):
         """ search for runCount number of times """
 
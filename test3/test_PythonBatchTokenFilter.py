@@ -0,0 +1,101 @@
+# ====================================================================
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+# ====================================================================
+
+import sys, lucene, unittest
+from BaseTokenStreamTestCase import BaseTokenStreamTestCase
+
+from org.apache.lucene.analysis import Analyzer
+from org.apache.lucene.analysis.core import WhitespaceTokenizer
+from org.apache.pylucene.analysis import \
+    PythonAnalyzer, PythonBatchTokenFilter
+
+
+class UpperCaseFilter(PythonBatchTokenFilter):
+
+    def __init__(self, input, batchSize):
+        super(UpperCaseFilter, self).__init__(input, batchSize)
+        self.batches = []
+
+    def filterBatch(self, terms, positionIncrements, startOffsets, endOffsets,
+                    count):
+        self.batches.append(list(zip(terms[:count], startOffsets[:count],
+                                     endOffsets[:count])))
+        return [term.upper() for term in terms[:count]]
+
+
+class NoVowelFilter(PythonBatchTokenFilter):
+
+    def filterBatch(self, terms, positionIncrements, startOffsets, endOffsets,
+                    count):
+        return [None if term[0] in "aeiou" else term
+                for term in terms[:count]]
+
+
+class PythonBatchTokenFilterTestCase(BaseTokenStreamTestCase):
+
+    def analyzer(self, filter):
+
+        class _analyzer(PythonAnalyzer):
+            def createComponents(_self, fieldName):
+                source = WhitespaceTokenizer()
+                return Analyzer.TokenStreamComponents(source, filter(source))
+            def initReader(_self, fieldName, reader):
+                return reader
+
+        return _analyzer()
+
+    def testBatches(self):
+
+        filters = []
+        def filter(source):
+            filters.append(UpperCaseFilter(source, 2))
+            return filters[-1]
+
+        self._assertAnalyzesTo(self.analyzer(filter), "the quick brown fox",
+                               ["THE", "QUICK", "BROWN", "FOX"],
+                               [0, 4, 10, 16], [3, 9, 15, 19],
+                               [1, 1, 1, 1])
+
+        self.assertEqual([[("the", 0, 3), ("quick", 4, 9)],
+                          [("brown", 10, 15), ("fox", 16, 19)]],
+                         filters[-1].batches)
+
+    def testRemove(self):
+
+        a = self.analyzer(NoVowelFilter)
+        self._assertAnalyzesTo(a, "an old quick eager brown ant fox",
+                               ["quick", "brown", "fox"],
+                               [7, 19, 29], [12, 24, 32],
+                               [3, 2, 2])
+        self._assertAnalyzesTo(a, "all out", [])
+
+    def testSmallBatches(self):
+
+        a = self.analyzer(lambda source: NoVowelFilter(source, 1))
+        self._assertAnalyzesTo(a, "an old quick eager brown ant fox",
+                               ["quick", "brown", "fox"],
+                               posIncrements=[3, 2, 2])
+
+
+if __name__ == "__main__":
+    lucene.initVM(vmargs=['-Djava.awt.headless=true'])
+    if '-loop' in sys.argv:
+        sys.argv.remove('-loop')
+        while True:
+            try:
+                unittest.main()
+            except:
+                pass
+    else:
+        unittest.main()
@@ -0,0 +1,91 @@
+# ====================================================================
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+# ====================================================================
+
+import sys, lucene, unittest, re
+from BaseTokenStreamTestCase import BaseTokenStreamTestCase
+
+from org.apache.lucene.analysis import Analyzer
+from org.apache.lucene.analysis.core import WhitespaceTokenizer
+from org.apache.pylucene.analysis import PythonAnalyzer, PythonCharFilter
+
+
+class TagStripper(PythonCharFilter):
+
+    calls = 0
+
+    def filter(self, text):
+
+        TagStripper.calls += 1
+
+        parts, offsets, diffs = [], [], []
+        pos = length = removed = 0
+
+        for match in re.finditer(r'<[^>]*>', text):
+            parts.append(text[pos:match.start()])
+            length += match.start() - pos
+            removed += match.end() - match.start()
+            offsets.append(length)
+            diffs.append(removed)
+            pos = match.end()
+        parts.append(text[pos:])
+
+        self.addOffsetCorrections(offsets, diffs)
+
+        return ''.join(parts)
+
+
+class PythonCharFilterTestCase(BaseTokenStreamTestCase):
+
+    def setUp(self):
+
+        class _analyzer(PythonAnalyzer):
+            def createComponents(_self, fieldName):
+                return Analyzer.TokenStreamComponents(WhitespaceTokenizer())
+            def initReader(_self, fieldName, reader):
+                return TagStripper(reader)
+
+        self.analyzer = _analyzer()
+        TagStripper.calls = 0
+
+    def testOffsets(self):
+
+        # end offsets include the tags that follow
+        self._assertAnalyzesTo(self.analyzer,
+                               "<b>hello</b> <i>big</i><br/>world",
+                               ["hello", "bigworld"],
+                               [3, 16], [12, 33])
+        self._assertAnalyzesTo(self.analyzer, "no tags here",
+                               ["no", "tags", "here"],
+                               [0, 3, 8], [2, 7, 12])
+        self._assertAnalyzesTo(self.analyzer, "<p></p>", [])
+
+    def testOnce(self):
+
+        words = ["<p>word%d</p>" %(i) for i in range(5000)]
+        self._assertAnalyzesTo(self.analyzer, ' '.join(words),
+                               ["word%d" %(i) for i in range(5000)])
+        self.assertEqual(1, TagStripper.calls)
+
+
+if __name__ == "__main__":
+    lucene.initVM(vmargs=['-Djava.awt.headless=true'])
+    if '-loop' in sys.argv:
+        sys.argv.remove('-loop')
+        while True:
+            try:
+                unittest.main()
+            except:
+                pass
+    else:
+        unittest.main()
@@ -21,9 +21,11 @@ from lucene import JavaError, JArray
 
 from java.lang import String
 from java.io import IOException
+from org.apache.lucene.store import IOContext
 from org.apache.pylucene.store import \
     PythonLock, PythonLockFactory, \
-    PythonIndexInput, PythonIndexOutput, PythonDirectory
+    PythonIndexInput, PythonDirectIndexInput, \
+    PythonIndexOutput, PythonBufferedIndexOutput, PythonDirectory
 
 """
 The Directory Implementation here is for testing purposes only, not meant
@@ -86,6 +88,40 @@ class PythonFileStreamInput(PythonIndexInput):
         self.fh.seek(pos)
 
 
+class PythonFileStreamDirectInput(PythonDirectIndexInput):
+
+    def __init__(self, name, fh, size, bufferSize=1024, clone=False):
+        if not clone:
+            super(PythonFileStreamDirectInput, self).__init__(name, bufferSize)
+        self.name = name
+        self.fh = fh
+        self._length = size
+        self.isOpen = True
+        self.isClone = clone
+
+    def length(self):
+        return int(self._length)
+
+    def clone(self):
+        clone = PythonFileStreamDirectInput(self.name, self.fh, self._length,
+                                            clone=True)
+        return super(PythonFileStreamDirectInput, self).clone(clone)
+
+    def close(self):
+        if self.isOpen:
+            self.isOpen = False
+            if not self.isClone:
+                self.fh.close()
+
+    def readInto(self, b, offset, length, pos):
+        self.fh.seek(pos)
+        with memoryview(b) as view:
+            return self.fh.readinto(view[offset:offset + length])
+
+    def seekInternal(self, pos):
+        self.fh.seek(pos)
+
+
 class PythonFileStreamOutput(PythonIndexOutput):
 
     def __init__(self, name, fh):
@@ -132,6 +168,21 @@ class PythonFileStreamOutput(PythonIndexOutput):
             self.crc = crc32(data, self.crc)
 
 
+class PythonFileStreamBufferedOutput(PythonBufferedIndexOutput):
+
+    def __init__(self, name, fh):
+        super(PythonFileStreamBufferedOutput, self).__init__("python: %s" %(name), name)
+        self.fh = fh
+
+    def closeInternal(self):
+        self.fh.flush()
+        self.fh.close()
+
+    def writeInternal(self, b, offset, length):
+        with memoryview(b) as view:
+            self.fh.write(view[offset:offset + length])
+
+
 class PythonFileDirectory(PythonDirectory):
 
     def __init__(self, path):
@@ -225,6 +276,33 @@ class PythonFileDirectory(PythonDirectory):
         return self._lockFactory.obtainLock(self, name)
 
 
+class PythonFileDirectDirectory(PythonFileDirectory):
+
+    def __init__(self, path):
+        super(PythonFileDirectDirectory, self).__init__(path)
+        self.setBufferSize(IOContext.Context.MERGE, 16384)
+        self.setBufferSize(IOContext.Context.READ, 4096)
+
+    def createOutput(self, name, context):
+        file_path = os.path.join(self.path, name)
+        fh = open(file_path, "wb")
+        stream = PythonFileStreamBufferedOutput(name, fh)
+        self._streams.append(stream)
+        return stream
+
+    def openInput(self, name, context):
+        file_path = os.path.join(self.path, name)
+        try:
+            fh = open(file_path, "rb")
+        except IOError:
+            raise JavaError(IOException(name))
+        stream = PythonFileStreamDirectInput(name, fh,
+                                             os.path.getsize(file_path),
+                                             self.getBufferSize(context))
+        self._streams.append(stream)
+        return stream
+
+
 if DEBUG:
     _globals = globals()
     _globals['PythonFileDirectory'] = DebugFactory(PythonFileDirectory)
@@ -262,6 +340,67 @@ class PythonDirectoryTests(unittest.TestCase, test_PyLucene.Test_PyLuceneBase):
             self.test_indexDocument()
 
 
+class PythonDirectDirectoryTests(PythonDirectoryTests):
+
+    def openStore(self):
+        return PythonFileDirectDirectory(self.STORE_DIR)
+
+    def test_bufferSizes(self):
+        store = self.openStore()
+        try:
+            self.assertEqual(4096, store.getBufferSize(IOContext.READ))
+            self.assertEqual(4096, store.getBufferSize(IOContext.READONCE))
+            self.assertEqual(1024, store.getBufferSize(IOContext.DEFAULT))
+        finally:
+            store.close()
+
+    def test_bufferedOutput(self):
+        store = self.openStore()
+        try:
+            output = store.createOutput("test.bin", IOContext.DEFAULT)
+            data = bytes(range(256)) * 100
+            output.writeByte(7)
+            output.writeBytes(JArray('byte')(data[:100]), 0, 100)
+            output.writeBytes(JArray('byte')(data), 10, len(data) - 10)
+            self.assertEqual(len(data) + 91, output.getFilePointer())
+            expected = crc32(bytes([7]) + data[:100] + data[10:])
+            self.assertEqual(expected, output.getChecksum())
+            output.close()
+
+            with open(os.path.join(self.STORE_DIR, "test.bin"), "rb") as fh:
+                self.assertEqual(bytes([7]) + data[:100] + data[10:],
+                                 fh.read())
+        finally:
+            store.close()
+
+    def test_directInput(self):
+        data = bytes(range(256)) * 40
+        with open(os.path.join(self.STORE_DIR, "test.bin"), "wb") as fh:
+            fh.write(data)
+
+        store = self.openStore()
+        try:
+            input = store.openInput("test.bin", IOContext.DEFAULT)
+
+            # readInto() fills the array it is passed in place
+            b = JArray('byte')(100)
+            self.assertEqual(50, input.readInto(b, 10, 50, 300))
+            self.assertEqual(data[300:350],
+                             bytes(x & 0xff for x in b[10:60]))
+            self.assertEqual([0] * 10, list(b[0:10]))
+            self.assertEqual([0] * 40, list(b[60:100]))
+
+            # reads crossing the 1024 byte buffer refilled by readInto()
+            b = JArray('byte')(3000)
+            input.seek(1000)
+            input.readBytes(b, 0, 3000)
+            self.assertEqual(data[1000:4000], bytes(x & 0xff for x in b))
+
+            input.close()
+        finally:
+            store.close()
+
+
 if __name__ == "__main__":
     env = lucene.initVM(vmargs=['-Djava.awt.headless=true'])
     if '-loop' in sys.argv:
@@ -21,7 +21,8 @@ from org.apache.lucene.index import Term
 from org.apache.lucene.search import \
     BooleanClause, BooleanQuery, Explanation, PhraseQuery, TermQuery
 from org.apache.lucene.util import Version
-from org.apache.pylucene.search import PythonSimpleCollector
+from org.apache.pylucene.search import \
+    PythonBatchCollector, PythonSimpleCollector
 from org.apache.pylucene.search.similarities import PythonClassicSimilarity
 
 
@@ -124,6 +125,44 @@ class SimilarityTestCase(PyLuceneTestCase):
 
         searcher.search(pq, collector4())
 
+    def testBatchCollector(self):
+
+        writer = self.getWriter(analyzer=SimpleAnalyzer(Version.LUCENE_CURRENT),
+                                similarity=SimpleSimilarity())
+
+        for i in range(10):
+            doc = Document()
+            doc.add(Field("field", "a " * (i + 1), TextField.TYPE_STORED))
+            writer.addDocument(doc)
+        writer.commit()
+        writer.close()
+
+        searcher = self.getSearcher()
+        searcher.setSimilarity(SimpleSimilarity())
+
+        class collector(PythonBatchCollector):
+            def __init__(_self, batchSize):
+                super(collector, _self).__init__(batchSize)
+                _self.hits = {}
+                _self.batches = 0
+            def collectBatch(_self, docs, scores, count):
+                self.assertTrue(0 < count <= _self.getBatchSize())
+                _self.batches += 1
+                for doc, score in zip(docs[:count], scores[:count]):
+                    _self.hits[doc + _self.base] = score
+            def setNextReader(_self, context):
+                _self.base = context.docBase
+            def needsScores(_self):
+                return True
+
+        c = collector(3)
+        c.search(searcher, TermQuery(Term("field", "a")))
+
+        self.assertEqual(4, c.batches)
+        self.assertEqual(10, len(c.hits))
+        for doc, score in c.hits.items():
+            self.assertEqual(float(doc + 1), score)
+
 
 if __name__ == "__main__":
     lucene.initVM(vmargs=['-Djava.awt.headless=true'])
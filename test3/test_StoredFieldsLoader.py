@@ -0,0 +1,92 @@
+# ====================================================================
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+# ====================================================================
+
+import sys, lucene, unittest
+from lucene import JArray, JavaError
+from PyLuceneTestCase import PyLuceneTestCase
+
+from org.apache.lucene.document import \
+    Document, Field, StoredField, StringField, TextField
+from org.apache.lucene.search import MatchAllDocsQuery
+from org.apache.pylucene.search import StoredFieldsLoader
+
+
+class StoredFieldsLoaderTestCase(PyLuceneTestCase):
+
+    def setUp(self):
+        super(StoredFieldsLoaderTestCase, self).setUp()
+
+        writer = self.getWriter(maxBufferedDocs=10)
+        for i in range(50):
+            doc = Document()
+            doc.add(Field("id", str(i), StringField.TYPE_STORED))
+            doc.add(Field("title", "title %d" %(i), TextField.TYPE_STORED))
+            doc.add(StoredField("count", i * 10))
+            if i % 2:
+                doc.add(Field("odd", "yes", StringField.TYPE_STORED))
+            writer.addDocument(doc)
+        writer.close()
+
+    def testLoad(self):
+
+        searcher = self.getSearcher()
+        fields = ["id", "count", "odd", "missing"]
+        loader = StoredFieldsLoader(searcher.getIndexReader(), fields)
+
+        topDocs = searcher.search(MatchAllDocsQuery(), 50)
+        scoreDocs = topDocs.scoreDocs
+        values = list(loader.load(scoreDocs))
+
+        n = len(fields)
+        rows = [dict(zip(fields, values[i * n:(i + 1) * n]))
+                for i in range(len(scoreDocs))]
+
+        self.assertEqual(50, len(rows))
+        for scoreDoc, row in zip(scoreDocs, rows):
+            doc = searcher.doc(scoreDoc.doc)
+            self.assertEqual(doc.get("id"), row["id"])
+            self.assertEqual(str(int(row["id"]) * 10), row["count"])
+            self.assertEqual(doc.get("odd"), row["odd"])
+            self.assertEqual(None, row["missing"])
+
+    def testOrder(self):
+
+        searcher = self.getSearcher()
+        loader = StoredFieldsLoader(searcher.getIndexReader(), ["id"])
+
+        docs = [49, 3, 17, 3, 0]
+        ids = [searcher.doc(doc).get("id") for doc in docs]
+        self.assertEqual(ids, list(loader.load(JArray('int')(docs))))
+        self.assertEqual([], list(loader.load(JArray('int')(0))))
+
+    def testDuplicateField(self):
+
+        reader = self.getSearcher().getIndexReader()
+        with self.assertRaises(JavaError) as cm:
+            StoredFieldsLoader(reader, ["id", "count", "id"])
+        self.assertEqual('java.lang.IllegalArgumentException',
+                         cm.exception.getJavaException().getClass().getName())
+
+
+if __name__ == "__main__":
+    lucene.initVM(vmargs=['-Djava.awt.headless=true'])
+    if '-loop' in sys.argv:
+        sys.argv.remove('-loop')
+        while True:
+            try:
+                unittest.main()
+            except:
+                pass
+    else:
+        unittest.main()
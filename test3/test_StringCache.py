@@ -0,0 +1,85 @@
+# ====================================================================
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+# ====================================================================
+
+# test the string cache enabled with initVM(stringCache=N)
+
+import sys, lucene, unittest
+from lucene import getVMEnv
+
+from org.apache.lucene.index import Term
+
+
+class StringCacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+
+        lucene.initVM(stringCache=4)
+
+    def tearDown(self):
+
+        lucene.initVM(stringCache=0)
+
+    def testDisabled(self):
+
+        lucene.initVM(stringCache=0)
+        self.assertEqual(None, getVMEnv()._stringCacheStats())
+
+    def testToJava(self):
+
+        for i in range(10):
+            term = Term("contents", "text")
+        self.assertEqual("contents", term.field())
+
+        stats = getVMEnv()._stringCacheStats()
+        self.assertEqual(4, stats['capacity'])
+        self.assertTrue(stats['toJavaHits'] >= 18)
+        self.assertEqual(2, stats['toJavaMisses'])
+
+    def testToPython(self):
+
+        term = Term("contents", "text")
+        field = term.field()
+        self.assertEqual("contents", field)
+        self.assertTrue(field is term.field())
+        self.assertEqual("text", term.text())
+
+        stats = getVMEnv()._stringCacheStats()
+        self.assertTrue(stats['toPythonHits'] >= 1)
+
+    def testEviction(self):
+
+        for i in range(100):
+            self.assertEqual("field%d" %(i), Term("field%d" %(i), "").field())
+
+        stats = getVMEnv()._stringCacheStats()
+        self.assertEqual(4, stats['size'])
+
+    def testLongStrings(self):
+
+        text = "x" * 100000
+        self.assertEqual(text, Term("contents", text).text())
+        self.assertTrue(getVMEnv()._stringCacheStats()['size'] <= 2)
+
+
+if __name__ == "__main__":
+    lucene.initVM(vmargs=['-Djava.awt.headless=true'])
+    if '-loop' in sys.argv:
+        sys.argv.remove('-loop')
+        while True:
+            try:
+                unittest.main()
+            except:
+                pass
+    else:
+        unittest.main()
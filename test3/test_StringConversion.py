@@ -0,0 +1,83 @@
+# ====================================================================
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+# ====================================================================
+
+# test conversions of Python str and bytes to Java String and back
+
+import sys, lucene, unittest
+
+from org.apache.lucene.document import Document, StoredField
+from org.apache.lucene.index import Term
+
+
+class StringConversionTestCase(unittest.TestCase):
+
+    def roundtrip(self, text):
+
+        return Term("field", text).text()
+
+    def testASCII(self):
+
+        for length in (0, 1, 7, 8, 9, 1023, 1024, 1025, 100000):
+            text = ("abcdefghij" * (length // 10 + 1))[:length]
+            self.assertEqual(text, self.roundtrip(text))
+
+    def testLatin1(self):
+
+        self.assertEqual("caf\xe9", self.roundtrip("caf\xe9"))
+        self.assertEqual("\xff" * 5000, self.roundtrip("\xff" * 5000))
+
+    def testNUL(self):
+
+        self.assertEqual("a\0b", self.roundtrip("a\0b"))
+        self.assertEqual(3, Term("field", "a\0b").bytes().length)
+
+    def testUCS2(self):
+
+        text = "абв €"
+        self.assertEqual(text, self.roundtrip(text))
+
+    def testUCS4(self):
+
+        text = "ab\U0001f600cd"
+        self.assertEqual(text, self.roundtrip(text))
+        self.assertEqual(8, Term("field", text).bytes().length)
+
+    def testFromJava(self):
+
+        for chars in ("abc", "caf\xe9", "\x7f\x80", "\u0100", "\ud7ff\ue000",
+                      "\U0001f600", "a\U0010ffff"):
+            for length in range(12):
+                for prefix in ("", "x", "xy", "xyz"):
+                    text = prefix + chars * length
+                    doc = Document()
+                    doc.add(StoredField("body", text))
+                    self.assertEqual(text, doc.get("body"))
+
+    def testBytes(self):
+
+        self.assertEqual("a\0b", self.roundtrip(b"a\0b"))
+        self.assertEqual("caf\xe9", self.roundtrip("caf\xe9".encode('utf-8')))
+
+
+if __name__ == "__main__":
+    lucene.initVM(vmargs=['-Djava.awt.headless=true'])
+    if '-loop' in sys.argv:
+        sys.argv.remove('-loop')
+        while True:
+            try:
+                unittest.main()
+            except:
+                pass
+    else:
+        unittest.main()